@@ -0,0 +1 @@
+"""Offline benchmarks against a local mock of the portals (not part of the integration)."""
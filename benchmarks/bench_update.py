@@ -0,0 +1,220 @@
+"""End-to-end benchmark of one coordinator update against the mock portal.
+
+For every provider and meter count the mock portal is started in its own
+process (so its work doesn't show up in the numbers), the client URLs are
+pointed at it and AustriaSmartMeterCoordinator._async_update_data is run:
+
+* cold: first update of a new entry (the last days of history)
+* backfill: the backfill job fetching the rest of the 3 years, window by window
+* warm: the following update, only the days since the last reading
+
+Reported per run: wall time, requests, bytes received, and the peak of
+Python memory allocations (tracemalloc, measured in a separate cold update +
+backfill as tracing slows the code down).
+
+    python -m benchmarks.bench_update --provider wiener_netze netz_noe --meters 1 10 50
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+import tracemalloc
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import aiohttp
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_test_home_assistant
+
+from custom_components.asm import backfill
+from custom_components.asm.api import client_noe, client_noe_async, constants, policy
+from custom_components.asm.const import (
+    DOMAIN,
+    CONF_PROVIDER,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+)
+from custom_components.asm.coordinator import AustriaSmartMeterCoordinator
+
+from . import mock_portal
+
+PROVIDERS = ("wiener_netze", "netz_noe")
+WN_URLS = ("AUTH_URL", "API_CONFIG_URL", "PAGE_URL", "REDIRECT_URI", "API_URL", "API_URL_B2B")
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class PortalProcess:
+    """Mock portal in a child process, counters read over HTTP."""
+
+    def __init__(self, meters: int, host: str = "127.0.0.1", latency: float = 0.0):
+        self.host = host
+        self.port = _free_port(host)
+        self.base_url = f"http://{host}:{self.port}"
+        self._process = multiprocessing.Process(
+            target=mock_portal.run, args=(meters, host, self.port, latency, False), daemon=True
+        )
+
+    async def __aenter__(self) -> "PortalProcess":
+        self._process.start()
+        async with aiohttp.ClientSession() as session:
+            for _ in range(100):
+                try:
+                    await self._request(session, "GET", "stats")
+                    return self
+                except aiohttp.ClientConnectionError:
+                    await asyncio.sleep(0.05)
+        raise RuntimeError("Mock portal did not start")
+
+    async def __aexit__(self, *exc) -> None:
+        self._process.terminate()
+        self._process.join()
+
+    async def _request(self, session, method: str, action: str) -> Dict[str, Any]:
+        async with session.request(method, f"{self.base_url}{mock_portal.BENCH_PATH}{action}") as res:
+            return await res.json()
+
+    async def stats(self) -> Dict[str, Any]:
+        async with aiohttp.ClientSession() as session:
+            return await self._request(session, "GET", "stats")
+
+    async def reset(self) -> None:
+        async with aiohttp.ClientSession() as session:
+            await self._request(session, "POST", "reset")
+
+
+def point_clients_at(base_url: str) -> None:
+    """Replace the portal URLs of the clients with the mock portal."""
+    urls = mock_portal.portal_urls(base_url)
+    for name in WN_URLS:
+        setattr(constants, name, urls[name])
+    client_noe.BASE_URL = urls["NOE_BASE_URL"]
+    client_noe_async.BASE_URL = urls["NOE_BASE_URL"]
+
+
+def configure_backfill() -> None:
+    """No pause between the backfill windows, it is measured on its own."""
+    backfill.BACKFILL_PAUSE = 0
+
+
+def configure_policy(rate_limit: bool) -> None:
+    """Fresh token buckets and breakers; without rate limit the numbers show the integration's own cost."""
+    if not rate_limit:
+        policy.DEFAULT_POLICY.rate = 1e9
+        policy.DEFAULT_POLICY.burst = 10 ** 9
+    policy.DEFAULT_POLICY._buckets.clear()
+    policy.DEFAULT_POLICY._breakers.clear()
+
+
+async def _no_statistics(data, rebuild=()) -> None:
+    """The statistics import runs as background task after the update and is not part of the benchmark."""
+
+
+def _coordinator(hass, provider: str, max_concurrent: int, run: str) -> AustriaSmartMeterCoordinator:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Benchmark",
+        unique_id=f"bench_{provider}_{run}",
+        data={CONF_PROVIDER: provider, CONF_USERNAME: "bench@example.com", CONF_PASSWORD: "bench"},
+        options={CONF_ADAPTIVE_POLLING: False, CONF_MAX_CONCURRENT_REQUESTS: max_concurrent},
+    )
+    entry.add_to_hass(hass)
+    coordinator = AustriaSmartMeterCoordinator(hass, entry)
+    coordinator._async_import_statistics = _no_statistics
+    return coordinator
+
+
+async def _run(coordinator, run: str) -> None:
+    if run == "backfill":
+        await coordinator._backfill._async_run()
+    else:
+        coordinator.data = await coordinator._async_update_data()
+
+
+async def _timed_run(coordinator, portal: PortalProcess, run: str) -> Dict[str, Any]:
+    await portal.reset()
+    start = time.perf_counter()
+    await _run(coordinator, run)
+    elapsed = time.perf_counter() - start
+    data = coordinator.data
+    stats = await portal.stats()
+    return {
+        "seconds": round(elapsed, 3),
+        "requests": sum(stats["requests"].values()),
+        "bytes": stats["bytes"],
+        "by_endpoint": stats["requests"],
+        "readings": sum(len(r.readings) for zp_data in data.values() for r in zp_data["registers"].values()),
+    }
+
+
+async def bench(provider: str, meters: int, max_concurrent: int, latency: float, rate_limit: bool) -> List[Dict[str, Any]]:
+    results = []
+    async with PortalProcess(meters, latency=latency) as portal:
+        point_clients_at(portal.base_url)
+        # Ohne zeroconf (wie die Test-Fixture mock_zeroconf_resolver)
+        with patch("homeassistant.helpers.aiohttp_client._async_make_resolver", return_value=aiohttp.ThreadedResolver()):
+            async with async_test_home_assistant() as hass:
+                configure_backfill()
+                configure_policy(rate_limit)
+                coordinator = _coordinator(hass, provider, max_concurrent, "latency")
+                for run in ("cold", "backfill", "warm"):
+                    result = await _timed_run(coordinator, portal, run)
+                    results.append({"provider": provider, "meters": meters, "run": run, **result})
+                await coordinator.async_shutdown()
+
+                configure_policy(rate_limit)
+                coordinator = _coordinator(hass, provider, max_concurrent, "memory")
+                tracemalloc.start()
+                try:
+                    await _run(coordinator, "cold")
+                    await _run(coordinator, "backfill")
+                    peak = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+                await coordinator.async_shutdown()
+                results[0]["peak_memory"] = peak
+    return results
+
+
+def _print_table(results: List[Dict[str, Any]]) -> None:
+    print(f"{'provider':<14}{'meters':>7}  {'run':<9}{'seconds':>9}{'requests':>10}{'kB':>10}{'readings':>10}{'peak MiB':>10}")
+    for r in results:
+        peak = f"{r['peak_memory'] / 2 ** 20:.1f}" if "peak_memory" in r else "-"
+        print(
+            f"{r['provider']:<14}{r['meters']:>7}  {r['run']:<9}{r['seconds']:>9.3f}{r['requests']:>10}"
+            f"{r['bytes'] / 1024:>10.0f}{r['readings']:>10}{peak:>10}"
+        )
+
+
+async def _main(args) -> None:
+    results = []
+    for provider in args.provider:
+        for meters in args.meters:
+            results.extend(await bench(provider, meters, args.max_concurrent, args.latency, args.rate_limit))
+    _print_table(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--provider", nargs="+", choices=PROVIDERS, default=list(PROVIDERS))
+    parser.add_argument("--meters", nargs="+", type=int, default=[1, 10, 50])
+    parser.add_argument("--max-concurrent", type=int, default=DEFAULT_MAX_CONCURRENT_REQUESTS)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the portal takes per response")
+    parser.add_argument("--rate-limit", action="store_true", help="keep the request policy's rate limit")
+    parser.add_argument("--output", help="write the results as JSON")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
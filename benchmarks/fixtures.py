@@ -0,0 +1,110 @@
+"""Portal responses for the benchmarks.
+
+Same layout as the portal responses the clients parse; the values are
+generated (deterministic per meter and day), so any number of meters and any
+history length can be served.
+"""
+import calendar
+import random
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List
+from zoneinfo import ZoneInfo
+
+PORTAL_TIME_ZONE = ZoneInfo("Europe/Vienna")
+GESCHAEFTSPARTNER = "1200000001"
+NOE_ACCOUNT_ID = "100000001"
+
+
+def zaehlpunktnummer(index: int) -> str:
+    return f"AT0010000000000000001000{index:08d}"
+
+
+def _daily_kwh(zp_num: str, day: date) -> float:
+    # 3-15 kWh, gleicher Wert für denselben Zählpunkt und Tag
+    return round(random.Random(f"{zp_num}{day.isoformat()}").uniform(3, 15), 3)
+
+
+def _counter_start(zp_num: str) -> float:
+    return float(random.Random(zp_num).randrange(1_000_000, 50_000_000))
+
+
+def wn_contracts(meters: int) -> List[Dict[str, Any]]:
+    """GET zaehlpunkte: one contract holding all meters."""
+    return [{
+        "geschaeftspartner": GESCHAEFTSPARTNER,
+        "zaehlpunkte": [{
+            "zaehlpunktnummer": zaehlpunktnummer(i),
+            "zaehlpunktName": f"Meter {i}",
+            "zaehlpunktAnlagentyp": "TAGSTROM",
+            "equipmentNumber": 1100000000 + i,
+            "geraetNumber": f"1KFM00{i:08d}",
+            "isSmartMeterMarketReady": True,
+            "isActive": True,
+            "anlage": {"typ": "TAGSTROM"},
+            "verbrauchsstelle": {
+                "strasse": "Musterstraße",
+                "hausnummer": str(i),
+                "postleitzahl": "1010",
+                "ort": "Wien",
+            },
+        } for i in range(1, meters + 1)],
+    }]
+
+
+def wn_consumptions(meters: int, today: date) -> List[Dict[str, Any]]:
+    """GET zaehlpunkt/consumptions (Wh)."""
+    result = []
+    for i in range(1, meters + 1):
+        zp_num = zaehlpunktnummer(i)
+        entry = {"zaehlpunktnummer": zp_num}
+        for key, days in (("consumptionYesterday", 1), ("consumptionDayBeforeYesterday", 2)):
+            day = today - timedelta(days=days)
+            entry[key] = {"value": _daily_kwh(zp_num, day) * 1000, "date": day.isoformat(), "validated": True}
+        result.append(entry)
+    return result
+
+
+def _counter(zp_num: str, day: date) -> int:
+    """Counter at the end of a day (Wh): ~9 kWh per day, independent of the requested range."""
+    days = (day - date(2020, 1, 1)).days + 1
+    return int(_counter_start(zp_num) + days * 9000 + _daily_kwh(zp_num, day) * 100)
+
+
+def wn_messwerte(zp_num: str, date_from: date, date_until: date) -> Dict[str, Any]:
+    """GET zaehlpunkte/{gp}/{zp}/messwerte?wertetyp=METER_READ: daily counter 1-1:1.8.0 (Wh)."""
+    messwerte = []
+    day = date_from
+    # Wie im Portal: höchstens bis gestern
+    while day <= min(date_until, date.today() - timedelta(days=1)):
+        end = datetime(day.year, day.month, day.day, tzinfo=PORTAL_TIME_ZONE) + timedelta(days=1)
+        messwerte.append({
+            "messwert": _counter(zp_num, day),
+            "zeitpunkt": end.astimezone(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "qualitaet": "VAL",
+        })
+        day += timedelta(days=1)
+    return {
+        "zaehlpunkt": zp_num,
+        "zaehlwerke": [{"obisCode": "1-1:1.8.0", "einheit": "WH", "messwerte": messwerte}],
+    }
+
+
+def noe_login() -> Dict[str, Any]:
+    return {"success": True}
+
+
+def noe_accounts() -> List[Dict[str, Any]]:
+    return [{"accountId": NOE_ACCOUNT_ID, "hasSmartMeter": True}]
+
+
+def noe_metering_points(meters: int) -> List[Dict[str, Any]]:
+    return [{"meterId": zaehlpunktnummer(i), "name": f"Meter {i}", "typeOfRelation": "Owner"} for i in range(1, meters + 1)]
+
+
+def noe_month(zp_num: str, year: int, month: int, today: date) -> List[Dict[str, Any]]:
+    """GET ConsumptionRecord/Month: one value per day (kWh), null from today on."""
+    values = []
+    for d in range(1, calendar.monthrange(year, month)[1] + 1):
+        day = date(year, month, d)
+        values.append(_daily_kwh(zp_num, day) if day < today else None)
+    return [{"meteredValues": values, "peakDemandTimes": [], "meteredPeakDemands": []}]
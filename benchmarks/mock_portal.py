@@ -0,0 +1,211 @@
+"""Local stand-in for the portals, for the benchmarks.
+
+Serves the log.wien OIDC login (PKCE, form posts, token endpoint), the
+Wiener Netze app config and B2C/B2B gateway and the Netz NÖ orchestration
+API on one aiohttp server. Every request is counted with the bytes sent;
+GET /_bench/stats returns the counters, POST /_bench/reset clears them.
+
+    python -m benchmarks.mock_portal --meters 10 --port 8765
+"""
+import argparse
+import asyncio
+import json
+from collections import Counter
+from datetime import date
+from typing import Any, Dict
+
+from aiohttp import web
+
+from . import fixtures
+
+AUTH_PATH = "/auth/realms/logwien/protocol/openid-connect/"
+APP_CONFIG_PATH = "/assets/app-config.json"
+B2C_PATH = "/gateway/WN_SMART_METER_PORTAL_API_B2C/1.0"
+B2B_PATH = "/gateway/WN_SMART_METER_PORTAL_API_B2B/1.0"
+NOE_PATH = "/orchestration"
+BENCH_PATH = "/_bench/"
+
+def portal_urls(base_url: str) -> Dict[str, str]:
+    """Values for the URL constants of the clients."""
+    return {
+        "AUTH_URL": base_url + AUTH_PATH,
+        "API_CONFIG_URL": base_url + APP_CONFIG_PATH,
+        "PAGE_URL": base_url + "/",
+        "REDIRECT_URI": base_url + "/",
+        "API_URL": base_url + B2C_PATH,
+        "API_URL_B2B": base_url + B2B_PATH,
+        "NOE_BASE_URL": base_url + NOE_PATH,
+    }
+
+
+LOGIN_FORM = '<html><body><form id="kc-form-login" action="{action}" method="post"></form></body></html>'
+
+
+class MockPortal:
+    """aiohttp server with the portal endpoints for `meters` metering points."""
+
+    def __init__(self, meters: int, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        self.meters = meters
+        self.host = host
+        self.port = port
+        # Künstliche Antwortzeit je Request (Sekunden)
+        self.latency = latency
+        self.requests: Counter = Counter()
+        self.bytes_sent = 0
+        self._runner = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def reset_counters(self) -> None:
+        self.requests.clear()
+        self.bytes_sent = 0
+
+    @property
+    def request_count(self) -> int:
+        return sum(self.requests.values())
+
+    @web.middleware
+    async def _count(self, request: web.Request, handler):
+        if request.path.startswith(BENCH_PATH):
+            return await handler(request)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        response = await handler(request)
+        self.requests[request.match_info.route.name or request.path] += 1
+        self.bytes_sent += response.content_length or 0
+        return response
+
+    @staticmethod
+    def _json(data: Any) -> web.Response:
+        return web.Response(body=json.dumps(data).encode(), content_type="application/json")
+
+    # log.wien
+
+    async def _login_page(self, request: web.Request) -> web.Response:
+        action = f"{self.base_url}{AUTH_PATH}login-actions/authenticate?step=username"
+        return web.Response(text=LOGIN_FORM.format(action=action), content_type="text/html")
+
+    async def _login_post(self, request: web.Request) -> web.Response:
+        await request.post()
+        if request.query.get("step") == "username":
+            action = f"{self.base_url}{AUTH_PATH}login-actions/authenticate?step=password"
+            return web.Response(text=LOGIN_FORM.format(action=action), content_type="text/html")
+        return web.Response(status=302, headers={"Location": f"{self.base_url}/#state=bench&session_state=bench&code=bench-code"})
+
+    async def _token(self, request: web.Request) -> web.Response:
+        await request.post()
+        return self._json({
+            "access_token": "bench-access",
+            "expires_in": 300,
+            "refresh_token": "bench-refresh",
+            "refresh_expires_in": 1800,
+            "token_type": "Bearer",
+        })
+
+    async def _app_config(self, request: web.Request) -> web.Response:
+        return self._json({"b2cApiKey": "bench-b2c", "b2bApiKey": "bench-b2b"})
+
+    # Wiener Netze gateway
+
+    async def _wn_gateway(self, request: web.Request) -> web.Response:
+        # Die Clients bauen die URLs mit urljoin, "1.0" fällt dabei weg: beide Varianten annehmen
+        parts = [p for p in request.match_info["tail"].split("/") if p and p != "1.0"]
+        if parts == ["zaehlpunkte"]:
+            return self._json(fixtures.wn_contracts(self.meters))
+        if parts == ["zaehlpunkt", "consumptions"]:
+            return self._json(fixtures.wn_consumptions(self.meters, date.today()))
+        if len(parts) == 4 and parts[0] == "zaehlpunkte" and parts[3] == "messwerte":
+            date_from = date.fromisoformat(request.query["datumVon"])
+            date_until = date.fromisoformat(request.query["datumBis"])
+            return self._json(fixtures.wn_messwerte(parts[2], date_from, date_until))
+        raise web.HTTPNotFound()
+
+    # Netz NÖ
+
+    async def _noe_login(self, request: web.Request) -> web.Response:
+        await request.read()
+        return self._json(fixtures.noe_login())
+
+    async def _noe_accounts(self, request: web.Request) -> web.Response:
+        return self._json(fixtures.noe_accounts())
+
+    async def _noe_metering_points(self, request: web.Request) -> web.Response:
+        return self._json(fixtures.noe_metering_points(self.meters))
+
+    async def _noe_month(self, request: web.Request) -> web.Response:
+        query = request.query
+        return self._json(fixtures.noe_month(query["meterId"], int(query["year"]), int(query["month"]), date.today()))
+
+    # Benchmark control
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        return self._json({"requests": dict(self.requests), "bytes": self.bytes_sent})
+
+    async def _reset(self, request: web.Request) -> web.Response:
+        self.reset_counters()
+        return self._json({})
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._count])
+        app.router.add_get(AUTH_PATH + "auth", self._login_page, name="oidc_auth")
+        app.router.add_post(AUTH_PATH + "login-actions/authenticate", self._login_post, name="oidc_login")
+        app.router.add_post(AUTH_PATH + "token", self._token, name="oidc_token")
+        app.router.add_get(APP_CONFIG_PATH, self._app_config, name="app_config")
+        app.router.add_get("/gateway/{api}/{tail:.*}", self._wn_gateway, name="wn_gateway")
+        app.router.add_post(NOE_PATH + "/Authenticaton/Login", self._noe_login, name="noe_login")
+        app.router.add_get(NOE_PATH + "/User/GetAccountIdByBussinespartnerId", self._noe_accounts, name="noe_accounts")
+        app.router.add_get(NOE_PATH + "/User/GetMeteringPointByAccountId", self._noe_metering_points, name="noe_metering_points")
+        app.router.add_get(NOE_PATH + "/ConsumptionRecord/Month", self._noe_month, name="noe_month")
+        app.router.add_get(BENCH_PATH + "stats", self._stats)
+        app.router.add_post(BENCH_PATH + "reset", self._reset)
+        return app
+
+    async def start(self) -> "MockPortal":
+        self._runner = web.AppRunner(self.app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Port 0: vom System vergebenen Port übernehmen
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def serve(meters: int, host: str, port: int, latency: float = 0.0, verbose: bool = True) -> None:
+    """Run the portal until cancelled."""
+    portal = await MockPortal(meters, host, port, latency).start()
+    if verbose:
+        for name, url in portal_urls(portal.base_url).items():
+            print(f"{name} = {url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await portal.stop()
+
+
+def run(meters: int, host: str, port: int, latency: float = 0.0, verbose: bool = True) -> None:
+    """Blocking entry point, e.g. as target of a separate process."""
+    try:
+        asyncio.run(serve(meters, host, port, latency, verbose))
+    except KeyboardInterrupt:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meters", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args()
+    run(args.meters, args.host, args.port, args.latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,23 +4,39 @@ from __future__ import annotations
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
 from .api.client import SmartmeterClient # Type hinting only
 from .const import DOMAIN
 from .coordinator import AustriaSmartMeterCoordinator
+from .services import async_setup_services
+from .store import ReadingStore, SessionStore
 
 # Unterstützte Plattformen
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the services (asm.export_history)."""
+    async_setup_services(hass)
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Austria Smartmeter from a config entry."""
     
     # 1. Coordinator initialisieren
     # Der Coordinator kümmert sich um Login und Datenabruf
-    coordinator = AustriaSmartMeterCoordinator(hass, entry.data, entry.options)
+    coordinator = AustriaSmartMeterCoordinator(hass, entry)
 
-    # 2. Erster Datenabruf (damit Sensoren gleich Daten haben)
-    await coordinator.async_config_entry_first_refresh()
+    # 2. Gespeicherte Anmeldung und Werte laden (Sensoren starten sofort aus dem Cache).
+    # Nur ohne Cache wird auf den ersten Datenabruf gewartet.
+    await coordinator.async_restore_session()
+    await coordinator.async_load_scheduler()
+    has_cache = await coordinator.async_load_cache()
+    if not has_cache:
+        await coordinator.async_config_entry_first_refresh()
 
     # 3. Coordinator in hass.data speichern
     hass.data.setdefault(DOMAIN, {})
@@ -28,6 +44,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # 4. Plattformen (Sensoren) laden
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # Netzwerk-Refresh nach dem Start aus dem Cache im Hintergrund
+    if has_cache:
+        entry.async_create_background_task(hass, coordinator.async_refresh(), f"{DOMAIN}_refresh_{entry.entry_id}")
     
     # 5. Update Listener registrieren (WICHTIG für Options Flow!)
     # Wenn Optionen geändert werden, wird update_listener aufgerufen
@@ -42,6 +62,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data when the config entry is deleted."""
+    await ReadingStore(hass, entry.entry_id).async_remove()
+    await SessionStore(hass, entry.entry_id).async_remove()
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
     # Lädt die Integration neu, wenn Optionen (z.B. Scan Intervall) geändert wurden
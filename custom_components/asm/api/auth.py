@@ -0,0 +1,103 @@
+"""Token handling for the log.wien OpenID Connect login."""
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from . import constants as const
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _fromisoformat(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class TokenManager:
+    """Holds access/refresh tokens and the gateway API keys of one account.
+
+    The access token is renewed with the refresh grant shortly before it
+    expires; only if that is not possible a full PKCE login is needed.
+    The API keys from app-config.json don't depend on the login and are
+    cached separately.
+    """
+
+    def __init__(self):
+        self.clear()
+        self.b2c_api_key: Optional[str] = None
+        self.b2b_api_key: Optional[str] = None
+        self.api_keys_expiration: Optional[datetime] = None
+
+    def clear(self):
+        """Forget the tokens (the API keys are kept)."""
+        self.access_token: Optional[str] = None
+        self.access_token_expiration: Optional[datetime] = None
+        self.refresh_token: Optional[str] = None
+        self.refresh_token_expiration: Optional[datetime] = None
+
+    def update(self, tokens: Dict[str, Any]):
+        """Take over the response of the token endpoint."""
+        now = datetime.now()
+        self.access_token = tokens["access_token"]
+        self.access_token_expiration = now + timedelta(seconds=tokens["expires_in"])
+        self.refresh_token = tokens.get("refresh_token")
+        refresh_expires_in = tokens.get("refresh_expires_in")
+        # Keycloak sends 0 for offline tokens without fixed expiry
+        self.refresh_token_expiration = now + timedelta(seconds=refresh_expires_in) if refresh_expires_in else None
+
+    def is_access_expired(self) -> bool:
+        return self.access_token_expiration is not None and datetime.now() >= self.access_token_expiration
+
+    def is_access_valid(self) -> bool:
+        """True if the access token can still be used for a while (renewal margin not reached)."""
+        if self.access_token is None or self.access_token_expiration is None:
+            return False
+        return datetime.now() < self.access_token_expiration - const.TOKEN_REFRESH_MARGIN
+
+    def can_refresh(self) -> bool:
+        if not self.refresh_token:
+            return False
+        if self.refresh_token_expiration is None:
+            return True
+        return datetime.now() < self.refresh_token_expiration - const.TOKEN_REFRESH_MARGIN
+
+    def refresh_request(self) -> Dict[str, str]:
+        """Form data for the refresh grant."""
+        return {
+            "grant_type": "refresh_token",
+            "client_id": const.CLIENT_ID,
+            "refresh_token": self.refresh_token,
+        }
+
+    def has_api_keys(self) -> bool:
+        if not self.b2c_api_key or not self.b2b_api_key:
+            return False
+        return self.api_keys_expiration is None or datetime.now() < self.api_keys_expiration
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Serializable state, used to resume the login after a restart."""
+        return {
+            "access_token": self.access_token,
+            "access_token_expiration": _isoformat(self.access_token_expiration),
+            "refresh_token": self.refresh_token,
+            "refresh_token_expiration": _isoformat(self.refresh_token_expiration),
+            "b2c_api_key": self.b2c_api_key,
+            "b2b_api_key": self.b2b_api_key,
+            "api_keys_expiration": _isoformat(self.api_keys_expiration),
+        }
+
+    def load_dict(self, state: Dict[str, Any]):
+        """Restore the state written by as_dict()."""
+        self.access_token = state.get("access_token")
+        self.access_token_expiration = _fromisoformat(state.get("access_token_expiration"))
+        self.refresh_token = state.get("refresh_token")
+        self.refresh_token_expiration = _fromisoformat(state.get("refresh_token_expiration"))
+        self.b2c_api_key = state.get("b2c_api_key")
+        self.b2b_api_key = state.get("b2b_api_key")
+        self.api_keys_expiration = _fromisoformat(state.get("api_keys_expiration"))
+
+    def set_api_keys(self, config: Dict[str, Any]):
+        """Take over the gateway keys from app-config.json."""
+        self.b2c_api_key = config["b2cApiKey"]
+        self.b2b_api_key = config["b2bApiKey"]
+        self.api_keys_expiration = datetime.now() + const.API_KEYS_TTL
@@ -1,7 +1,32 @@
 """Base class for Smartmeter clients."""
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from datetime import date
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
+
+from .coalesce import SingleFlight
+from .metrics import RequestMetrics
+
+
+@dataclass(frozen=True)
+class ClientCapabilities:
+    """What a provider's portal supports, so the coordinator only makes calls that can succeed."""
+
+    # consumptions() returns the yesterday / day before yesterday statistics
+    statistics: bool = False
+    # The statistics are computed from the daily values of historical_data() (no own endpoint to call)
+    stats_from_history: bool = False
+    # quarter_hour_data() is available
+    quarter_hour: bool = False
+    # historical_data() fetches any range of days per request; otherwise one request per calendar month
+    range_queries: bool = False
+    # The login can be resumed across restarts (export_session / restore_session)
+    token_refresh: bool = False
+    # Genuine counter registers (x.8.0); otherwise they are derived from the interval registers (x.9.0)
+    meter_reads: bool = False
+    # Days covered by one history request with range_queries (None = no limit)
+    max_days_per_request: Optional[int] = None
+
 
 class SmartmeterClient(ABC):
     """Abstract base class for all Smartmeter providers."""
@@ -9,6 +34,8 @@ class SmartmeterClient(ABC):
     def __init__(self, username, password):
         self.username = username
         self.password = password
+        # Filled by the request policy, see metrics.py
+        self.metrics = RequestMetrics()
 
     @abstractmethod
     def login(self):
@@ -39,3 +66,99 @@ class SmartmeterClient(ABC):
         date_until: date = None
     ) -> List[Dict[str, Any]]:
         pass
+
+    @abstractmethod
+    def quarter_hour_data(
+        self,
+        zaehlpunktnummer: str,
+        date_from: date = None,
+        date_until: date = None
+    ) -> List[Dict[str, Any]]:
+        """Return the 15-minute load profile per OBIS register (same layout as historical_data)."""
+        pass
+
+    def export_session(self) -> Optional[Dict[str, Any]]:
+        """Return the login state to persist, or None if the provider can't resume a login."""
+        return None
+
+    def restore_session(self, state: Dict[str, Any]) -> None:
+        """Resume a login from the state returned by export_session()."""
+
+
+class AsyncSmartmeterClient(ABC):
+    """Abstract base class for asyncio Smartmeter clients.
+
+    Same interface as SmartmeterClient, but every network call is a coroutine
+    running on an aiohttp session, so no executor thread is needed. The session
+    belongs to whoever created it (see ClientPool), the client never closes it.
+    """
+
+    def __init__(self, session, username, password):
+        self.session = session
+        self.username = username
+        self.password = password
+        # Filled by the request policy, see metrics.py
+        self.metrics = RequestMetrics()
+        # Identical requests in flight share one call (the client may be shared by several entries)
+        self.inflight = SingleFlight()
+
+    @abstractmethod
+    async def login(self):
+        pass
+
+    async def shared_login(self):
+        """login() counted in the metrics; callers logging in at the same time share one login."""
+        return await self.inflight.run("login", self._recorded_login)
+
+    async def _recorded_login(self):
+        try:
+            result = await self.login()
+        except Exception:
+            self.metrics.record_login(False)
+            raise
+        self.metrics.record_login(True)
+        return result
+
+    @abstractmethod
+    def is_logged_in(self) -> bool:
+        pass
+
+    @abstractmethod
+    def is_login_expired(self) -> bool:
+        pass
+
+    @abstractmethod
+    async def zaehlpunkte(self) -> List[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def consumptions(self) -> List[Dict[str, Any]]:
+        """Return statistic consumption data (yesterday, etc.)."""
+        pass
+
+    @abstractmethod
+    async def historical_data(
+        self,
+        zaehlpunktnummer: str,
+        date_from: date = None,
+        date_until: date = None
+    ) -> List[Any]:
+        """Return the registers as raw dicts or, from streaming clients, as Register (see normalize_registers)."""
+        pass
+
+    @abstractmethod
+    async def quarter_hour_data(
+        self,
+        zaehlpunktnummer: str,
+        date_from: date = None,
+        date_until: date = None
+    ) -> List[Dict[str, Any]]:
+        """Return the 15-minute load profile per OBIS register (same layout as historical_data)."""
+        pass
+
+    def export_session(self) -> Optional[Dict[str, Any]]:
+        """Return the login state to persist, or None if the provider can't resume a login."""
+        return None
+
+    def restore_session(self, state: Dict[str, Any]) -> None:
+        """Resume a login from the state returned by export_session()."""
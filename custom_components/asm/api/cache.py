@@ -0,0 +1,98 @@
+"""Small LRU cache for API responses that rarely change (contracts, consumptions)."""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Dict, Mapping, Optional
+
+DEFAULT_MAX_ENTRIES = 32
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    data: Any
+    expires: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class ResponseCache:
+    """Caches decoded JSON responses per URL + query for the endpoints that have a TTL.
+
+    Fresh entries are returned without a request. Expired entries are kept for
+    revalidation: their ETag / Last-Modified are sent as If-None-Match /
+    If-Modified-Since and a 304 answer renews them. The least recently used
+    entry is evicted when max_entries is exceeded.
+    """
+
+    def __init__(self, ttls: Mapping[str, timedelta], max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._ttls = dict(ttls)
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    @staticmethod
+    def key(url: str, query: Optional[Mapping[str, Any]] = None) -> str:
+        if not query:
+            return url
+        return url + "?" + "&".join(f"{k}={query[k]}" for k in sorted(query))
+
+    def ttl_for(self, endpoint: str) -> Optional[timedelta]:
+        """TTL of an endpoint, None if its responses are not cached."""
+        return self._ttls.get(endpoint)
+
+    def get(self, key: str) -> Any:
+        """Fresh cached data or None (counts a hit or miss)."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.data
+        self.misses += 1
+        return None
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """Validators of an expired entry for a conditional request."""
+        entry = self._entries.get(key)
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def put(self, key: str, data: Any, ttl: timedelta, headers: Optional[Mapping[str, str]] = None) -> None:
+        headers = headers or {}
+        self._entries[key] = CacheEntry(
+            data, time.monotonic() + ttl.total_seconds(), headers.get("ETag"), headers.get("Last-Modified")
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def revalidated(self, key: str, ttl: timedelta) -> Any:
+        """The server answered 304: renew the entry and return its data (None if it was evicted meanwhile)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.expires = time.monotonic() + ttl.total_seconds()
+        self._entries.move_to_end(key)
+        self.revalidations += 1
+        return entry.data
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        # Revalidations are misses answered with 304
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
@@ -1,19 +1,18 @@
 """Factory for Smartmeter clients."""
-from .base import SmartmeterClient
+from .base import SmartmeterClient, AsyncSmartmeterClient
 from .client_wn import WienerNetzeClient
-from .client_noe import NetzNoeClient
-from ..const import PROVIDER_WIENER_NETZE, PROVIDER_NETZ_NOE
+from .registry import get_provider
 
 # Re-export errors for compatibility
 from .errors import SmartmeterLoginError, SmartmeterConnectionError, SmartmeterQueryError
 
 def get_client(provider: str, username, password) -> SmartmeterClient:
     """Return the correct client based on provider."""
-    if provider == PROVIDER_NETZ_NOE:
-        return NetzNoeClient(username, password)
-    
-    # Default to Wiener Netze
-    return WienerNetzeClient(username, password)
+    return get_provider(provider).client_class(username, password)
+
+def get_async_client(provider: str, session, username, password) -> AsyncSmartmeterClient:
+    """Return the asyncio client for a provider, running on the given aiohttp session."""
+    return get_provider(provider).async_client_class(session, username, password)
 
 # For backward compatibility with existing imports in config_flow (initially)
-Smartmeter = WienerNetzeClient
\ No newline at end of file
+Smartmeter = WienerNetzeClient
@@ -0,0 +1,213 @@
+"""Stromnetz Graz API Client.
+
+The web portal (webportal.stromnetz-graz.at) talks JSON over POST:
+login -> bearer token, getInstallations -> installations with their meter
+points, getMeterReading -> readings of a meter point for a date range in
+Daily or QuarterHourly resolution. Each reading carries the meter read (MR)
+and the consumption of the interval (CONSUMP).
+"""
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import requests
+from dateutil.relativedelta import relativedelta
+
+from .base import SmartmeterClient
+from .cache import ResponseCache
+from .client_noe import consumptions_from_daily
+from .constants import PORTAL_TIME_ZONE, QUARTER_HOUR_DEFAULT_DAYS
+from .errors import SmartmeterConnectionError, SmartmeterLoginError
+from .models import parse_timestamp
+from . import policy
+
+LOGGER = logging.getLogger(__name__)
+
+BASE_URL = "https://webportal.stromnetz-graz.at/api/"
+# The portal doesn't say how long a token lives, renew it well before an hour has passed
+TOKEN_TTL = timedelta(minutes=50)
+CACHE_TTLS = {"getInstallations": timedelta(hours=6)}
+
+INTERVAL_DAILY = "Daily"
+INTERVAL_QUARTER_HOUR = "QuarterHourly"
+# Days per getMeterReading request
+MAX_DAYS_PER_REQUEST = {INTERVAL_DAILY: 366, INTERVAL_QUARTER_HOUR: 31}
+INTERVAL_LENGTH = {INTERVAL_DAILY: timedelta(days=1), INTERVAL_QUARTER_HOUR: timedelta(minutes=15)}
+
+# readingType -> OBIS code
+READING_TYPES = {"MR": "1-1:1.8.0", "CONSUMP": "1-1:1.9.0"}
+
+
+def date_windows(date_from: date, date_until: date, max_days: int) -> Iterator[Tuple[date, date]]:
+    """Split [date_from, date_until] into windows of at most max_days days."""
+    start = date_from
+    while start <= date_until:
+        end = min(date_until, start + timedelta(days=max_days - 1))
+        yield start, end
+        start = end + timedelta(days=1)
+
+
+def build_reading_query(meter_point_id, date_from: date, date_until: date, interval: str) -> Dict[str, Any]:
+    """getMeterReading body for the local days [date_from, date_until]."""
+    until = date_until + timedelta(days=1)
+    return {
+        "meterPointId": meter_point_id,
+        "fromDate": datetime(date_from.year, date_from.month, date_from.day, tzinfo=PORTAL_TIME_ZONE).isoformat(),
+        "toDate": datetime(until.year, until.month, until.day, tzinfo=PORTAL_TIME_ZONE).isoformat(),
+        "interval": interval,
+        "unit": "KWH",
+    }
+
+
+def installations_to_zaehlpunkte(installations) -> List[Dict[str, Any]]:
+    """Map getInstallations to the contract layout of the other providers (one contract per installation)."""
+    contracts = []
+    for installation in installations or []:
+        if not isinstance(installation, dict):
+            continue
+        zp_list = []
+        for meter_point in installation.get("meterPoints") or []:
+            zp_list.append({
+                "zaehlpunktnummer": str(meter_point.get("meterPointID")),
+                "zaehlpunktName": meter_point.get("shortName") or meter_point.get("name") or "Smart Meter",
+                "zaehlpunktAnlagentyp": "CONSUMING",
+                "geschaeftspartner": installation.get("customerID"),
+            })
+        contracts.append({"geschaeftspartner": installation.get("customerID"), "zaehlpunkte": zp_list})
+    return contracts
+
+
+def _interval_start(read_time: datetime, length: timedelta) -> datetime:
+    """Start of the interval ending at read_time (local time).
+
+    Days are counted on the local calendar (23/25 hours at the DST switch),
+    quarter hours in absolute time, so the doubled/missing hour is right too.
+    """
+    if length >= timedelta(days=1):
+        return read_time - length
+    return (read_time.astimezone(timezone.utc) - length).astimezone(PORTAL_TIME_ZONE)
+
+
+def readings_to_registers(data, interval: str) -> List[Dict[str, Any]]:
+    """Turn a getMeterReading response into registers (kWh).
+
+    readTime is the end of the interval: the meter read at that moment and the
+    consumption of the preceding interval.
+    """
+    length = INTERVAL_LENGTH[interval]
+    messwerte: Dict[str, List[Dict[str, Any]]] = {obis: [] for obis in READING_TYPES.values()}
+    readings = data.get("readings") if isinstance(data, dict) else data
+    for reading in readings or []:
+        read_time = parse_timestamp(reading.get("readTime"))
+        if read_time is None:
+            continue
+        read_time = read_time.astimezone(PORTAL_TIME_ZONE)
+        for value in reading.get("readingValues") or []:
+            obis = READING_TYPES.get(value.get("readingType"))
+            if obis is None or value.get("value") is None:
+                continue
+            entry = {"messwert": value["value"], "qualitaet": value.get("readingState")}
+            if obis.endswith(".8.0"):
+                entry["zeitpunkt"] = read_time.isoformat()
+            else:
+                entry["zeitVon"] = _interval_start(read_time, length).isoformat()
+                entry["zeitBis"] = read_time.isoformat()
+            messwerte[obis].append(entry)
+    return [{"obisCode": obis, "einheit": "kWh", "messwerte": values} for obis, values in messwerte.items() if values]
+
+
+class StromnetzGrazClient(SmartmeterClient):
+    """Client for Stromnetz Graz."""
+
+    def __init__(self, username, password):
+        super().__init__(username, password)
+        self.session = requests.Session()
+        self._token: Optional[str] = None
+        self._token_expiration: Optional[datetime] = None
+        self.cache = ResponseCache(CACHE_TTLS)
+
+    def is_logged_in(self) -> bool:
+        return self._token is not None
+
+    def is_login_expired(self) -> bool:
+        return self._token_expiration is None or datetime.now() >= self._token_expiration
+
+    def login(self):
+        try:
+            res = self.session.post(
+                BASE_URL + "login", json={"email": self.username, "password": self.password},
+                timeout=policy.REQUEST_TIMEOUT,
+            )
+            result = res.json() if res.status_code == 200 else None
+        except requests.RequestException as e:
+            raise SmartmeterConnectionError(f"Connection error: {e}") from e
+        except ValueError as e:
+            raise SmartmeterLoginError(f"Invalid login response: {e}") from e
+        if not result or not result.get("token"):
+            raise SmartmeterLoginError("Login failed. Check credentials.")
+        self._token = result["token"]
+        self._token_expiration = datetime.now() + TOKEN_TTL
+        return self
+
+    def _call_api(self, endpoint: str, body: Optional[Dict[str, Any]] = None):
+        """POST a query; responses of endpoints in CACHE_TTLS are cached."""
+        url = BASE_URL + endpoint
+        body = body or {}
+        ttl = self.cache.ttl_for(endpoint)
+        key = self.cache.key(url, body)
+        if ttl is not None:
+            data = self.cache.get(key)
+            if data is not None:
+                return data
+
+        res = policy.request(
+            self.session, "POST", url, json=body, headers={"Authorization": f"Bearer {self._token}"}, metrics=self.metrics
+        )
+        if res.status_code == 401:
+            # Token abgelaufen: einmal neu anmelden und wiederholen
+            LOGGER.debug("Token rejected, logging in again")
+            self.login()
+            res = policy.request(
+                self.session, "POST", url, json=body, headers={"Authorization": f"Bearer {self._token}"}, metrics=self.metrics
+            )
+        res.raise_for_status()
+        data = res.json()
+        if ttl is not None:
+            self.cache.put(key, data, ttl)
+        return data
+
+    def zaehlpunkte(self) -> List[Dict[str, Any]]:
+        return installations_to_zaehlpunkte(self._call_api("getInstallations"))
+
+    def _readings(self, meter_point_id: str, date_from: date, date_until: date, interval: str) -> List[Dict[str, Any]]:
+        registers: Dict[str, Dict[str, Any]] = {}
+        for start, end in date_windows(date_from, date_until, MAX_DAYS_PER_REQUEST[interval]):
+            data = self._call_api("getMeterReading", build_reading_query(meter_point_id, start, end, interval))
+            for register in readings_to_registers(data, interval):
+                known = registers.setdefault(register["obisCode"], {**register, "messwerte": []})
+                known["messwerte"].extend(register["messwerte"])
+        return list(registers.values())
+
+    def historical_data(self, zaehlpunktnummer: str, date_from: date = None, date_until: date = None) -> List[Dict[str, Any]]:
+        """Daily meter reads (1-1:1.8.0) and consumption (1-1:1.9.0)."""
+        if date_until is None: date_until = date.today()
+        if date_from is None: date_from = date_until - relativedelta(years=3)
+        return self._readings(zaehlpunktnummer, date_from, date_until, INTERVAL_DAILY)
+
+    def quarter_hour_data(self, zaehlpunktnummer: str, date_from: date = None, date_until: date = None) -> List[Dict[str, Any]]:
+        """15-minute consumption (1-1:1.9.0)."""
+        if date_until is None: date_until = date.today()
+        if date_from is None: date_from = date_until - relativedelta(days=QUARTER_HOUR_DEFAULT_DAYS)
+        registers = self._readings(zaehlpunktnummer, date_from, date_until, INTERVAL_QUARTER_HOUR)
+        return [r for r in registers if r["obisCode"] == READING_TYPES["CONSUMP"]]
+
+    def consumptions(self) -> List[Dict[str, Any]]:
+        """Consumption yesterday / day before yesterday per meter point, from the daily values."""
+        today = date.today()
+        result = []
+        for contract in self.zaehlpunkte():
+            for zp in contract["zaehlpunkte"]:
+                zp_num = zp["zaehlpunktnummer"]
+                registers = self._readings(zp_num, today - timedelta(days=2), today - timedelta(days=1), INTERVAL_DAILY)
+                messwerte = next((r["messwerte"] for r in registers if r["obisCode"] == READING_TYPES["CONSUMP"]), [])
+                result.append(consumptions_from_daily(zp_num, messwerte, today))
+        return result
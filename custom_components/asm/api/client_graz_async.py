@@ -0,0 +1,128 @@
+"""Stromnetz Graz API Client (asyncio)."""
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+from dateutil.relativedelta import relativedelta
+import aiohttp
+
+from .base import AsyncSmartmeterClient
+from .cache import ResponseCache
+from .client_graz import (
+    BASE_URL,
+    CACHE_TTLS,
+    INTERVAL_DAILY,
+    INTERVAL_QUARTER_HOUR,
+    MAX_DAYS_PER_REQUEST,
+    READING_TYPES,
+    TOKEN_TTL,
+    build_reading_query,
+    date_windows,
+    installations_to_zaehlpunkte,
+    readings_to_registers,
+)
+from .client_noe import consumptions_from_daily
+from .constants import QUARTER_HOUR_DEFAULT_DAYS
+from .errors import SmartmeterConnectionError, SmartmeterLoginError
+from . import policy
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncStromnetzGrazClient(AsyncSmartmeterClient):
+    """Client for Stromnetz Graz on an aiohttp session."""
+
+    def __init__(self, session: aiohttp.ClientSession, username, password):
+        super().__init__(session, username, password)
+        self._token: Optional[str] = None
+        self._token_expiration: Optional[datetime] = None
+        self.cache = ResponseCache(CACHE_TTLS)
+
+    def is_logged_in(self) -> bool:
+        return self._token is not None
+
+    def is_login_expired(self) -> bool:
+        return self._token_expiration is None or datetime.now() >= self._token_expiration
+
+    async def login(self):
+        try:
+            async with self.session.post(
+                BASE_URL + "login", json={"email": self.username, "password": self.password}
+            ) as res:
+                result = await res.json(content_type=None) if res.status == 200 else None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise SmartmeterConnectionError(f"Connection error: {e!r}") from e
+        except ValueError as e:
+            raise SmartmeterLoginError(f"Invalid login response: {e}") from e
+        if not result or not result.get("token"):
+            raise SmartmeterLoginError("Login failed. Check credentials.")
+        self._token = result["token"]
+        self._token_expiration = datetime.now() + TOKEN_TTL
+        return self
+
+    async def _call_api(self, endpoint: str, body: Optional[Dict[str, Any]] = None):
+        """POST a query; responses of endpoints in CACHE_TTLS are cached."""
+        url = BASE_URL + endpoint
+        body = body or {}
+        key = self.cache.key(url, body)
+        return await self.inflight.run(key, lambda: self._fetch(endpoint, url, body, key))
+
+    async def _fetch(self, endpoint: str, url: str, body: Dict[str, Any], key: str):
+        ttl = self.cache.ttl_for(endpoint)
+        if ttl is not None:
+            data = self.cache.get(key)
+            if data is not None:
+                return data
+
+        res = await policy.async_request(
+            self.session, "POST", url, json=body, headers={"Authorization": f"Bearer {self._token}"}, metrics=self.metrics
+        )
+        if res.status == 401:
+            # Token abgelaufen: einmal neu anmelden und wiederholen
+            LOGGER.debug("Token rejected, logging in again")
+            await self.shared_login()
+            res = await policy.async_request(
+                self.session, "POST", url, json=body, headers={"Authorization": f"Bearer {self._token}"}, metrics=self.metrics
+            )
+        res.raise_for_status()
+        data = await res.json(content_type=None)
+        if ttl is not None:
+            self.cache.put(key, data, ttl)
+        return data
+
+    async def zaehlpunkte(self) -> List[Dict[str, Any]]:
+        return installations_to_zaehlpunkte(await self._call_api("getInstallations"))
+
+    async def _readings(self, meter_point_id: str, date_from: date, date_until: date, interval: str) -> List[Dict[str, Any]]:
+        registers: Dict[str, Dict[str, Any]] = {}
+        for start, end in date_windows(date_from, date_until, MAX_DAYS_PER_REQUEST[interval]):
+            data = await self._call_api("getMeterReading", build_reading_query(meter_point_id, start, end, interval))
+            for register in readings_to_registers(data, interval):
+                known = registers.setdefault(register["obisCode"], {**register, "messwerte": []})
+                known["messwerte"].extend(register["messwerte"])
+        return list(registers.values())
+
+    async def historical_data(self, zaehlpunktnummer: str, date_from: date = None, date_until: date = None) -> List[Dict[str, Any]]:
+        """Daily meter reads (1-1:1.8.0) and consumption (1-1:1.9.0)."""
+        if date_until is None: date_until = date.today()
+        if date_from is None: date_from = date_until - relativedelta(years=3)
+        return await self._readings(zaehlpunktnummer, date_from, date_until, INTERVAL_DAILY)
+
+    async def quarter_hour_data(self, zaehlpunktnummer: str, date_from: date = None, date_until: date = None) -> List[Dict[str, Any]]:
+        """15-minute consumption (1-1:1.9.0)."""
+        if date_until is None: date_until = date.today()
+        if date_from is None: date_from = date_until - relativedelta(days=QUARTER_HOUR_DEFAULT_DAYS)
+        registers = await self._readings(zaehlpunktnummer, date_from, date_until, INTERVAL_QUARTER_HOUR)
+        return [r for r in registers if r["obisCode"] == READING_TYPES["CONSUMP"]]
+
+    async def consumptions(self) -> List[Dict[str, Any]]:
+        """Consumption yesterday / day before yesterday per meter point, from the daily values."""
+        today = date.today()
+        result = []
+        for contract in await self.zaehlpunkte():
+            for zp in contract["zaehlpunkte"]:
+                zp_num = zp["zaehlpunktnummer"]
+                registers = await self._readings(zp_num, today - timedelta(days=2), today - timedelta(days=1), INTERVAL_DAILY)
+                messwerte = next((r["messwerte"] for r in registers if r["obisCode"] == READING_TYPES["CONSUMP"]), [])
+                result.append(consumptions_from_daily(zp_num, messwerte, today))
+        return result
@@ -1,16 +1,120 @@
 """Netz Niederösterreich API Client."""
+import calendar
 import logging
-from datetime import datetime, date
+from datetime import datetime, date, timedelta, timezone
 import requests
-from typing import List, Dict, Any
+from typing import Iterator, List, Dict, Any, Tuple
 from dateutil.relativedelta import relativedelta
 
 from .base import SmartmeterClient
-from .errors import SmartmeterLoginError, SmartmeterQueryError
+from . import policy
+from .constants import PORTAL_TIME_ZONE
+from .errors import SmartmeterConnectionError, SmartmeterLoginError, SmartmeterQueryError
 
 LOGGER = logging.getLogger(__name__)
 
 BASE_URL = "https://smartmeter.netz-noe.at/orchestration"
+QUARTER_HOUR = timedelta(minutes=15)
+
+
+def day_to_messwerte(day: date, data) -> List[Dict[str, Any]]:
+    """Turn a ConsumptionRecord/Day response into 15-minute messwerte.
+
+    The records carry no timestamps, position i is the i-th quarter hour of
+    the local day (92/100 intervals on DST change days).
+    """
+    if isinstance(data, dict) and "consumptionRecords" in data:
+        values = [record.get("value") for record in data["consumptionRecords"]]
+    elif isinstance(data, list) and data and isinstance(data[0], dict):
+        values = data[0].get("meteredValues") or []
+    else:
+        values = []
+
+    start = datetime(day.year, day.month, day.day, tzinfo=PORTAL_TIME_ZONE).astimezone(timezone.utc)
+    messwerte = []
+    for i, value in enumerate(values):
+        if value is None:
+            continue
+        zeit_von = start + i * QUARTER_HOUR
+        messwerte.append({
+            "zeitVon": zeit_von.isoformat(),
+            "zeitBis": (zeit_von + QUARTER_HOUR).isoformat(),
+            "messwert": value,
+            "qualitaet": "VAL",
+        })
+    return messwerte
+
+
+def quarter_hour_register(messwerte: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{"obisCode": "1-1:1.9.0", "einheit": "kWh", "messwerte": messwerte}]
+
+
+def months(date_from: date, date_until: date) -> Iterator[Tuple[int, int]]:
+    """(year, month) of every month touching [date_from, date_until]."""
+    year, month = date_from.year, date_from.month
+    while (year, month) <= (date_until.year, date_until.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def month_to_messwerte(year: int, month: int, data, date_from: date, date_until: date) -> List[Dict[str, Any]]:
+    """Turn a ConsumptionRecord/Month response into daily messwerte within [date_from, date_until].
+
+    meteredValues holds one value per day of the month (position = day - 1),
+    null for days without data.
+    """
+    if isinstance(data, list) and data and isinstance(data[0], dict):
+        values = data[0].get("meteredValues") or []
+    elif isinstance(data, dict):
+        values = data.get("meteredValues") or []
+    else:
+        values = []
+
+    messwerte = []
+    for i, value in enumerate(values[:calendar.monthrange(year, month)[1]]):
+        if value is None:
+            continue
+        day = date(year, month, i + 1)
+        if not date_from <= day <= date_until:
+            continue
+        start = datetime(day.year, day.month, day.day, tzinfo=PORTAL_TIME_ZONE)
+        next_day = day + timedelta(days=1)
+        messwerte.append({
+            "zeitVon": start.isoformat(),
+            "zeitBis": datetime(next_day.year, next_day.month, next_day.day, tzinfo=PORTAL_TIME_ZONE).isoformat(),
+            "messwert": value,
+            "qualitaet": "VAL",
+        })
+    return messwerte
+
+
+def daily_register(messwerte: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Daily consumption as interval register (kWh per day)."""
+    return [{"obisCode": "1-1:1.9.0", "einheit": "kWh", "messwerte": messwerte}]
+
+
+def meters_to_zaehlpunkte(meters) -> List[Dict[str, Any]]:
+    """Turn a User/GetMeteringPointByAccountId response into zaehlpunkte in the WN layout."""
+    return [
+        {
+            "zaehlpunktnummer": m.get("meterId") or m.get("countingPointId"),
+            "zaehlpunktName": m.get("name", "Smart Meter"),
+            "zaehlpunktAnlagentyp": "CONSUMING",
+        }
+        for m in meters or []
+        if isinstance(m, dict)
+    ]
+
+
+def consumptions_from_daily(zaehlpunktnummer: str, messwerte: List[Dict[str, Any]], today: date) -> Dict[str, Any]:
+    """Yesterday / day before yesterday in the layout of the WN consumptions endpoint (Wh)."""
+    by_day = {m["zeitVon"][:10]: m["messwert"] for m in messwerte}
+    result = {"zaehlpunktnummer": zaehlpunktnummer}
+    for key, days in (("consumptionYesterday", 1), ("consumptionDayBeforeYesterday", 2)):
+        day = (today - timedelta(days=days)).isoformat()
+        if day in by_day:
+            result[key] = {"value": by_day[day] * 1000, "date": day, "validated": True}
+    return result
 
 class NetzNoeClient(SmartmeterClient):
     """Client for Netz Niederösterreich (EVN)."""
@@ -31,57 +135,70 @@ class NetzNoeClient(SmartmeterClient):
             login_data = {"user": self.username, "pwd": self.password, "remember": False}
             res = self.session.post(
                 "https://smartmeter.netz-noe.at/orchestration/Authenticaton/Login", 
-                json=login_data
+                json=login_data,
+                timeout=policy.REQUEST_TIMEOUT,
             )
             if res.status_code != 200 or not res.json().get("success"):
                  raise SmartmeterLoginError("Login failed")
             self._logged_in = True
-        except Exception as e:
-            raise SmartmeterLoginError(f"Connection error: {e}") from e
+        except requests.RequestException as e:
+            raise SmartmeterConnectionError(f"Connection error: {e}") from e
+        except ValueError as e:
+            raise SmartmeterLoginError(f"Invalid login response: {e}") from e
 
     def zaehlpunkte(self) -> List[Dict[str, Any]]:
-        # This is a simplified fetch to match the structure
         try:
-            res = self.session.get(f"{BASE_URL}/User/GetAccountIdByBussinespartnerId?context=1")
+            res = policy.get(self.session, f"{BASE_URL}/User/GetAccountIdByBussinespartnerId?context=1", metrics=self.metrics)
+            res.raise_for_status()
             account_id = res.json()[0]["accountId"]
-            res = self.session.get(f"{BASE_URL}/User/GetMeteringPointByAccountId?accountId={account_id}&context=1")
+            res = policy.get(self.session, f"{BASE_URL}/User/GetMeteringPointByAccountId?accountId={account_id}&context=1", metrics=self.metrics)
+            res.raise_for_status()
             meters = res.json()
-            
-            zp_list = []
-            for m in meters:
-                zp_list.append({
-                    "zaehlpunktnummer": m.get("meterId") or m.get("countingPointId"),
-                    "zaehlpunktName": m.get("name", "Smart Meter"),
-                    "zaehlpunktAnlagentyp": "CONSUMING",
-                })
-            return [{"zaehlpunkte": zp_list}]
-        except Exception:
-            return []
+        except requests.RequestException as e:
+            raise SmartmeterConnectionError(f"Could not fetch metering points: {e}") from e
+        except (LookupError, TypeError, ValueError) as e:
+            raise SmartmeterQueryError(f"Unexpected metering point response: {e!r}") from e
+        return [{"zaehlpunkte": meters_to_zaehlpunkte(meters)}]
+
+    def _daily_messwerte(self, zaehlpunktnummer: str, date_from: date, date_until: date) -> List[Dict[str, Any]]:
+        """Daily values of [date_from, date_until], one ConsumptionRecord/Month request per month."""
+        messwerte = []
+        for year, month in months(date_from, date_until):
+            res = policy.get(
+                self.session, f"{BASE_URL}/ConsumptionRecord/Month",
+                params={"meterId": zaehlpunktnummer, "year": year, "month": month}, metrics=self.metrics,
+            )
+            res.raise_for_status()
+            messwerte.extend(month_to_messwerte(year, month, res.json(), date_from, date_until))
+        return messwerte
 
     def historical_data(self, zaehlpunktnummer: str, date_from: date = None, date_until: date = None) -> List[Dict[str, Any]]:
+        """Daily consumption as 1-1:1.9.0 register (the coordinator derives the 1.8.0 counter from it)."""
         if date_until is None: date_until = date.today()
-        start_str = (date_until - relativedelta(days=1)).strftime("%Y-%m-%d")
-        
-        url = f"{BASE_URL}/ConsumptionRecord/Day"
-        params = {"meterId": zaehlpunktnummer, "day": start_str}
-        
-        try:
-            res = self.session.get(url, params=params)
-            data = res.json()
-            total = 0
-            if data and "consumptionRecords" in data:
-                 for record in data["consumptionRecords"]:
-                     total += record.get("value", 0)
-            
-            # Return as LIST to match interface
-            return [{
-                "obisCode": "1-1:1.8.0",
-                "einheit": "kWh",
-                "messwerte": [{"zeitpunkt": start_str + "T00:00:00", "messwert": total, "status": "VALID"}]
-            }]
-        except Exception:
-            return []
+        if date_from is None: date_from = date_until - relativedelta(years=3)
+        return daily_register(self._daily_messwerte(zaehlpunktnummer, date_from, date_until))
+
+    def quarter_hour_data(self, zaehlpunktnummer: str, date_from: date = None, date_until: date = None) -> List[Dict[str, Any]]:
+        """15-minute values, one ConsumptionRecord/Day request per day."""
+        if date_until is None: date_until = date.today() - relativedelta(days=1)
+        if date_from is None: date_from = date_until
+
+        messwerte = []
+        day = date_from
+        while day <= date_until:
+            res = policy.get(self.session, f"{BASE_URL}/ConsumptionRecord/Day", params={"meterId": zaehlpunktnummer, "day": day.strftime("%Y-%m-%d")}, metrics=self.metrics)
+            res.raise_for_status()
+            messwerte.extend(day_to_messwerte(day, res.json()))
+            day += timedelta(days=1)
+        return quarter_hour_register(messwerte)
 
     def consumptions(self) -> List[Dict[str, Any]]:
-        """Not implemented for Netz NOE."""
-        return []
\ No newline at end of file
+        """Consumption yesterday / day before yesterday per Zählpunkt, from the daily values."""
+        today = date.today()
+        result = []
+        for contract in self.zaehlpunkte():
+            for zp in contract.get("zaehlpunkte", []):
+                zp_num = zp["zaehlpunktnummer"]
+                messwerte = self._daily_messwerte(zp_num, today - timedelta(days=2), today - timedelta(days=1))
+                result.append(consumptions_from_daily(zp_num, messwerte, today))
+        return result
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""Netz Niederösterreich API Client (asyncio)."""
+import asyncio
+import logging
+from datetime import date, timedelta
+from typing import List, Dict, Any
+from dateutil.relativedelta import relativedelta
+import aiohttp
+
+from .base import AsyncSmartmeterClient
+from . import policy
+from .client_noe import (
+    BASE_URL,
+    consumptions_from_daily,
+    daily_register,
+    day_to_messwerte,
+    meters_to_zaehlpunkte,
+    month_to_messwerte,
+    months,
+    quarter_hour_register,
+)
+from .errors import SmartmeterConnectionError, SmartmeterLoginError, SmartmeterQueryError
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncNetzNoeClient(AsyncSmartmeterClient):
+    """Client for Netz Niederösterreich (EVN) on an aiohttp session."""
+
+    def __init__(self, session: aiohttp.ClientSession, username, password):
+        super().__init__(session, username, password)
+        self._logged_in = False
+
+    def is_logged_in(self) -> bool:
+        return self._logged_in
+
+    def is_login_expired(self) -> bool:
+        return False # Simplified for now
+
+    async def login(self):
+        try:
+            login_data = {"user": self.username, "pwd": self.password, "remember": False}
+            async with self.session.post(f"{BASE_URL}/Authenticaton/Login", json=login_data) as res:
+                result = await res.json(content_type=None) if res.status == 200 else None
+            if not result or not result.get("success"):
+                 raise SmartmeterLoginError("Login failed")
+            self._logged_in = True
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise SmartmeterConnectionError(f"Connection error: {e!r}") from e
+        except ValueError as e:
+            raise SmartmeterLoginError(f"Invalid login response: {e}") from e
+
+    async def _get(self, path, params=None):
+        key = (path, tuple(sorted((params or {}).items())))
+        return await self.inflight.run(key, lambda: self._fetch(path, params))
+
+    async def _fetch(self, path, params):
+        res = await policy.async_get(self.session, f"{BASE_URL}/{path}", params=params, metrics=self.metrics)
+        res.raise_for_status()
+        return await res.json(content_type=None)
+
+    async def zaehlpunkte(self) -> List[Dict[str, Any]]:
+        try:
+            accounts = await self._get("User/GetAccountIdByBussinespartnerId", {"context": 1})
+            account_id = accounts[0]["accountId"]
+            meters = await self._get("User/GetMeteringPointByAccountId", {"accountId": account_id, "context": 1})
+        except aiohttp.ClientError as e:
+            raise SmartmeterConnectionError(f"Could not fetch metering points: {e!r}") from e
+        except (LookupError, TypeError, ValueError) as e:
+            raise SmartmeterQueryError(f"Unexpected metering point response: {e!r}") from e
+        return [{"zaehlpunkte": meters_to_zaehlpunkte(meters)}]
+
+    async def _daily_messwerte(self, zaehlpunktnummer: str, date_from: date, date_until: date) -> List[Dict[str, Any]]:
+        """Daily values of [date_from, date_until], one ConsumptionRecord/Month request per month."""
+        messwerte = []
+        for year, month in months(date_from, date_until):
+            data = await self._get("ConsumptionRecord/Month", {"meterId": zaehlpunktnummer, "year": year, "month": month})
+            messwerte.extend(month_to_messwerte(year, month, data, date_from, date_until))
+        return messwerte
+
+    async def historical_data(self, zaehlpunktnummer: str, date_from: date = None, date_until: date = None) -> List[Dict[str, Any]]:
+        """Daily consumption as 1-1:1.9.0 register (the coordinator derives the 1.8.0 counter from it)."""
+        if date_until is None: date_until = date.today()
+        if date_from is None: date_from = date_until - relativedelta(years=3)
+        return daily_register(await self._daily_messwerte(zaehlpunktnummer, date_from, date_until))
+
+    async def quarter_hour_data(self, zaehlpunktnummer: str, date_from: date = None, date_until: date = None) -> List[Dict[str, Any]]:
+        """15-minute values, one ConsumptionRecord/Day request per day."""
+        if date_until is None: date_until = date.today() - relativedelta(days=1)
+        if date_from is None: date_from = date_until
+
+        messwerte = []
+        day = date_from
+        while day <= date_until:
+            data = await self._get("ConsumptionRecord/Day", {"meterId": zaehlpunktnummer, "day": day.strftime("%Y-%m-%d")})
+            messwerte.extend(day_to_messwerte(day, data))
+            day += timedelta(days=1)
+        return quarter_hour_register(messwerte)
+
+    async def consumptions(self) -> List[Dict[str, Any]]:
+        """Consumption yesterday / day before yesterday per Zählpunkt, from the daily values."""
+        today = date.today()
+        result = []
+        for contract in await self.zaehlpunkte():
+            for zp in contract.get("zaehlpunkte", []):
+                zp_num = zp["zaehlpunktnummer"]
+                messwerte = await self._daily_messwerte(zp_num, today - timedelta(days=2), today - timedelta(days=1))
+                result.append(consumptions_from_daily(zp_num, messwerte, today))
+        return result
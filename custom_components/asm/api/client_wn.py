@@ -1,6 +1,6 @@
 """Wiener Netze API Client."""
 import logging
-from datetime import datetime, timedelta, date
+from datetime import datetime, date
 from typing import List, Dict, Any
 import requests
 import json
@@ -11,52 +11,149 @@ import base64
 import hashlib
 import os
 
+from .auth import TokenManager
+from .cache import ResponseCache
+from . import policy
 from .base import SmartmeterClient
 from . import constants as const
 from .errors import SmartmeterConnectionError, SmartmeterLoginError, SmartmeterQueryError
 
 logger = logging.getLogger(__name__)
 
+
+def generate_code_verifier() -> str:
+    return base64.urlsafe_b64encode(os.urandom(32)).decode('utf-8').rstrip('=')
+
+
+def generate_code_challenge(code_verifier: str) -> str:
+    code_challenge = hashlib.sha256(code_verifier.encode('utf-8')).digest()
+    return base64.urlsafe_b64encode(code_challenge).decode('utf-8').rstrip('=')
+
+
+def build_login_url(code_challenge: str) -> str:
+    """Return the log.wien authorization URL for the PKCE login."""
+    params = {
+        "client_id": const.CLIENT_ID,
+        "redirect_uri": const.REDIRECT_URI,
+        "response_mode": "fragment",
+        "response_type": "code",
+        "scope": "openid",
+        "nonce": "",
+        "code_challenge": code_challenge,
+        "code_challenge_method": "S256"
+    }
+    return const.AUTH_URL + "auth?" + parse.urlencode(params)
+
+
+def parse_form_action(content: bytes, error_message: str) -> str:
+    """Return the action URL of the first form on a log.wien login page."""
+    tree = html.fromstring(content)
+    action_list = tree.xpath("(//form/@action)")
+    if not action_list:
+        raise SmartmeterConnectionError(error_message)
+    return action_list[0]
+
+
+def parse_auth_code(location: str) -> str:
+    """Extract the authorization code from the redirect location after the password post."""
+    parsed = parse.urlparse(location)
+    fragment = dict(x.split("=") for x in parsed.fragment.split("&") if "=" in x)
+    code = fragment.get("code")
+    if not code:
+        raise SmartmeterLoginError("Login failed. No code found.")
+    return code
+
+
+def build_customer_index(contracts) -> Dict[str, str]:
+    """Map every Zählpunktnummer to the Geschäftspartner of its contract."""
+    index = {}
+    for c in contracts or []:
+        for zp in c.get("zaehlpunkte", []):
+            index[zp["zaehlpunktnummer"]] = c.get("geschaeftspartner")
+    return index
+
+
+def build_messwerte_query(date_from: date, date_until: date, wertetyp: const.ValueType = const.ValueType.METER_READ) -> Dict[str, str]:
+    return {
+        "datumVon": date_from.strftime("%Y-%m-%d"),
+        "datumBis": date_until.strftime("%Y-%m-%d"),
+        "wertetyp": wertetyp.value,
+    }
+
+
+def filter_zaehlwerke(data) -> List[Dict[str, Any]]:
+    """Keep only the zaehlwerke with a supported OBIS code."""
+    zaehlwerke = data.get("zaehlwerke", [])
+    return [z for z in zaehlwerke if z.get("obisCode") in const.VALID_OBIS_CODES]
+
 class WienerNetzeClient(SmartmeterClient):
     """Client for Wiener Netze."""
 
     def __init__(self, username, password):
         super().__init__(username, password)
         self.session = requests.Session()
-        self._access_token = None
-        self._access_token_expiration = None
-        self._api_gateway_token = None
-        self._api_gateway_b2b_token = None
+        self._tokens = TokenManager()
         self._code_verifier = None
+        # Zählpunktnummer -> Geschäftspartner, filled by zaehlpunkte()
+        self._customer_ids: Dict[str, str] = {}
+        self._customer_ids_expiration = None
+        # Cache for the static endpoints, per client (= per account)
+        self.cache = ResponseCache(const.CACHE_TTLS)
         logger.debug("WienerNetzeClient initialised.")
 
     def _reset(self):
         logger.debug("Resetting session and tokens.")
         self.session = requests.Session()
-        self._access_token = None
+        self._tokens.clear()
     
+    def export_session(self) -> Dict[str, Any]:
+        return self._tokens.as_dict()
+
+    def restore_session(self, state: Dict[str, Any]) -> None:
+        self._tokens.load_dict(state)
+
     def is_login_expired(self):
-        is_expired = self._access_token_expiration is not None and datetime.now() >= self._access_token_expiration
-        return is_expired
+        return self._tokens.is_access_expired()
 
     def is_logged_in(self):
-        return self._access_token is not None and not self.is_login_expired()
+        return self._tokens.is_access_valid() and self._tokens.has_api_keys()
 
     def generate_code_verifier(self):
-        return base64.urlsafe_b64encode(os.urandom(32)).decode('utf-8').rstrip('=')
+        return generate_code_verifier()
     
     def generate_code_challenge(self, code_verifier):
-        code_challenge = hashlib.sha256(code_verifier.encode('utf-8')).digest()
-        return base64.urlsafe_b64encode(code_challenge).decode('utf-8').rstrip('=')
+        return generate_code_challenge(code_verifier)
 
     def login(self):
-        """Login implementation for Wiener Netze."""
-        if self.is_login_expired():
+        """Login implementation for Wiener Netze.
+
+        Uses the refresh token while it is valid and falls back to the full login otherwise.
+        """
+        if not self._tokens.is_access_valid() and self._tokens.can_refresh():
+            try:
+                self._refresh_tokens()
+            except Exception as e:
+                logger.debug(f"Token refresh failed, doing full login: {e}")
+                self._reset()
+        if not self._tokens.is_access_valid():
             self._reset()
-        if not self.is_logged_in():
             self._perform_full_login()
+        if not self._tokens.has_api_keys():
+            self._load_api_keys()
         return self
 
+    def _refresh_tokens(self):
+        res = self.session.post(const.AUTH_URL + "token", data=self._tokens.refresh_request(), timeout=policy.REQUEST_TIMEOUT)
+        if res.status_code != 200:
+            raise SmartmeterLoginError(f"Token refresh failed: {res.status_code}")
+        self._tokens.update(res.json())
+        logger.debug("Access token renewed with refresh token.")
+
+    def _load_api_keys(self):
+        headers = {"Authorization": f"Bearer {self._tokens.access_token}"}
+        config_res = policy.get(self.session, const.API_CONFIG_URL, headers=headers, metrics=self.metrics)
+        self._tokens.set_api_keys(config_res.json())
+
     def _perform_full_login(self):
         if not hasattr(self, '_code_verifier') or not self._code_verifier:
              self._code_verifier = self.generate_code_verifier()
@@ -64,79 +161,62 @@ class WienerNetzeClient(SmartmeterClient):
         challenge = self.generate_code_challenge(self._code_verifier)
         
         # 1. Load Login Page
-        params = {
-            "client_id": "wn-smartmeter",
-            "redirect_uri": const.REDIRECT_URI,
-            "response_mode": "fragment",
-            "response_type": "code",
-            "scope": "openid",
-            "nonce": "",
-            "code_challenge": challenge,
-            "code_challenge_method": "S256"
-        }
-        login_url = const.AUTH_URL + "auth?" + parse.urlencode(params)
+        login_url = build_login_url(challenge)
         
         try:
-            res = self.session.get(login_url)
+            res = self.session.get(login_url, timeout=policy.REQUEST_TIMEOUT)
             if res.status_code != 200:
                 raise SmartmeterConnectionError(f"Login page load failed: {res.status_code}")
             
-            tree = html.fromstring(res.content)
-            action_list = tree.xpath("(//form/@action)")
-            if not action_list:
-                raise SmartmeterConnectionError("No form found on login page")
-            action = action_list[0]
+            action = parse_form_action(res.content, "No form found on login page")
             
             # 2. Post Username
-            res = self.session.post(action, data={"username": self.username, "login": " "})
-            tree = html.fromstring(res.content)
-            action_list = tree.xpath("(//form/@action)")
-            if not action_list:
-                 raise SmartmeterConnectionError("No password form found")
-            action = action_list[0]
+            res = self.session.post(action, data={"username": self.username, "login": " "}, timeout=policy.REQUEST_TIMEOUT)
+            action = parse_form_action(res.content, "No password form found")
             
             # 3. Post Password
-            res = self.session.post(action, data={"username": self.username, "password": self.password}, allow_redirects=False)
+            res = self.session.post(
+                action, data={"username": self.username, "password": self.password},
+                allow_redirects=False, timeout=policy.REQUEST_TIMEOUT
+            )
             
             if "Location" not in res.headers:
                  raise SmartmeterLoginError("Login failed. Check credentials.")
             
-            location = res.headers["Location"]
-            parsed = parse.urlparse(location)
-            fragment = dict(x.split("=") for x in parsed.fragment.split("&") if "=" in x)
-            code = fragment.get("code")
-            if not code:
-                raise SmartmeterLoginError("Login failed. No code found.")
+            code = parse_auth_code(res.headers["Location"])
             
             # 5. Get Token
             token_res = self.session.post(const.AUTH_URL + "token", data={
                 "grant_type": "authorization_code",
-                "client_id": "wn-smartmeter",
+                "client_id": const.CLIENT_ID,
                 "redirect_uri": const.REDIRECT_URI,
                 "code": code,
                 "code_verifier": self._code_verifier
-            })
+            }, timeout=policy.REQUEST_TIMEOUT)
             if token_res.status_code != 200:
                  raise SmartmeterLoginError("Token exchange failed")
             
-            tokens = token_res.json()
-            self._access_token = tokens["access_token"]
-            self._access_token_expiration = datetime.now() + timedelta(seconds=tokens["expires_in"])
-            
-            # 6. Get API Keys
-            headers = {"Authorization": f"Bearer {self._access_token}"}
-            config_res = self.session.get(const.API_CONFIG_URL, headers=headers)
-            config = config_res.json()
-            
-            self._api_gateway_token = config["b2cApiKey"]
-            self._api_gateway_b2b_token = config["b2bApiKey"]
+            self._tokens.update(token_res.json())
             
         except Exception as e:
             logger.exception("Exception during full login flow")
             raise
 
     def zaehlpunkte(self) -> List[Dict[str, Any]]:
-        return self._call_api("zaehlpunkte")
+        contracts = self._call_api("zaehlpunkte")
+        self._update_customer_index(contracts)
+        return contracts
+
+    def _update_customer_index(self, contracts):
+        self._customer_ids = build_customer_index(contracts)
+        self._customer_ids_expiration = datetime.now() + const.CONTRACT_INDEX_TTL
+
+    def _customer_id(self, zaehlpunktnummer: str):
+        """Return the Geschäftspartner of a Zählpunkt, re-fetching the contracts only if the index is stale."""
+        is_stale = self._customer_ids_expiration is None or datetime.now() >= self._customer_ids_expiration
+        if is_stale or zaehlpunktnummer not in self._customer_ids:
+            self.zaehlpunkte()
+        return self._customer_ids.get(zaehlpunktnummer)
 
     def consumptions(self) -> List[Dict[str, Any]]:
         """Returns response from 'consumptions' endpoint."""
@@ -147,22 +227,11 @@ class WienerNetzeClient(SmartmeterClient):
         if date_until is None: date_until = date.today()
         if date_from is None: date_from = date_until - relativedelta(years=3)
         
-        contracts = self.zaehlpunkte()
-        customer_id = None
-        for c in contracts:
-            for zp in c.get("zaehlpunkte", []):
-                if zp["zaehlpunktnummer"] == zaehlpunktnummer:
-                    customer_id = c["geschaeftspartner"]
-                    break
-        
+        customer_id = self._customer_id(zaehlpunktnummer)
         if not customer_id:
              raise SmartmeterQueryError("Customer ID not found")
 
-        query = {
-            "datumVon": date_from.strftime("%Y-%m-%d"),
-            "datumBis": date_until.strftime("%Y-%m-%d"),
-            "wertetyp": "METER_READ",
-        }
+        query = build_messwerte_query(date_from, date_until)
         
         data = self._call_api(
             f"zaehlpunkte/{customer_id}/{zaehlpunktnummer}/messwerte",
@@ -171,20 +240,52 @@ class WienerNetzeClient(SmartmeterClient):
             extra_headers={"Accept": "application/json"}
         )
         
-        zaehlwerke = data.get("zaehlwerke", [])
-        valid_data = [z for z in zaehlwerke if z.get("obisCode") in const.VALID_OBIS_CODES]
-        return valid_data
+        return filter_zaehlwerke(data)
+
+    def quarter_hour_data(self, zaehlpunktnummer: str, date_from: date = None, date_until: date = None) -> List[Dict[str, Any]]:
+        if date_until is None: date_until = date.today()
+        if date_from is None: date_from = date_until - relativedelta(days=const.QUARTER_HOUR_DEFAULT_DAYS)
+
+        customer_id = self._customer_id(zaehlpunktnummer)
+        if not customer_id:
+             raise SmartmeterQueryError("Customer ID not found")
+
+        data = self._call_api(
+            f"zaehlpunkte/{customer_id}/{zaehlpunktnummer}/messwerte",
+            base_url=const.API_URL_B2B,
+            query=build_messwerte_query(date_from, date_until, const.ValueType.QUARTER_HOUR),
+            extra_headers={"Accept": "application/json"}
+        )
+        return filter_zaehlwerke(data)
 
     def _call_api(self, endpoint, base_url=None, query=None, extra_headers=None):
         if base_url is None: base_url = const.API_URL
         url = parse.urljoin(base_url, endpoint)
         
         headers = {
-            "Authorization": f"Bearer {self._access_token}",
-            "X-Gateway-APIKey": self._api_gateway_b2b_token if base_url == const.API_URL_B2B else self._api_gateway_token
+            "Authorization": f"Bearer {self._tokens.access_token}",
+            "X-Gateway-APIKey": self._tokens.b2b_api_key if base_url == const.API_URL_B2B else self._tokens.b2c_api_key
         }
         if extra_headers: headers.update(extra_headers)
-        
-        res = self.session.get(url, params=query, headers=headers)
+
+        ttl = self.cache.ttl_for(endpoint)
+        if ttl is None:
+            res = policy.get(self.session, url, params=query, headers=headers, metrics=self.metrics)
+            res.raise_for_status()
+            return res.json()
+
+        key = self.cache.key(url, query)
+        data = self.cache.get(key)
+        if data is not None:
+            logger.debug(f"Cache hit for {endpoint}")
+            return data
+        res = policy.get(self.session, url, params=query, headers={**headers, **self.cache.conditional_headers(key)}, metrics=self.metrics)
+        if res.status_code == 304:
+            data = self.cache.revalidated(key, ttl)
+            if data is not None:
+                return data
+            res = policy.get(self.session, url, params=query, headers=headers, metrics=self.metrics)
         res.raise_for_status()
-        return res.json()
\ No newline at end of file
+        data = res.json()
+        self.cache.put(key, data, ttl, res.headers)
+        return data
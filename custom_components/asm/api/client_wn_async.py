@@ -0,0 +1,219 @@
+"""Wiener Netze API Client (asyncio)."""
+import logging
+from datetime import datetime, date
+from typing import List, Dict, Any
+from urllib import parse
+from dateutil.relativedelta import relativedelta
+import aiohttp
+
+from .auth import TokenManager
+from .cache import ResponseCache
+from . import policy
+from .base import AsyncSmartmeterClient
+from .models import Register
+from .streaming import stream_registers
+from . import constants as const
+from .client_wn import (
+    generate_code_verifier,
+    generate_code_challenge,
+    build_login_url,
+    parse_form_action,
+    parse_auth_code,
+    build_customer_index,
+    build_messwerte_query,
+)
+from .errors import SmartmeterConnectionError, SmartmeterLoginError, SmartmeterQueryError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncWienerNetzeClient(AsyncSmartmeterClient):
+    """Client for Wiener Netze on an aiohttp session.
+
+    The session needs its own cookie jar, log.wien keeps the login state in cookies.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, username, password):
+        super().__init__(session, username, password)
+        self._tokens = TokenManager()
+        self._code_verifier = None
+        # Zählpunktnummer -> Geschäftspartner, filled by zaehlpunkte()
+        self._customer_ids: Dict[str, str] = {}
+        self._customer_ids_expiration = None
+        # Cache for the static endpoints, per client (= per account)
+        self.cache = ResponseCache(const.CACHE_TTLS)
+        logger.debug("AsyncWienerNetzeClient initialised.")
+
+    def _reset(self):
+        logger.debug("Resetting cookies and tokens.")
+        self.session.cookie_jar.clear()
+        self._tokens.clear()
+
+    def export_session(self) -> Dict[str, Any]:
+        return self._tokens.as_dict()
+
+    def restore_session(self, state: Dict[str, Any]) -> None:
+        self._tokens.load_dict(state)
+
+    def is_login_expired(self):
+        return self._tokens.is_access_expired()
+
+    def is_logged_in(self):
+        return self._tokens.is_access_valid() and self._tokens.has_api_keys()
+
+    async def login(self):
+        """Login implementation for Wiener Netze.
+
+        Uses the refresh token while it is valid and falls back to the full login otherwise.
+        """
+        if not self._tokens.is_access_valid() and self._tokens.can_refresh():
+            try:
+                await self._refresh_tokens()
+            except Exception as e:
+                logger.debug(f"Token refresh failed, doing full login: {e}")
+                self._reset()
+        if not self._tokens.is_access_valid():
+            self._reset()
+            await self._perform_full_login()
+        if not self._tokens.has_api_keys():
+            await self._load_api_keys()
+        return self
+
+    async def _refresh_tokens(self):
+        async with self.session.post(const.AUTH_URL + "token", data=self._tokens.refresh_request()) as res:
+            if res.status != 200:
+                raise SmartmeterLoginError(f"Token refresh failed: {res.status}")
+            self._tokens.update(await res.json(content_type=None))
+        logger.debug("Access token renewed with refresh token.")
+
+    async def _load_api_keys(self):
+        headers = {"Authorization": f"Bearer {self._tokens.access_token}"}
+        config_res = await policy.async_get(self.session, const.API_CONFIG_URL, headers=headers, metrics=self.metrics)
+        self._tokens.set_api_keys(await config_res.json(content_type=None))
+
+    async def _perform_full_login(self):
+        if not self._code_verifier:
+            self._code_verifier = generate_code_verifier()
+
+        challenge = generate_code_challenge(self._code_verifier)
+
+        try:
+            # 1. Load Login Page
+            async with self.session.get(build_login_url(challenge)) as res:
+                if res.status != 200:
+                    raise SmartmeterConnectionError(f"Login page load failed: {res.status}")
+                action = parse_form_action(await res.read(), "No form found on login page")
+
+            # 2. Post Username
+            async with self.session.post(action, data={"username": self.username, "login": " "}) as res:
+                action = parse_form_action(await res.read(), "No password form found")
+
+            # 3. Post Password
+            async with self.session.post(
+                action, data={"username": self.username, "password": self.password}, allow_redirects=False
+            ) as res:
+                location = res.headers.get("Location")
+            if not location:
+                raise SmartmeterLoginError("Login failed. Check credentials.")
+            code = parse_auth_code(location)
+
+            # 5. Get Token
+            async with self.session.post(const.AUTH_URL + "token", data={
+                "grant_type": "authorization_code",
+                "client_id": const.CLIENT_ID,
+                "redirect_uri": const.REDIRECT_URI,
+                "code": code,
+                "code_verifier": self._code_verifier
+            }) as token_res:
+                if token_res.status != 200:
+                    raise SmartmeterLoginError("Token exchange failed")
+                self._tokens.update(await token_res.json(content_type=None))
+
+        except aiohttp.ClientError as e:
+            logger.exception("Exception during full login flow")
+            raise SmartmeterConnectionError(f"Connection error: {e}") from e
+
+    async def zaehlpunkte(self) -> List[Dict[str, Any]]:
+        contracts = await self._call_api("zaehlpunkte")
+        self._customer_ids = build_customer_index(contracts)
+        self._customer_ids_expiration = datetime.now() + const.CONTRACT_INDEX_TTL
+        return contracts
+
+    async def _customer_id(self, zaehlpunktnummer: str):
+        """Return the Geschäftspartner of a Zählpunkt, re-fetching the contracts only if the index is stale."""
+        is_stale = self._customer_ids_expiration is None or datetime.now() >= self._customer_ids_expiration
+        if is_stale or zaehlpunktnummer not in self._customer_ids:
+            await self.zaehlpunkte()
+        return self._customer_ids.get(zaehlpunktnummer)
+
+    async def consumptions(self) -> List[Dict[str, Any]]:
+        """Returns response from 'consumptions' endpoint."""
+        logger.debug("Calling consumptions()...")
+        return await self._call_api("zaehlpunkt/consumptions")
+
+    async def historical_data(self, zaehlpunktnummer: str, date_from: date = None, date_until: date = None) -> List[Register]:
+        if date_until is None: date_until = date.today()
+        if date_from is None: date_from = date_until - relativedelta(years=3)
+        return await self._messwerte(zaehlpunktnummer, build_messwerte_query(date_from, date_until))
+
+    async def quarter_hour_data(self, zaehlpunktnummer: str, date_from: date = None, date_until: date = None) -> List[Register]:
+        if date_until is None: date_until = date.today()
+        if date_from is None: date_from = date_until - relativedelta(days=const.QUARTER_HOUR_DEFAULT_DAYS)
+        return await self._messwerte(
+            zaehlpunktnummer, build_messwerte_query(date_from, date_until, const.ValueType.QUARTER_HOUR)
+        )
+
+    async def _messwerte(self, zaehlpunktnummer: str, query: Dict[str, str]) -> List[Register]:
+        """B2B messwerte of a Zählpunkt, parsed while the response arrives (see streaming.py)."""
+        customer_id = await self._customer_id(zaehlpunktnummer)
+        if not customer_id:
+             raise SmartmeterQueryError("Customer ID not found")
+
+        url = parse.urljoin(const.API_URL_B2B, f"zaehlpunkte/{customer_id}/{zaehlpunktnummer}/messwerte")
+        return await self.inflight.run(self.cache.key(url, query), lambda: self._stream_messwerte(url, query))
+
+    async def _stream_messwerte(self, url: str, query: Dict[str, str]) -> List[Register]:
+        headers = {**self._headers(const.API_URL_B2B), "Accept": "application/json"}
+        async with policy.async_stream(self.session, "GET", url, params=query, headers=headers, metrics=self.metrics) as res:
+            res.raise_for_status()
+            return [register async for register in stream_registers(res.content)]
+
+    def _headers(self, base_url) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self._tokens.access_token}",
+            "X-Gateway-APIKey": self._tokens.b2b_api_key if base_url == const.API_URL_B2B else self._tokens.b2c_api_key
+        }
+
+    async def _call_api(self, endpoint, base_url=None, query=None, extra_headers=None):
+        if base_url is None: base_url = const.API_URL
+        url = parse.urljoin(base_url, endpoint)
+        return await self.inflight.run(
+            self.cache.key(url, query), lambda: self._fetch(endpoint, url, base_url, query, extra_headers)
+        )
+
+    async def _fetch(self, endpoint, url, base_url, query, extra_headers):
+        headers = self._headers(base_url)
+        if extra_headers: headers.update(extra_headers)
+
+        ttl = self.cache.ttl_for(endpoint)
+        if ttl is None:
+            res = await policy.async_get(self.session, url, params=query, headers=headers, metrics=self.metrics)
+            res.raise_for_status()
+            return await res.json(content_type=None)
+
+        key = self.cache.key(url, query)
+        data = self.cache.get(key)
+        if data is not None:
+            logger.debug(f"Cache hit for {endpoint}")
+            return data
+        res = await policy.async_get(self.session, url, params=query, headers={**headers, **self.cache.conditional_headers(key)}, metrics=self.metrics)
+        if res.status == 304:
+            data = self.cache.revalidated(key, ttl)
+            if data is not None:
+                return data
+            # Entry was evicted meanwhile: fetch unconditionally
+            res = await policy.async_get(self.session, url, params=query, headers=headers, metrics=self.metrics)
+        res.raise_for_status()
+        data = await res.json(content_type=None)
+        self.cache.put(key, data, ttl, res.headers)
+        return data
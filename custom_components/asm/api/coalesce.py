@@ -0,0 +1,34 @@
+"""Single-flight coalescing of identical requests."""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one execution and its result.
+
+    Used by the async clients, so entries (or a config flow) sharing a client
+    don't send the same request twice while it is in flight. The result is
+    shared, callers must not modify it.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.coalesced += 1
+        # shield: a cancelled caller doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Retrieve the exception, all callers may have been cancelled meanwhile
+        if not task.cancelled():
+            task.exception()
@@ -2,6 +2,8 @@
     API constants for Austria Smartmeter (Wiener Netze).
 """
 import enum
+from datetime import timedelta
+from zoneinfo import ZoneInfo
 
 PAGE_URL = "https://smartmeter-web.wienernetze.at/"
 API_CONFIG_URL = "https://smartmeter-web.wienernetze.at/assets/app-config.json"
@@ -10,7 +12,28 @@ API_URL = "https://api.wstw.at/gateway/WN_SMART_METER_PORTAL_API_B2C/1.0"
 API_URL_B2B = "https://api.wstw.at/gateway/WN_SMART_METER_PORTAL_API_B2B/1.0"
 REDIRECT_URI = "https://smartmeter-web.wienernetze.at/"
 API_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+# Timestamps without zone information are local Austrian time
+PORTAL_TIME_ZONE = ZoneInfo("Europe/Vienna")
 AUTH_URL = "https://log.wien/auth/realms/logwien/protocol/openid-connect/"
+CLIENT_ID = "wn-smartmeter"
+
+# Renew the access token this long before it expires
+TOKEN_REFRESH_MARGIN = timedelta(seconds=60)
+# The gateway API keys in app-config.json change rarely
+API_KEYS_TTL = timedelta(hours=24)
+
+# Days of 15-minute data requested when no start date is given
+QUARTER_HOUR_DEFAULT_DAYS = 7
+
+# How long the Zählpunkt -> Geschäftspartner index is trusted before zaehlpunkte() is called again
+CONTRACT_INDEX_TTL = timedelta(hours=1)
+
+# Response cache TTL per endpoint (B2C API). Contracts almost never change; consumptions change
+# with every publication, so they are only revalidated (ETag / Last-Modified, 304 saves the body).
+CACHE_TTLS = {
+    "zaehlpunkte": timedelta(hours=6),
+    "zaehlpunkt/consumptions": timedelta(0),
+}
 
 LOGIN_ARGS = {
     "client_id": "wn-smartmeter",
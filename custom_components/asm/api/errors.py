@@ -14,4 +14,9 @@ class SmartmeterLoginError(SmartmeterError):
 
 class SmartmeterQueryError(SmartmeterError):
     """Exception for query errors."""
-    pass
\ No newline at end of file
+    pass
+
+
+class SmartmeterCircuitOpenError(SmartmeterConnectionError):
+    """Requests to a failing portal are paused by the circuit breaker."""
+    pass
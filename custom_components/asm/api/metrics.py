@@ -0,0 +1,181 @@
+"""Request and update metrics: latency histograms, bytes, retries and errors per endpoint.
+
+Every client keeps a RequestMetrics (filled by the request policy), the
+coordinator an UpdateMetrics. Both end up in the diagnostics download.
+request_scope() additionally counts the requests of one piece of work (an
+update) while other work (backfill, export) uses the same client.
+"""
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+# Upper bounds (seconds) of the latency buckets; one more bucket for everything slower
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Path segments with longer digit runs are ids (Zählpunkt, Geschäftspartner, ...)
+_ID_SEGMENT = re.compile(r"\d{4,}")
+
+
+def endpoint_label(url: str) -> str:
+    """Path of a URL with the ids replaced by '*', so all meters share one entry."""
+    return "/".join("*" if _ID_SEGMENT.search(segment) else segment for segment in urlsplit(url).path.split("/"))
+
+
+class EndpointMetrics:
+    """Counters and latency histogram of one endpoint."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.requests += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), len(LATENCY_BUCKETS))
+        self.histogram[bucket] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "mean_seconds": round(self.seconds / self.requests, 3) if self.requests else None,
+            "max_seconds": round(self.max_seconds, 3),
+            "latency": {label: count for label, count in zip(labels, self.histogram) if count},
+        }
+
+
+class RequestCounter:
+    """Requests and bytes recorded inside a request_scope()."""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+
+
+_scope: ContextVar[Optional[RequestCounter]] = ContextVar("asm_request_scope", default=None)
+
+
+@contextmanager
+def request_scope() -> Iterator[RequestCounter]:
+    """Count the requests of the current task and the tasks it starts (a shared request counts for its starter)."""
+    counter = RequestCounter()
+    token = _scope.set(counter)
+    try:
+        yield counter
+    finally:
+        _scope.reset(token)
+
+
+def _count_in_scope(size: int) -> None:
+    counter = _scope.get()
+    if counter is not None:
+        counter.requests += 1
+        counter.bytes += size
+
+
+class RequestMetrics:
+    """Metrics of one client (account). Locked, the sync clients may run in several threads."""
+
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self.logins = 0
+        self.login_failures = 0
+        self._lock = threading.Lock()
+
+    def _endpoint(self, label: str) -> EndpointMetrics:
+        if label not in self.endpoints:
+            self.endpoints[label] = EndpointMetrics()
+        return self.endpoints[label]
+
+    def record_response(self, label: str, seconds: float, size: int, status: int) -> None:
+        """One answered request; status >= 400 counts as error."""
+        with self._lock:
+            endpoint = self._endpoint(label)
+            endpoint.observe(seconds)
+            endpoint.bytes += size
+            if status >= 400:
+                endpoint.errors += 1
+        _count_in_scope(size)
+
+    def record_error(self, label: str, seconds: float) -> None:
+        """Request without response (connection error, timeout)."""
+        with self._lock:
+            endpoint = self._endpoint(label)
+            endpoint.observe(seconds)
+            endpoint.errors += 1
+        _count_in_scope(0)
+
+    def record_retry(self, label: str) -> None:
+        with self._lock:
+            self._endpoint(label).retries += 1
+
+    def record_login(self, success: bool) -> None:
+        with self._lock:
+            self.logins += 1
+            if not success:
+                self.login_failures += 1
+
+    @property
+    def total_requests(self) -> int:
+        return sum(endpoint.requests for endpoint in self.endpoints.values())
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(endpoint.bytes for endpoint in self.endpoints.values())
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "logins": self.logins,
+                "login_failures": self.login_failures,
+                "endpoints": {label: endpoint.as_dict() for label, endpoint in sorted(self.endpoints.items())},
+            }
+
+
+class UpdateMetrics:
+    """Duration and traffic of the coordinator updates."""
+
+    def __init__(self):
+        self.updates = 0
+        self.failures = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_duration: Optional[float] = None
+        self.last_requests: Optional[int] = None
+        self.last_bytes: Optional[int] = None
+        self.last_success: Optional[bool] = None
+
+    def record(self, seconds: float, requests: int, size: int, success: bool) -> None:
+        self.updates += 1
+        if not success:
+            self.failures += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.last_duration = round(seconds, 3)
+        self.last_requests = requests
+        self.last_bytes = size
+        self.last_success = success
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "updates": self.updates,
+            "failures": self.failures,
+            "mean_seconds": round(self.total_seconds / self.updates, 3) if self.updates else None,
+            "max_seconds": round(self.max_seconds, 3),
+            "last_duration": self.last_duration,
+            "last_requests": self.last_requests,
+            "last_bytes": self.last_bytes,
+            "last_success": self.last_success,
+        }
@@ -0,0 +1,216 @@
+"""Normalized data model for provider responses.
+
+The portals name the same things differently (zeitBis/zeitpunkt/readAt,
+messwert/value/amount, ...). The functions here probe those keys once per
+fetch and return slotted dataclasses with parsed datetimes and floats, so
+nothing downstream has to deal with the raw payloads.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from .constants import PORTAL_TIME_ZONE
+
+TIMESTAMP_KEYS = ("zeitBis", "zeitVon", "zeitpunkt", "date", "timestamp", "readAt")
+VALUE_KEYS = ("messwert", "value", "amount")
+QUALITY_KEYS = ("qualitaet", "status")
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse a portal timestamp; timestamps without zone are local Austrian time."""
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, str) and value:
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    else:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=PORTAL_TIME_ZONE)
+    return parsed
+
+
+def _first(raw: Dict[str, Any], keys) -> Any:
+    for key in keys:
+        if raw.get(key) is not None:
+            return raw[key]
+    return None
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(slots=True)
+class Reading:
+    """A single value: a meter read at `timestamp`, or consumption of the interval [start, timestamp]."""
+
+    timestamp: datetime
+    value: Optional[float]
+    quality: Optional[str] = None
+    start: Optional[datetime] = None
+
+    def as_list(self) -> list:
+        return [
+            self.timestamp.isoformat(),
+            self.value,
+            self.quality,
+            self.start.isoformat() if self.start else None,
+        ]
+
+    @classmethod
+    def from_list(cls, data: list) -> "Reading":
+        return cls(parse_timestamp(data[0]), data[1], data[2], parse_timestamp(data[3]))
+
+
+@dataclass(slots=True)
+class Register:
+    """All readings of one OBIS code of a Zählpunkt, sorted by timestamp."""
+
+    obis_code: str
+    unit: Optional[str]
+    readings: List[Reading] = field(default_factory=list)
+
+    @property
+    def latest(self) -> Optional[Reading]:
+        return self.readings[-1] if self.readings else None
+
+    def merge(self, other: "Register") -> "Register":
+        """New register with the readings of both, deduplicated by timestamp (other wins)."""
+        by_ts = {r.timestamp: r for r in self.readings}
+        by_ts.update((r.timestamp, r) for r in other.readings)
+        return Register(self.obis_code, other.unit or self.unit, [by_ts[ts] for ts in sorted(by_ts)])
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"obis_code": self.obis_code, "unit": self.unit, "readings": [r.as_list() for r in self.readings]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Register":
+        return cls(data["obis_code"], data.get("unit"), [Reading.from_list(r) for r in data.get("readings", [])])
+
+
+@dataclass(slots=True)
+class ConsumptionStat:
+    """A statistic value such as 'consumption yesterday'."""
+
+    value: Optional[float]
+    date: Optional[str] = None
+    validated: Optional[bool] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"value": self.value, "date": self.date, "validated": self.validated}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConsumptionStat":
+        return cls(_to_float(data.get("value")), data.get("date"), data.get("validated"))
+
+
+def wh_factor(unit: Optional[str]) -> float:
+    """Factor to convert a register's unit to Wh."""
+    return 1000.0 if unit and unit.lower() == "kwh" else 1.0
+
+
+def normalize_reading(raw: Dict[str, Any]) -> Optional[Reading]:
+    """Turn one messwert into a Reading (None if it has no usable timestamp)."""
+    timestamp = parse_timestamp(_first(raw, TIMESTAMP_KEYS))
+    if timestamp is None:
+        return None
+    start = parse_timestamp(raw.get("zeitVon")) if raw.get("zeitBis") else None
+    return Reading(timestamp, _to_float(_first(raw, VALUE_KEYS)), _first(raw, QUALITY_KEYS), start)
+
+
+def normalize_register(raw: Dict[str, Any]) -> Optional[Register]:
+    """Turn a WN zaehlwerk (or the equivalent of other providers) into a Register."""
+    obis_code = raw.get("obisCode")
+    if not obis_code:
+        return None
+    readings = [r for r in (normalize_reading(v) for v in raw.get("messwerte") or [] if isinstance(v, dict)) if r]
+    readings.sort(key=lambda r: r.timestamp)
+    return Register(obis_code, raw.get("einheit"), readings)
+
+
+def normalize_registers(payload: Any) -> Dict[str, Register]:
+    """Turn a historical_data/quarter_hour_data response into {obis_code: Register}.
+
+    Registers in the payload (from the streaming clients) are taken as they are.
+    """
+    if isinstance(payload, (dict, Register)):
+        payload = [payload]
+    registers = {}
+    for raw in payload or []:
+        if isinstance(raw, Register):
+            register = raw
+        elif isinstance(raw, dict):
+            register = normalize_register(raw)
+        else:
+            continue
+        if register is None:
+            continue
+        if register.obis_code in registers:
+            register = registers[register.obis_code].merge(register)
+        registers[register.obis_code] = register
+    return registers
+
+
+def normalize_stats(raw: Optional[Dict[str, Any]]) -> Dict[str, ConsumptionStat]:
+    """Keep the statistic entries (dicts with a value) of a consumptions response."""
+    stats = {}
+    for key, value in (raw or {}).items():
+        if isinstance(value, dict) and "value" in value:
+            stats[key] = ConsumptionStat.from_dict(value)
+    return stats
+
+
+# Interval register -> counter register derived from it, for providers that only deliver consumption per period
+COUNTER_OF = {"1-1:1.9.0": "1-1:1.8.0", "1-1:2.9.0": "1-1:2.8.0"}
+
+
+def derive_counter(register: Register, obis_code: str, known: Optional[Register] = None) -> Register:
+    """Counter register as running total of an interval register.
+
+    Without known counter readings the total starts at 0 before the first
+    interval. Otherwise the known (already published) values are kept:
+    newer intervals are added to the newest known value and older intervals
+    (backfill) are subtracted from the oldest one, so they may go below 0.
+    """
+    intervals = [r for r in register.readings if r.value is not None]
+    if known is None or not known.readings:
+        total = 0.0
+        readings = []
+        for reading in intervals:
+            total += reading.value
+            readings.append(Reading(reading.timestamp, total, reading.quality))
+        return Register(obis_code, register.unit, readings)
+
+    first, last = known.readings[0], known.readings[-1]
+    # Älter als der älteste bekannte Stand: rückwärts vom bekannten Wert abziehen
+    older = []
+    total = first.value
+    for reading in reversed(intervals):
+        if reading.timestamp > first.timestamp:
+            continue
+        if reading.timestamp < first.timestamp:
+            older.append(Reading(reading.timestamp, total, reading.quality))
+        total -= reading.value
+    older.reverse()
+    # Neuer als der neueste bekannte Stand: weiterzählen
+    newer = []
+    total = last.value
+    for reading in intervals:
+        if reading.timestamp > last.timestamp:
+            total += reading.value
+            newer.append(Reading(reading.timestamp, total, reading.quality))
+    return Register(obis_code, register.unit or known.unit, older + known.readings + newer)
+
+
+def merge_registers(known: Dict[str, Register], fetched: Iterable[Register]) -> Dict[str, Register]:
+    merged = dict(known)
+    for register in fetched:
+        old = merged.get(register.obis_code)
+        merged[register.obis_code] = old.merge(register) if old else register
+    return merged
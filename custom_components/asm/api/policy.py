@@ -0,0 +1,317 @@
+"""Request policy shared by all clients: timeouts, rate limit, retries and circuit breaker.
+
+All data requests to the portals go through get() / async_get() (or
+request() / async_request() for read-only POST queries, async_stream() for
+large responses that are parsed while they arrive). Token buckets
+and circuit breakers are kept per host in DEFAULT_POLICY, so several clients
+(accounts) talking to the same portal share them. With a RequestMetrics every
+attempt is recorded under its endpoint.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+
+from .errors import SmartmeterCircuitOpenError, SmartmeterConnectionError
+from .metrics import RequestMetrics, endpoint_label
+
+logger = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 60
+# (connect, read) for requests
+REQUEST_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+# For the aiohttp sessions of the async clients
+ASYNC_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT)
+
+RATE_LIMIT_PER_SECOND = 2.0
+RATE_LIMIT_BURST = 5
+
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+# A longer Retry-After is not waited for, the request fails instead
+MAX_RETRY_AFTER = 120.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+BREAKER_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 300.0
+
+
+class TokenBucket:
+    """Classic token bucket; reserve() returns how long the caller has to wait."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Token is taken now, the bucket may go negative; the deficit is the wait time
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures; after `reset_seconds` one trial request is let through."""
+
+    def __init__(self, threshold: int, reset_seconds: float):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                # Half-open: this request is the trial, further ones wait for its result
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                if self._opened_at is None:
+                    logger.warning(f"Circuit opened after {self.failures} failed requests")
+                self._opened_at = time.monotonic()
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestPolicy:
+    """Rate limiter and circuit breaker per host plus the retry rules."""
+
+    def __init__(self, rate: float = RATE_LIMIT_PER_SECOND, burst: int = RATE_LIMIT_BURST,
+                 max_attempts: int = MAX_ATTEMPTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_attempts = max_attempts
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(BREAKER_THRESHOLD, BREAKER_RESET_SECONDS)
+            return self._breakers[host]
+
+    def acquire(self, host: str) -> float:
+        """Check the breaker and take a token; returns the seconds to wait before sending."""
+        if not self.breaker(host).allow():
+            raise SmartmeterCircuitOpenError(f"{host} is failing, requests paused")
+        return self.bucket(host).reserve()
+
+    @staticmethod
+    def backoff(attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff, at least Retry-After."""
+        delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def should_retry(self, attempt: int, status: int, retry_after: Optional[float]) -> bool:
+        if status not in RETRY_STATUS or attempt + 1 >= self.max_attempts:
+            return False
+        return retry_after is None or retry_after <= MAX_RETRY_AFTER
+
+
+DEFAULT_POLICY = RequestPolicy()
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc
+
+
+def request(session: requests.Session, method: str, url: str, policy: RequestPolicy = DEFAULT_POLICY,
+            metrics: Optional[RequestMetrics] = None, endpoint: Optional[str] = None, **kwargs) -> requests.Response:
+    """Request with rate limit, timeouts, retries and circuit breaker (blocking).
+
+    Only for idempotent requests (GET, or read-only POST queries).
+    """
+    host = _host(url)
+    label = endpoint or endpoint_label(url)
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+    attempt = 0
+    while True:
+        wait = policy.acquire(host)
+        if wait:
+            time.sleep(wait)
+        started = time.monotonic()
+        try:
+            res = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if metrics is not None:
+                metrics.record_error(label, time.monotonic() - started)
+            policy.breaker(host).record_failure()
+            if attempt + 1 >= policy.max_attempts:
+                raise SmartmeterConnectionError(f"Request to {host} failed: {e}") from e
+            delay = policy.backoff(attempt)
+        else:
+            if metrics is not None:
+                metrics.record_response(label, time.monotonic() - started, len(res.content), res.status_code)
+            retry_after = retry_after_seconds(res.headers.get("Retry-After"))
+            if res.status_code in RETRY_STATUS:
+                policy.breaker(host).record_failure()
+            else:
+                policy.breaker(host).record_success()
+            if not policy.should_retry(attempt, res.status_code, retry_after):
+                return res
+            delay = policy.backoff(attempt, retry_after)
+        logger.debug(f"Retrying {host} in {delay:.1f}s (attempt {attempt + 1})")
+        if metrics is not None:
+            metrics.record_retry(label)
+        time.sleep(delay)
+        attempt += 1
+
+
+def get(session: requests.Session, url: str, policy: RequestPolicy = DEFAULT_POLICY,
+        metrics: Optional[RequestMetrics] = None, endpoint: Optional[str] = None, **kwargs) -> requests.Response:
+    return request(session, "GET", url, policy, metrics, endpoint, **kwargs)
+
+
+async def async_request(session: aiohttp.ClientSession, method: str, url: str,
+                        policy: RequestPolicy = DEFAULT_POLICY, metrics: Optional[RequestMetrics] = None,
+                        endpoint: Optional[str] = None, **kwargs) -> aiohttp.ClientResponse:
+    """Request with rate limit, retries and circuit breaker (idempotent requests only).
+
+    The body is read before returning, so res.json() / res.read() still work on the released response.
+    """
+    host = _host(url)
+    label = endpoint or endpoint_label(url)
+    attempt = 0
+    while True:
+        wait = policy.acquire(host)
+        if wait:
+            await asyncio.sleep(wait)
+        started = time.monotonic()
+        try:
+            async with session.request(method, url, **kwargs) as res:
+                body = await res.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if metrics is not None:
+                metrics.record_error(label, time.monotonic() - started)
+            policy.breaker(host).record_failure()
+            if attempt + 1 >= policy.max_attempts:
+                raise SmartmeterConnectionError(f"Request to {host} failed: {e!r}") from e
+            delay = policy.backoff(attempt)
+        else:
+            if metrics is not None:
+                metrics.record_response(label, time.monotonic() - started, len(body), res.status)
+            retry_after = retry_after_seconds(res.headers.get("Retry-After"))
+            if res.status in RETRY_STATUS:
+                policy.breaker(host).record_failure()
+            else:
+                policy.breaker(host).record_success()
+            if not policy.should_retry(attempt, res.status, retry_after):
+                return res
+            delay = policy.backoff(attempt, retry_after)
+        logger.debug(f"Retrying {host} in {delay:.1f}s (attempt {attempt + 1})")
+        if metrics is not None:
+            metrics.record_retry(label)
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def async_get(session: aiohttp.ClientSession, url: str, policy: RequestPolicy = DEFAULT_POLICY,
+                    metrics: Optional[RequestMetrics] = None, endpoint: Optional[str] = None,
+                    **kwargs) -> aiohttp.ClientResponse:
+    return await async_request(session, "GET", url, policy, metrics, endpoint, **kwargs)
+
+
+@asynccontextmanager
+async def async_stream(session: aiohttp.ClientSession, method: str, url: str,
+                       policy: RequestPolicy = DEFAULT_POLICY, metrics: Optional[RequestMetrics] = None,
+                       endpoint: Optional[str] = None, **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+    """Like async_request(), but the body is left unread: yields the open response for res.content.
+
+    Retries only happen before the body is handed out (connection errors, retry status codes).
+    The latency is the time to the response headers.
+    """
+    host = _host(url)
+    label = endpoint or endpoint_label(url)
+    attempt = 0
+    while True:
+        wait = policy.acquire(host)
+        if wait:
+            await asyncio.sleep(wait)
+        started = time.monotonic()
+        try:
+            res = await session.request(method, url, **kwargs)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if metrics is not None:
+                metrics.record_error(label, time.monotonic() - started)
+            policy.breaker(host).record_failure()
+            if attempt + 1 >= policy.max_attempts:
+                raise SmartmeterConnectionError(f"Request to {host} failed: {e!r}") from e
+            delay = policy.backoff(attempt)
+        else:
+            latency = time.monotonic() - started
+            retry_after = retry_after_seconds(res.headers.get("Retry-After"))
+            if res.status in RETRY_STATUS:
+                policy.breaker(host).record_failure()
+            else:
+                policy.breaker(host).record_success()
+            if not policy.should_retry(attempt, res.status, retry_after):
+                try:
+                    yield res
+                finally:
+                    if metrics is not None:
+                        metrics.record_response(label, latency, res.content.total_bytes, res.status)
+                    res.release()
+                return
+            if metrics is not None:
+                metrics.record_response(label, latency, 0, res.status)
+            res.release()
+            delay = policy.backoff(attempt, retry_after)
+        logger.debug(f"Retrying {host} in {delay:.1f}s (attempt {attempt + 1})")
+        if metrics is not None:
+            metrics.record_retry(label)
+        await asyncio.sleep(delay)
+        attempt += 1
@@ -0,0 +1,62 @@
+"""Registry of the supported providers (grid operators)."""
+from dataclasses import dataclass
+from typing import Dict, List, Type
+
+from .base import AsyncSmartmeterClient, ClientCapabilities, SmartmeterClient
+from .client_graz import INTERVAL_DAILY, MAX_DAYS_PER_REQUEST, StromnetzGrazClient
+from .client_graz_async import AsyncStromnetzGrazClient
+from .client_noe import NetzNoeClient
+from .client_noe_async import AsyncNetzNoeClient
+from .client_wn import WienerNetzeClient
+from .client_wn_async import AsyncWienerNetzeClient
+from ..const import PROVIDER_NETZ_NOE, PROVIDER_STROMNETZ_GRAZ, PROVIDER_WIENER_NETZE
+
+
+@dataclass(frozen=True)
+class Provider:
+    """Metadata, client classes and capabilities of a provider (the same for the sync and async client)."""
+
+    id: str
+    name: str
+    manufacturer: str
+    configuration_url: str
+    client_class: Type[SmartmeterClient]
+    async_client_class: Type[AsyncSmartmeterClient]
+    capabilities: ClientCapabilities
+
+
+_PROVIDERS: Dict[str, Provider] = {}
+
+
+def register(provider: Provider) -> None:
+    _PROVIDERS[provider.id] = provider
+
+
+def get_provider(provider_id: str) -> Provider:
+    """Provider by id; unknown ids fall back to Wiener Netze (entries created before the provider choice existed)."""
+    return _PROVIDERS.get(provider_id) or _PROVIDERS[PROVIDER_WIENER_NETZE]
+
+
+def providers() -> List[Provider]:
+    return list(_PROVIDERS.values())
+
+
+register(Provider(
+    PROVIDER_WIENER_NETZE, "Wiener Netze", "Wiener Netze", "https://smartmeter-web.wienernetze.at/",
+    WienerNetzeClient, AsyncWienerNetzeClient,
+    ClientCapabilities(statistics=True, quarter_hour=True, range_queries=True, token_refresh=True, meter_reads=True),
+))
+register(Provider(
+    PROVIDER_NETZ_NOE, "Netz Niederösterreich (EVN)", "Netz Niederösterreich (EVN)", "https://smartmeter.netz-noe.at/",
+    NetzNoeClient, AsyncNetzNoeClient,
+    # ConsumptionRecord/Month: one request per calendar month
+    ClientCapabilities(statistics=True, stats_from_history=True, quarter_hour=True),
+))
+register(Provider(
+    PROVIDER_STROMNETZ_GRAZ, "Stromnetz Graz", "Stromnetz Graz", "https://webportal.stromnetz-graz.at/",
+    StromnetzGrazClient, AsyncStromnetzGrazClient,
+    ClientCapabilities(
+        statistics=True, stats_from_history=True, quarter_hour=True, range_queries=True, meter_reads=True,
+        max_days_per_request=MAX_DAYS_PER_REQUEST[INTERVAL_DAILY],
+    ),
+))
@@ -0,0 +1,61 @@
+"""Incremental parsing of messwerte responses.
+
+A 3-year backfill or a year of quarter-hour values is several MB of JSON.
+Instead of res.json() (raw bytes + the full dict tree + the normalized
+copy in memory at once) the response is parsed with ijson while it arrives:
+only one chunk and one messwert dict are held at a time, each messwert is
+turned into a Reading right away and zaehlwerke with unsupported OBIS codes
+are dropped.
+"""
+from typing import AsyncIterator, Collection, List, Optional
+
+import ijson
+from ijson.common import ObjectBuilder
+
+from .constants import VALID_OBIS_CODES
+from .models import Reading, Register, normalize_reading
+
+# Bytes read from the response per step
+CHUNK_SIZE = 64 * 1024
+
+ZAEHLWERK = "zaehlwerke.item"
+MESSWERT = "zaehlwerke.item.messwerte.item"
+
+
+async def stream_registers(
+    stream, obis_codes: Collection[str] = VALID_OBIS_CODES, chunk_size: int = CHUNK_SIZE
+) -> AsyncIterator[Register]:
+    """Yield a Register per zaehlwerk of a messwerte response read from `stream` (e.g. res.content).
+
+    Readings of a zaehlwerk whose obisCode is not in obis_codes are not kept,
+    provided the obisCode comes before its messwerte (as in the WN responses);
+    otherwise they are dropped at the end of the zaehlwerk.
+    """
+    obis: Optional[str] = None
+    unit: Optional[str] = None
+    readings: List[Reading] = []
+    builder: Optional[ObjectBuilder] = None
+
+    async for prefix, event, value in ijson.parse_async(stream, buf_size=chunk_size, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == MESSWERT and event == "end_map":
+                if obis is None or obis in obis_codes:
+                    reading = normalize_reading(builder.value)
+                    if reading is not None:
+                        readings.append(reading)
+                builder = None
+        elif prefix == MESSWERT and event == "start_map":
+            builder = ObjectBuilder()
+            builder.event(event, value)
+        elif prefix == ZAEHLWERK and event == "start_map":
+            obis, unit, readings = None, None, []
+        elif prefix == ZAEHLWERK + ".obisCode":
+            obis = value
+        elif prefix == ZAEHLWERK + ".einheit":
+            unit = value
+        elif prefix == ZAEHLWERK and event == "end_map":
+            if obis in obis_codes:
+                readings.sort(key=lambda r: r.timestamp)
+                yield Register(obis, unit, readings)
+            readings = []
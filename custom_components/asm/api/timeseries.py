@@ -0,0 +1,173 @@
+"""Compact container for quarter-hour load profiles."""
+import base64
+import enum
+import math
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .models import normalize_registers, wh_factor
+
+INTERVAL_SECONDS = 15 * 60
+
+
+class Quality(enum.IntEnum):
+    """Quality flag per interval, stored as one byte."""
+    MISSING = 0
+    VALID = 1
+    ESTIMATED = 2
+    RAW = 3
+
+
+def quality_from_status(status: Optional[str]) -> Quality:
+    """Map the portal's qualitaet/status string to a Quality flag."""
+    if not status:
+        return Quality.RAW
+    status = status.upper()
+    if status in ("VAL", "VALID", "VALIDATED"):
+        return Quality.VALID
+    if status in ("EST", "ESTIMATED", "SUB", "SUBSTITUTE", "ERSATZWERT"):
+        return Quality.ESTIMATED
+    return Quality.RAW
+
+
+class QuarterHourSeries:
+    """Equidistant 15-minute series: start epoch + array('d') values + array('B') quality flags.
+
+    One year is about 35,000 intervals, i.e. ~315 kB instead of several MB
+    as list of dicts. Interval i covers [start + i*15min, start + (i+1)*15min).
+    Missing intervals hold NaN with Quality.MISSING.
+    """
+
+    __slots__ = ("start", "values", "quality")
+
+    def __init__(self, start: int, values: Optional[array] = None, quality: Optional[array] = None):
+        if start % INTERVAL_SECONDS:
+            raise ValueError("Series start must be aligned to a quarter hour")
+        self.start = start
+        self.values = values if values is not None else array("d")
+        self.quality = quality if quality is not None else array("B", bytes(len(self.values)))
+
+    @staticmethod
+    def _epoch(ts: datetime) -> int:
+        if ts.tzinfo is None:
+            raise ValueError("Timestamps must be timezone aware")
+        return int(ts.timestamp())
+
+    @classmethod
+    def from_readings(cls, readings) -> Optional["QuarterHourSeries"]:
+        """Build a series from (datetime of interval start, value, Quality) tuples."""
+        series = None
+        for ts, value, flag in readings:
+            if series is None:
+                epoch = cls._epoch(ts)
+                series = cls(epoch - epoch % INTERVAL_SECONDS)
+            series.set(ts, value, flag)
+        return series
+
+    def copy(self) -> "QuarterHourSeries":
+        return QuarterHourSeries(self.start, array("d", self.values), array("B", self.quality))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def end(self) -> int:
+        """Epoch (exclusive) after the last interval."""
+        return self.start + len(self.values) * INTERVAL_SECONDS
+
+    def index_of(self, ts: datetime) -> int:
+        """Interval index of a timestamp (may be outside the current range)."""
+        return (self._epoch(ts) - self.start) // INTERVAL_SECONDS
+
+    def time_of(self, index: int) -> datetime:
+        return datetime.fromtimestamp(self.start + index * INTERVAL_SECONDS, tz=timezone.utc)
+
+    def __getitem__(self, index: int) -> Tuple[datetime, float, Quality]:
+        if index < 0:
+            index += len(self.values)
+        return self.time_of(index), self.values[index], Quality(self.quality[index])
+
+    def value_at(self, ts: datetime) -> Optional[float]:
+        index = self.index_of(ts)
+        if index < 0 or index >= len(self.values) or self.quality[index] == Quality.MISSING:
+            return None
+        return self.values[index]
+
+    def set(self, ts: datetime, value: float, flag: Quality = Quality.VALID):
+        """Set the interval containing ts, growing the series as needed."""
+        index = self.index_of(ts)
+        if index < 0:
+            # Selten (Nachladen älterer Daten): Lücke vorne einfügen
+            self.values[0:0] = array("d", [math.nan]) * -index
+            self.quality[0:0] = array("B", bytes(-index))
+            self.start += index * INTERVAL_SECONDS
+            index = 0
+        elif index >= len(self.values):
+            gap = index - len(self.values) + 1
+            self.values.extend(array("d", [math.nan]) * gap)
+            self.quality.extend(bytes(gap))
+        self.values[index] = value
+        self.quality[index] = flag
+
+    def slice(self, date_from: datetime, date_until: datetime) -> "QuarterHourSeries":
+        """Copy of the intervals in [date_from, date_until)."""
+        first = max(0, self.index_of(date_from))
+        last = min(len(self.values), max(first, self.index_of(date_until)))
+        return QuarterHourSeries(
+            self.start + first * INTERVAL_SECONDS, self.values[first:last], self.quality[first:last]
+        )
+
+    def trim_before(self, ts: datetime):
+        """Drop all intervals before ts (retention)."""
+        index = self.index_of(ts)
+        if index <= 0:
+            return
+        index = min(index, len(self.values))
+        del self.values[:index]
+        del self.quality[:index]
+        self.start += index * INTERVAL_SECONDS
+
+    def merge(self, other: "QuarterHourSeries"):
+        """Take over all present intervals of another series (other wins)."""
+        for i, flag in enumerate(other.quality):
+            if flag != Quality.MISSING:
+                self.set(other.time_of(i), other.values[i], Quality(flag))
+
+    def items(self) -> Iterator[Tuple[datetime, float, Quality]]:
+        """Iterate over the present intervals."""
+        for i, flag in enumerate(self.quality):
+            if flag != Quality.MISSING:
+                yield self.time_of(i), self.values[i], Quality(flag)
+
+    def as_dict(self) -> dict:
+        """Compact JSON-serializable form (base64 of the raw arrays)."""
+        return {
+            "start": self.start,
+            "values": base64.b64encode(self.values.tobytes()).decode("ascii"),
+            "quality": base64.b64encode(self.quality.tobytes()).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuarterHourSeries":
+        values = array("d")
+        values.frombytes(base64.b64decode(data["values"]))
+        quality = array("B")
+        quality.frombytes(base64.b64decode(data["quality"]))
+        return cls(data["start"], values, quality)
+
+
+def series_from_registers(payload: Any) -> Dict[str, QuarterHourSeries]:
+    """Turn a quarter_hour_data response into {obis_code: series} with values in Wh."""
+    profile = {}
+    for obis, register in normalize_registers(payload).items():
+        factor = wh_factor(register.unit)
+        # Beim Lastprofil zählt der Beginn des Intervalls
+        series = QuarterHourSeries.from_readings(
+            (r.start or r.timestamp, r.value * factor, quality_from_status(r.quality))
+            for r in register.readings
+            if r.value is not None
+        )
+        if series is not None:
+            profile[obis] = series
+    return profile
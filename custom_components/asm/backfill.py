@@ -0,0 +1,145 @@
+"""Chunked, resumable backfill of the history of new metering points.
+
+The first update of a new Zählpunkt only fetches the last BACKFILL_INITIAL_DAYS,
+so the sensors have values right away. The older history (up to
+BACKFILL_YEARS) is fetched afterwards by a background job, newest window first:
+calendar months for portals that answer per month, otherwise windows of up to
+BACKFILL_WINDOW_DAYS (or the portal's max_days_per_request). Every completed window is checkpointed in the Zählpunkt's
+"backfill" plan, which is saved together with the readings, so a restart
+continues where the job stopped.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import date, timedelta
+from typing import Any, TYPE_CHECKING
+
+from dateutil.relativedelta import relativedelta
+
+from .api.base import ClientCapabilities
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from .coordinator import AustriaSmartMeterCoordinator
+
+BACKFILL_YEARS = 3
+# Days fetched by the first regular update of a new Zählpunkt
+BACKFILL_INITIAL_DAYS = 31
+# Days per window for portals with range queries
+BACKFILL_WINDOW_DAYS = 92
+# Windows fetched at the same time
+BACKFILL_PARALLEL = 2
+# Pause after each window, leaves room in the rate limit for the regular updates
+BACKFILL_PAUSE = 2.0
+# The job stops after this many failed windows in a row and resumes after the next update
+BACKFILL_MAX_FAILURES = 3
+
+
+def new_plan(date_until: date) -> dict[str, Any]:
+    """Backfill plan for the days up to date_until (inclusive)."""
+    return {
+        "from": (date_until - relativedelta(years=BACKFILL_YEARS)).isoformat(),
+        "until": date_until.isoformat(),
+        "done": [],
+    }
+
+
+def month_windows(date_from: date, date_until: date) -> list[tuple[date, date]]:
+    """Calendar months touching [date_from, date_until], clipped to the range, newest first."""
+    windows = []
+    start = date_from
+    while start <= date_until:
+        next_month = start.replace(day=1) + relativedelta(months=1)
+        end = min(date_until, next_month - timedelta(days=1))
+        windows.append((start, end))
+        start = next_month
+    windows.reverse()
+    return windows
+
+
+def day_windows(date_from: date, date_until: date, days: int) -> list[tuple[date, date]]:
+    """Windows of at most days days covering [date_from, date_until], newest (and full) first."""
+    windows = []
+    end = date_until
+    while end >= date_from:
+        start = max(date_from, end - timedelta(days=days - 1))
+        windows.append((start, end))
+        end = start - timedelta(days=1)
+    return windows
+
+
+def backfill_windows(date_from: date, date_until: date, capabilities: ClientCapabilities) -> list[tuple[date, date]]:
+    """Windows of one history request each, newest first."""
+    if not capabilities.range_queries:
+        return month_windows(date_from, date_until)
+    return day_windows(date_from, date_until, min(capabilities.max_days_per_request or BACKFILL_WINDOW_DAYS, BACKFILL_WINDOW_DAYS))
+
+
+def pending_windows(plan: dict[str, Any] | None, capabilities: ClientCapabilities) -> list[tuple[date, date]]:
+    if not plan:
+        return []
+    done = set(plan["done"])
+    windows = backfill_windows(date.fromisoformat(plan["from"]), date.fromisoformat(plan["until"]), capabilities)
+    return [w for w in windows if w[0].isoformat() not in done]
+
+
+class BackfillJob:
+    """Works off the backfill plans of a coordinator's Zählpunkte in the background."""
+
+    def __init__(self, coordinator: AustriaSmartMeterCoordinator) -> None:
+        self._coordinator = coordinator
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def async_start(self) -> None:
+        """Start the job if there are pending windows and it isn't running yet."""
+        coordinator = self._coordinator
+        capabilities = coordinator.provider.capabilities
+        if self.running or not any(
+            pending_windows(zp_data.get("backfill"), capabilities) for zp_data in (coordinator.data or {}).values()
+        ):
+            return
+        entry = coordinator.config_entry
+        self._task = entry.async_create_background_task(
+            coordinator.hass, self._async_run(), f"{DOMAIN}_backfill_{entry.entry_id}"
+        )
+
+    async def _async_run(self) -> None:
+        coordinator = self._coordinator
+        work = [
+            (zp_num, window)
+            for zp_num, zp_data in coordinator.data.items()
+            for window in pending_windows(zp_data.get("backfill"), coordinator.provider.capabilities)
+        ]
+        LOGGER.debug(f"Backfill: {len(work)} windows pending")
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in work:
+            queue.put_nowait(item)
+        failures = 0
+        completed: set[str] = set()
+
+        async def worker() -> None:
+            nonlocal failures
+            while failures < BACKFILL_MAX_FAILURES and not queue.empty():
+                zp_num, (start, end) = queue.get_nowait()
+                # Niedrige Priorität: laufende Updates zuerst fertig werden lassen
+                await coordinator.async_wait_idle()
+                try:
+                    historic = await coordinator.client.historical_data(zp_num, start, end)
+                except Exception as e:
+                    failures += 1
+                    LOGGER.warning(f"Backfill of {zp_num} {start}..{end} failed: {e}")
+                    continue
+                failures = 0
+                if await coordinator.async_apply_backfill(zp_num, start, historic):
+                    completed.add(zp_num)
+                await asyncio.sleep(BACKFILL_PAUSE)
+
+        await asyncio.gather(*(worker() for _ in range(BACKFILL_PARALLEL)))
+        if failures >= BACKFILL_MAX_FAILURES:
+            LOGGER.warning("Backfill paused after repeated errors, it continues after the next update")
+        if completed:
+            coordinator.async_backfill_done(completed)
@@ -9,17 +9,28 @@ from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
 
 # API Imports
-from .api.client import get_client, SmartmeterLoginError
+from .api.client import SmartmeterLoginError
+from .api.registry import get_provider, providers
+from .pool import ClientPool
 
 # Constants Imports
 from .const import (
     CONF_SCAN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    MAX_CONCURRENT_REQUESTS,
+    CONF_QUARTER_HOUR,
+    DEFAULT_QUARTER_HOUR,
+    CONF_ADAPTIVE_POLLING,
+    DEFAULT_ADAPTIVE_POLLING,
+    CONF_COMPACT_ATTRIBUTES,
+    DEFAULT_COMPACT_ATTRIBUTES,
     DOMAIN,
     LOGGER,
     CONF_PROVIDER,
-    PROVIDERS,
-    PROVIDER_WIENER_NETZE
+    PROVIDER_WIENER_NETZE,
+    DATA_CLIENT_POOL,
 )
 
 class AustriaSmartMeterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -39,7 +50,7 @@ class AustriaSmartMeterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="user",
             data_schema=vol.Schema({
-                vol.Required(CONF_PROVIDER, default=PROVIDER_WIENER_NETZE): vol.In(PROVIDERS)
+                vol.Required(CONF_PROVIDER, default=PROVIDER_WIENER_NETZE): vol.In({p.id: p.name for p in providers()})
             })
         )
 
@@ -57,12 +68,15 @@ class AustriaSmartMeterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             await self.async_set_unique_id(f"{provider}_{username.lower()}")
             self._abort_if_unique_id_configured()
 
+            pool = self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_CLIENT_POOL, ClientPool(self.hass))
+            client = pool.acquire(provider, username, password)
+            handed_over = False
             try:
                 LOGGER.debug("ConfigFlow: Attempting login for user %s with provider %s", username, provider)
-                client = get_client(provider, username, password)
-                await self.hass.async_add_executor_job(client.login)
+                if not client.is_logged_in():
+                    await client.shared_login()
                 
-                contracts = await self.hass.async_add_executor_job(client.zaehlpunkte)
+                contracts = await client.zaehlpunkte()
                 LOGGER.debug("ConfigFlow: Found %s contracts", len(contracts) if contracts else 0)
 
                 if not contracts:
@@ -72,8 +86,10 @@ class AustriaSmartMeterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     data = user_input.copy()
                     data[CONF_PROVIDER] = provider
                     LOGGER.debug("ConfigFlow: Creating entry for %s", username)
+                    # Angemeldeten Client an den Coordinator übergeben (kein zweiter Login)
+                    handed_over = pool.hand_over(client)
                     return self.async_create_entry(
-                        title=f"{PROVIDERS.get(provider, provider)} ({username})",
+                        title=f"{get_provider(provider).name} ({username})",
                         data=data,
                     )
 
@@ -83,6 +99,9 @@ class AustriaSmartMeterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             except Exception as e:
                 LOGGER.exception("ConfigFlow: Unexpected exception during login: %s", e)
                 errors["base"] = "cannot_connect"
+            finally:
+                if not handed_over:
+                    await pool.async_release(client)
 
         return self.async_show_form(
             step_id="credentials",
@@ -91,7 +110,7 @@ class AustriaSmartMeterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_PASSWORD): str,
             }),
             errors=errors,
-            description_placeholders={"provider_name": PROVIDERS.get(provider, provider)}
+            description_placeholders={"provider_name": get_provider(provider).name}
         )
 
     @staticmethod
@@ -135,13 +154,28 @@ class AustriaSmartMeterOptionsFlowHandler(config_entries.OptionsFlow):
             current = int(current)
             LOGGER.debug("OptionsFlow: Current scan interval is %s", current)
 
+            concurrency = int(self.entry.options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS))
+            quarter_hour = bool(self.entry.options.get(CONF_QUARTER_HOUR, DEFAULT_QUARTER_HOUR))
+            adaptive = bool(self.entry.options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING))
+            compact = bool(self.entry.options.get(CONF_COMPACT_ATTRIBUTES, DEFAULT_COMPACT_ATTRIBUTES))
+
         except Exception as e:
             LOGGER.error(f"Failed to read current options: {e}. Using defaults.")
             current = int(DEFAULT_SCAN_INTERVAL)
+            concurrency = DEFAULT_MAX_CONCURRENT_REQUESTS
+            quarter_hour = DEFAULT_QUARTER_HOUR
+            adaptive = DEFAULT_ADAPTIVE_POLLING
+            compact = DEFAULT_COMPACT_ATTRIBUTES
 
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema({
-                vol.Optional(CONF_SCAN_INTERVAL, default=current): cv.positive_int
+                vol.Optional(CONF_SCAN_INTERVAL, default=current): cv.positive_int,
+                vol.Optional(CONF_MAX_CONCURRENT_REQUESTS, default=concurrency): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=MAX_CONCURRENT_REQUESTS)
+                ),
+                vol.Optional(CONF_QUARTER_HOUR, default=quarter_hour): bool,
+                vol.Optional(CONF_ADAPTIVE_POLLING, default=adaptive): bool,
+                vol.Optional(CONF_COMPACT_ATTRIBUTES, default=compact): bool,
             })
         )
\ No newline at end of file
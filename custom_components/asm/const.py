@@ -1,5 +1,6 @@
 """Constants for the Austria Smartmeter integration."""
 import logging
+from datetime import timedelta
 
 DOMAIN = "asm"
 LOGGER = logging.getLogger(__package__)
@@ -14,16 +15,30 @@ PROVIDER_WIENER_NETZE = "wiener_netze"
 PROVIDER_NETZ_NOE = "netz_noe"
 PROVIDER_STROMNETZ_GRAZ = "stromnetz_graz"
 
-PROVIDERS = {
-    PROVIDER_WIENER_NETZE: "Wiener Netze",
-    PROVIDER_NETZ_NOE: "Netz Niederösterreich (EVN)",
-    # PROVIDER_STROMNETZ_GRAZ: "Stromnetz Graz", # In Entwicklung
-}
+# Names, client classes and capabilities: api/registry.py
 
 # Options (Zwingend erforderlich für Config Flow!)
 CONF_SCAN_INTERVAL = "scan_interval"
 DEFAULT_SCAN_INTERVAL = 60 * 6  # 6 Stunden
 MIN_SCAN_INTERVAL = 60
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+MAX_CONCURRENT_REQUESTS = 16
+CONF_QUARTER_HOUR = "quarter_hour"
+DEFAULT_QUARTER_HOUR = False
+# Wie lange das 15-Minuten-Lastprofil im Speicher/Cache gehalten wird
+QUARTER_HOUR_RETENTION = timedelta(days=366)
+# Abfragen an der gelernten Veröffentlichungszeit ausrichten (scan_interval nur als Rückfall)
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+DEFAULT_ADAPTIVE_POLLING = True
+# Nur wenige feste Attribute je Sensor (Vertragsdaten über den Diagnose-Download)
+CONF_COMPACT_ATTRIBUTES = "compact_attributes"
+DEFAULT_COMPACT_ATTRIBUTES = True
+
+# hass.data[DOMAIN] key for the ClientPool (async clients per account, see pool.py)
+DATA_CLIENT_POOL = "client_pool"
+# hass.data[DOMAIN] key for the poll schedulers shared by all entries of a provider
+DATA_SCHEDULERS = "schedulers"
 
 # Attributes
 ATTR_ZAEHLPUNKT = "zaehlpunkt"
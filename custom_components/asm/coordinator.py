@@ -1,97 +1,543 @@
 """DataUpdateCoordinator for Austria Smartmeter."""
-from datetime import timedelta
-from typing import Any
-from homeassistant.core import HomeAssistant
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Collection
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 from homeassistant.exceptions import ConfigEntryAuthFailed
-from .api.client import get_client, SmartmeterLoginError
-from .const import DOMAIN, LOGGER, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL, CONF_PROVIDER, CONF_USERNAME, CONF_PASSWORD
+from .api.client import SmartmeterLoginError
+from .api.client_noe import consumptions_from_daily
+from .api.constants import PORTAL_TIME_ZONE
+from .api.registry import get_provider
+from .api.metrics import UpdateMetrics, request_scope
+from .api.models import (
+    COUNTER_OF,
+    Reading,
+    Register,
+    derive_counter,
+    merge_registers,
+    normalize_registers,
+    normalize_stats,
+    wh_factor,
+)
+from .api.timeseries import QuarterHourSeries, series_from_registers
+from .const import (
+    DOMAIN,
+    LOGGER,
+    CONF_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    CONF_QUARTER_HOUR,
+    DEFAULT_QUARTER_HOUR,
+    QUARTER_HOUR_RETENTION,
+    CONF_ADAPTIVE_POLLING,
+    DEFAULT_ADAPTIVE_POLLING,
+    CONF_COMPACT_ATTRIBUTES,
+    DEFAULT_COMPACT_ATTRIBUTES,
+    CONF_PROVIDER,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    DATA_CLIENT_POOL,
+    DATA_SCHEDULERS,
+    OBIS_NAMES,
+)
+from .backfill import BACKFILL_INITIAL_DAYS, BackfillJob, new_plan, pending_windows
+from .pool import ClientPool
+from .scheduler import PollScheduler, PollSchedulers
+from .statistics import StatisticsImporter
+from .store import ReadingStore, SessionStore
+
+
+def _newest_timestamp(data: dict[str, Any]) -> datetime | None:
+    """Timestamp of the newest reading over all Zählpunkte."""
+    timestamps = [reading.timestamp for zp_data in data.values() for reading in zp_data.get("latest", {}).values()]
+    return max(timestamps, default=None)
+
+
+def _diff(previous: dict[str, Any], data: dict[str, Any]) -> dict[str, set[str]]:
+    """Changed fields per Zählpunkt: "info", "latest:<obis>" and "stats:<key>"."""
+    changes = {}
+    for zp_num, zp_data in data.items():
+        old = previous.get(zp_num, {})
+        fields = set()
+        if old.get("info") != zp_data["info"]:
+            fields.add("info")
+        old_latest = old.get("latest", {})
+        for obis, reading in zp_data.get("latest", {}).items():
+            if old_latest.get(obis) != reading:
+                fields.add(f"latest:{obis}")
+        old_stats = old.get("stats", {})
+        for key in zp_data["stats"].keys() | old_stats.keys():
+            if old_stats.get(key) != zp_data["stats"].get(key):
+                fields.add(f"stats:{key}")
+        if fields:
+            changes[zp_num] = fields
+    return changes
+
+
+def _known_contracts(data: dict[str, Any]) -> list[dict[str, Any]]:
+    """Contract list with the Zählpunkte of the previous update."""
+    return [{"zaehlpunkte": [zp_data["info"] for zp_data in data.values()]}]
+
+
+def _build_latest_index(registers: dict[str, Register]) -> dict[str, Reading]:
+    """Return {obis_code: latest reading} for a Zählpunkt, built once per update for the sensors."""
+    return {obis: register.latest for obis, register in registers.items() if register.latest is not None}
+
+
+def _stats_from_history(zp_num: str, registers: dict[str, Register], today: date) -> dict[str, Any]:
+    """Yesterday / day before yesterday from the daily consumption register (no extra request)."""
+    register = registers.get("1-1:1.9.0")
+    if register is None:
+        return {}
+    factor = wh_factor(register.unit) / 1000
+    # Nur die letzten Tage, consumptions_from_daily erwartet kWh und den lokalen Tagesbeginn
+    messwerte = [
+        {"zeitVon": r.start.astimezone(PORTAL_TIME_ZONE).isoformat(), "messwert": r.value * factor}
+        for r in register.readings[-3:]
+        if r.start is not None and r.value is not None
+    ]
+    return normalize_stats(consumptions_from_daily(zp_num, messwerte, today))
+
 
 class AustriaSmartMeterCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Austria Smartmeter data."""
 
-    def __init__(self, hass: HomeAssistant, entry_data: dict, entry_options: dict) -> None:
-        provider = entry_data.get(CONF_PROVIDER, "wiener_netze")
-        username = entry_data[CONF_USERNAME]
-        password = entry_data[CONF_PASSWORD]
-        
-        self.client = get_client(provider, username, password)
-        scan_interval_min = entry_options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-        
-        super().__init__(hass, LOGGER, name=DOMAIN, update_interval=timedelta(minutes=scan_interval_min))
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        provider = entry.data.get(CONF_PROVIDER, "wiener_netze")
+        username = entry.data[CONF_USERNAME]
+        password = entry.data[CONF_PASSWORD]
+
+        # Ein Client pro Portal-Konto, geteilt mit anderen Einträgen und dem Config Flow (bereits angemeldet)
+        self._pool: ClientPool = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_CLIENT_POOL, ClientPool(hass))
+        self.client = self._pool.acquire(provider, username, password)
+        scan_interval_min = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        # Maximale Anzahl gleichzeitiger Verlaufsabfragen (eine pro Zählpunkt)
+        self._max_concurrent = max(1, int(entry.options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)))
+        self.provider = get_provider(provider)
+        # 15-Minuten-Lastprofil zusätzlich abrufen (für die Langzeitstatistik)
+        self._quarter_hour = bool(entry.options.get(CONF_QUARTER_HOUR, DEFAULT_QUARTER_HOUR))
+        if self._quarter_hour and not self.provider.capabilities.quarter_hour:
+            LOGGER.warning(f"{self.provider.name} provides no 15-minute values, option ignored")
+            self._quarter_hour = False
+        self._fallback_interval = timedelta(minutes=scan_interval_min)
+        self._adaptive = bool(entry.options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING))
+        self._scheduler: PollScheduler | None = None
+        self.compact_attributes = bool(entry.options.get(CONF_COMPACT_ATTRIBUTES, DEFAULT_COMPACT_ATTRIBUTES))
+        # Changed fields of the pending listener notification, see has_changed()
+        self._changes: dict[str, set[str]] = {}
+        self._availability_changed = False
+        self._notified_success = True
+        # Duration and requests of the updates (diagnostics, update sensors)
+        self.update_metrics = UpdateMetrics()
+        # Held while an update runs; the backfill job waits for it and merges under it
+        self._update_lock = asyncio.Lock()
+        self._backfill = BackfillJob(self)
+        # Set by the first successful network update; before it there may be no valid session for the backfill
+        self._fetched = False
+
+        # High-water mark per Zählpunkt and OBIS code: date of the newest known reading
+        self._high_water: dict[str, dict[str, date]] = {}
+        self._store = ReadingStore(hass, entry.entry_id)
+        self._session_store = SessionStore(hass, entry.entry_id)
+        self._statistics = StatisticsImporter(hass)
+
+        super().__init__(
+            hass,
+            LOGGER,
+            config_entry=entry,
+            name=DOMAIN,
+            update_interval=self._fallback_interval,
+        )
+
+    async def async_load_scheduler(self) -> None:
+        """Attach the poll scheduler of the provider (publication time shared by all its entries)."""
+        if not self._adaptive:
+            return
+        schedulers = self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_SCHEDULERS, PollSchedulers(self.hass))
+        self._scheduler = await schedulers.async_get(self.provider.id)
+        self.update_interval = self._scheduler.next_interval(
+            self.config_entry.entry_id, dt_util.now(), self._fallback_interval
+        )
+
+    def _plan_next_poll(self, previous: dict[str, Any], data: dict[str, Any]) -> None:
+        """Learn from this update and set the interval until the next one."""
+        if self._scheduler is None:
+            return
+        now = dt_util.now()
+        before = _newest_timestamp(previous)
+        after = _newest_timestamp(data)
+        # Ohne vorherige Daten (erster Abruf) lässt sich keine Veröffentlichung erkennen
+        if before is not None:
+            self._scheduler.record_poll(self.config_entry.entry_id, now, after is not None and after > before)
+            self.hass.data[DOMAIN][DATA_SCHEDULERS].async_schedule_save()
+        self.update_interval = self._scheduler.next_interval(self.config_entry.entry_id, now, self._fallback_interval)
+        LOGGER.debug(f"Next poll in {self.update_interval}")
+
+    def has_changed(self, zaehlpunkt: str, field: str) -> bool:
+        """Whether an entity showing this field has to write its state in the current notification."""
+        return self._availability_changed or field in self._changes.get(zaehlpunkt, ())
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the listeners with the diff of this update, then forget it."""
+        self._availability_changed = self.last_update_success != self._notified_success
+        self._notified_success = self.last_update_success
+        super().async_update_listeners()
+        self._changes = {}
+        self._availability_changed = False
+        # Nicht nach dem Laden des Caches: da ist noch niemand angemeldet
+        if self.last_update_success and self._fetched:
+            self._backfill.async_start()
+
+    async def async_wait_idle(self) -> None:
+        """Wait until no update is running."""
+        async with self._update_lock:
+            pass
+
+    async def async_apply_backfill(self, zp_num: str, window_start: date, historic: Any) -> bool:
+        """Merge a backfilled window into the data and checkpoint it (False if the Zählpunkt is gone)."""
+        async with self._update_lock:
+            zp_data = (self.data or {}).get(zp_num)
+            plan = zp_data.get("backfill") if zp_data else None
+            if not plan:
+                return False
+            zp_data["registers"] = self._merge_history(zp_data["registers"], historic)
+            zp_data["latest"] = _build_latest_index(zp_data["registers"])
+            # Checkpoint wird mit den Werten zusammen gespeichert
+            plan["done"].append(window_start.isoformat())
+            if not pending_windows(plan, self.provider.capabilities):
+                zp_data["backfill"] = None
+                LOGGER.debug(f"Backfill of {zp_num} complete")
+            self._store.async_schedule_save(self.data)
+        return True
+
+    @callback
+    def async_backfill_done(self, zp_nums: set[str]) -> None:
+        """Publish the backfilled history: derived counters may have changed, the statistics are rebuilt with the older days."""
+        self._changes = {
+            zp_num: {f"latest:{obis}" for obis in self.data[zp_num].get("latest", {})}
+            for zp_num in zp_nums
+            if zp_num in self.data
+        }
+        self.async_update_listeners()
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_import_statistics(self.data, rebuild=zp_nums),
+            f"{DOMAIN}_statistics_{self.config_entry.entry_id}",
+        )
+
+    async def async_restore_session(self) -> None:
+        """Resume the stored login, so a reload or restart doesn't need a login round trip."""
+        if not self.provider.capabilities.token_refresh:
+            return
+        if self.client.is_logged_in():
+            # Client des Config Flows oder eines anderen Eintrags, schon angemeldet
+            self._save_session()
+            return
+        state = await self._session_store.async_load()
+        if state:
+            self.client.restore_session(state)
+            LOGGER.debug("Restored stored login session")
+
+    def _save_session(self) -> None:
+        if not self.provider.capabilities.token_refresh:
+            return
+        state = self.client.export_session()
+        if state is not None:
+            self._session_store.async_schedule_save(state)
+
+    async def async_load_cache(self) -> bool:
+        """Load the persisted readings so sensors can start before the first network refresh.
+
+        Returns True if cached data was found.
+        """
+        cached = await self._store.async_load()
+        if not cached:
+            return False
+
+        for zp_num, zp_data in cached.items():
+            self._update_high_water(zp_num, zp_data["registers"])
+            zp_data["latest"] = _build_latest_index(zp_data["registers"])
+        self._changes = _diff({}, cached)
+        self.async_set_updated_data(cached)
+        LOGGER.debug(f"Loaded cached readings for {len(cached)} metering points")
+        return True
+
+    def _fetch_start(self, zp_num: str) -> date:
+        """Return the first day to request for a Zählpunkt.
+
+        Without known readings only the last days; the older history is fetched by the backfill job.
+        Portals without range queries answer per calendar month, so the whole month is taken.
+        """
+        marks = self._high_water.get(zp_num)
+        if not marks:
+            start = dt_util.now().date() - timedelta(days=BACKFILL_INITIAL_DAYS)
+        else:
+            # Ask again for the day of the oldest high-water mark, so late corrections are picked up
+            start = min(marks.values())
+        if not self.provider.capabilities.range_queries:
+            start = start.replace(day=1)
+        return start
+
+    def _update_high_water(self, zp_num: str, registers: dict[str, Register]) -> None:
+        marks = self._high_water.setdefault(zp_num, {})
+        for obis, register in registers.items():
+            if register.latest is not None:
+                marks[obis] = dt_util.as_local(register.latest.timestamp).date()
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending work and release the client on unload (closed once no entry uses it)."""
+        await super().async_shutdown()
+        await self._pool.async_release(self.client)
+
+    async def _async_fetch_history(
+        self, semaphore: asyncio.Semaphore, zp_num: str, known: dict[str, Register]
+    ) -> dict[str, Register] | None:
+        """Fetch new OBIS readings for one Zählpunkt and merge them into the known registers.
+
+        Errors are logged and None returned, so one failing meter doesn't affect the others.
+        """
+        date_from = self._fetch_start(zp_num)
+        try:
+            async with semaphore:
+                historic = await self.client.historical_data(zp_num, date_from)
+        except Exception as e:
+            LOGGER.warning(f"Could not fetch historic data for {zp_num}: {e}")
+            return None
+
+        registers = self._merge_history(known, historic)
+        LOGGER.debug(f"Fetched history for {zp_num} since {date_from}, {len(registers)} registers")
+        self._update_high_water(zp_num, registers)
+        return registers
+
+    def _merge_history(self, known: dict[str, Register], historic: Any) -> dict[str, Register]:
+        """Merge a historical_data response into the known registers."""
+        fetched = normalize_registers(historic)
+        registers = merge_registers(known, fetched.values())
+        # Provider liefert nur Verbrauch je Periode (z.B. Netz NÖ): Zählerstand ableiten, schon
+        # veröffentlichte Stände bleiben unverändert (ältere Fenster werden rückwärts angehängt)
+        if not self.provider.capabilities.meter_reads:
+            for interval_obis, counter_obis in COUNTER_OF.items():
+                if interval_obis in fetched:
+                    registers[counter_obis] = derive_counter(registers[interval_obis], counter_obis, known.get(counter_obis))
+        return registers
+
+    async def _async_fetch_load_profile(
+        self, semaphore: asyncio.Semaphore, zp_num: str, known: dict[str, QuarterHourSeries]
+    ) -> dict[str, QuarterHourSeries]:
+        """Fetch new 15-minute values for one Zählpunkt and merge them into the known series (values in Wh)."""
+        date_from = None
+        if known:
+            last_end = min(series.end for series in known.values())
+            date_from = dt_util.as_local(dt_util.utc_from_timestamp(last_end)).date()
+        try:
+            async with semaphore:
+                registers = await self.client.quarter_hour_data(zp_num, date_from)
+        except Exception as e:
+            LOGGER.warning(f"Could not fetch quarter-hour data for {zp_num}: {e}")
+            return known
+
+        retention_start = dt_util.utcnow() - QUARTER_HOUR_RETENTION
+        profile = {obis: series.copy() for obis, series in known.items()}
+        for obis, fetched in series_from_registers(registers).items():
+            if obis in profile:
+                profile[obis].merge(fetched)
+            else:
+                profile[obis] = fetched
+            profile[obis].trim_before(retention_start)
+        return profile
+
+    async def _async_import_statistics(self, data: dict[str, Any], rebuild: Collection[str] = ()) -> None:
+        """Write the hourly history of every OBIS register into the recorder's long-term statistics.
+
+        The registers of the Zählpunkte in rebuild got older history (backfill) and are written again
+        from their first hour; the load profile isn't backfilled and keeps being appended.
+        """
+        for zp_num, zp_data in data.items():
+            meter_name = zp_data["info"].get("zaehlpunktName") or "Smart Meter"
+            load_profile = zp_data.get("load_profile") or {}
+
+            sources = []
+            for obis, register in zp_data["registers"].items():
+                # Registers covered by the load profile are imported from it (hourly resolution)
+                if obis in load_profile:
+                    continue
+                factor = wh_factor(register.unit)
+                # x.8.0 are counters (at the timestamp), x.9.0 consumption per interval (by its start)
+                cumulative = obis.endswith(".8.0")
+                series = [
+                    (r.timestamp if cumulative else r.start or r.timestamp, r.value * factor)
+                    for r in register.readings
+                    if r.value is not None
+                ]
+                sources.append((obis, series, cumulative, zp_num in rebuild))
+            for obis, profile in load_profile.items():
+                sources.append((obis, [(ts, value) for ts, value, _ in profile.items()], False, False))
+
+            for obis, series, cumulative, rebuild_series in sources:
+                try:
+                    await self._statistics.async_import(
+                        zp_num,
+                        obis,
+                        f"{meter_name} {OBIS_NAMES.get(obis, obis)}",
+                        series,
+                        cumulative=cumulative,
+                        rebuild=rebuild_series,
+                    )
+                except Exception as e:
+                    LOGGER.warning(f"Could not import statistics for {zp_num} {obis}: {e}")
 
     async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from API endpoint."""
+        """Fetch data from API endpoint, recording duration and traffic of the update."""
+        started = time.monotonic()
+        success = False
+        # Only the requests of this update, not those of the backfill or an export running meanwhile
+        with request_scope() as counter:
+            try:
+                async with self._update_lock:
+                    data = await self._async_fetch_data()
+                success = self._fetched = True
+                return data
+            finally:
+                self.update_metrics.record(time.monotonic() - started, counter.requests, counter.bytes, success)
+                LOGGER.debug(
+                    f"Update took {self.update_metrics.last_duration}s, "
+                    f"{self.update_metrics.last_requests} requests, {self.update_metrics.last_bytes} bytes"
+                )
+
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        previous = self.data or {}
         try:
             if not self.client.is_logged_in() or self.client.is_login_expired():
-                 await self.hass.async_add_executor_job(self.client.login)
+                 # Entries sharing the client log in only once
+                 await self.client.shared_login()
+                 self._save_session()
 
             # 1. Fetch Contracts
-            contracts = await self.hass.async_add_executor_job(self.client.zaehlpunkte)
-            
-            # 2. Fetch Consumption Stats (Yesterday, etc.)
             try:
-                consumption_stats = await self.hass.async_add_executor_job(self.client.consumptions)
-                
-                # FIX: Check structure of consumption_stats
-                if isinstance(consumption_stats, dict):
-                    # Wenn es ein einzelnes Dict ist, verpacken wir es in eine Liste
-                    consumption_stats = [consumption_stats]
-                    LOGGER.debug(f"DEBUG Stats: Received single dict. Keys: {consumption_stats[0].keys()}")
-                elif isinstance(consumption_stats, list):
-                    LOGGER.debug(f"DEBUG Stats: Received list with {len(consumption_stats)} elements.")
-                else:
-                    LOGGER.warning(f"DEBUG Stats: Unknown format received: {type(consumption_stats)}")
-                    consumption_stats = []
-
+                contracts = await self.client.zaehlpunkte()
+            except SmartmeterLoginError:
+                raise
             except Exception as e:
-                LOGGER.debug(f"Consumptions API call failed (not supported by provider?): {e}")
-                consumption_stats = []
+                if not previous:
+                    raise
+                # Portal gestört: mit den bekannten Zählpunkten weitermachen
+                LOGGER.warning(f"Could not fetch contracts, keeping the known metering points: {e}")
+                contracts = _known_contracts(previous)
+            if previous and not any(contract.get("zaehlpunkte") for contract in contracts):
+                # Eine leere Liste ist eher eine Störung als ein Konto ohne Zähler: Werte und Backfill-Pläne behalten
+                LOGGER.warning("Portal returned no metering points, keeping the known ones")
+                contracts = _known_contracts(previous)
+
+            # 2. Fetch Consumption Stats (Yesterday, etc.), only if the provider has an endpoint for them
+            consumption_stats = []
+            if self.provider.capabilities.statistics and not self.provider.capabilities.stats_from_history:
+                try:
+                    consumption_stats = await self.client.consumptions()
+
+                    # FIX: Check structure of consumption_stats
+                    if isinstance(consumption_stats, dict):
+                        # Wenn es ein einzelnes Dict ist, verpacken wir es in eine Liste
+                        consumption_stats = [consumption_stats]
+                        LOGGER.debug(f"DEBUG Stats: Received single dict. Keys: {consumption_stats[0].keys()}")
+                    elif isinstance(consumption_stats, list):
+                        LOGGER.debug(f"DEBUG Stats: Received list with {len(consumption_stats)} elements.")
+                    else:
+                        LOGGER.warning(f"DEBUG Stats: Unknown format received: {type(consumption_stats)}")
+                        consumption_stats = []
+
+                except Exception as e:
+                    LOGGER.warning(f"Could not fetch consumption statistics: {e}")
+                    consumption_stats = []
 
             data = {}
             for contract in contracts:
                 if "zaehlpunkte" not in contract: continue
-                
+
                 for zp_info in contract["zaehlpunkte"]:
                     zp_num = zp_info["zaehlpunktnummer"]
+                    if zp_num in previous:
+                        backfill = previous[zp_num].get("backfill")
+                    elif zp_num not in self._high_water:
+                        # Neuer Zählpunkt: ältere Historie im Hintergrund nachladen
+                        backfill = new_plan(self._fetch_start(zp_num) - timedelta(days=1))
+                    else:
+                        backfill = None
                     data[zp_num] = {
                         "info": zp_info,
-                        "readings": {},
-                        "stats": {} 
+                        "registers": previous.get(zp_num, {}).get("registers", {}),
+                        "stats": {},
+                        "load_profile": previous.get(zp_num, {}).get("load_profile", {}),
+                        "backfill": backfill,
                     }
-                    
+
                     # Match stats to ZP
                     for stat in consumption_stats:
                         # Safety check: ensure stat is a dict
                         if not isinstance(stat, dict):
                             continue
-                            
+
                         # Check if ZP matches OR if stats doesn't have a ZP number (assume it belongs to the only meter?)
                         # API responses sometimes omit the ZP number if only one exists.
                         stat_zp = stat.get("zaehlpunktnummer") or stat.get("zaehlpunkt")
-                        
+
                         if stat_zp == zp_num:
-                            data[zp_num]["stats"] = stat
+                            data[zp_num]["stats"] = normalize_stats(stat)
                             break
                         elif stat_zp is None and len(contracts) == 1 and len(contract["zaehlpunkte"]) == 1:
                             # Fallback: If no ZP ID in stats and user only has 1 meter, assign it.
                             LOGGER.debug(f"Assigning stats to {zp_num} (implicit match)")
-                            data[zp_num]["stats"] = stat
+                            data[zp_num]["stats"] = normalize_stats(stat)
                             break
 
-                    # 3. Fetch Historical Data (OBIS readings)
-                    try:
-                        historic = await self.hass.async_add_executor_job(
-                             lambda: self.client.historical_data(zaehlpunktnummer=zp_num)
-                        )
-                        data[zp_num]["readings"] = historic
-                    except Exception as e:
-                        LOGGER.warning(f"Could not fetch historic data for {zp_num}: {e}")
+            # 3. Fetch Historical Data (OBIS readings), only days after the last known reading.
+            # Die Zählpunkte werden parallel abgefragt, begrenzt durch max_concurrent_requests.
+            semaphore = asyncio.BoundedSemaphore(self._max_concurrent)
+            zp_nums = list(data)
+            results = await asyncio.gather(*(
+                self._async_fetch_history(semaphore, zp_num, data[zp_num]["registers"]) for zp_num in zp_nums
+            ))
+            failed = [zp_num for zp_num, registers in zip(zp_nums, results) if registers is None]
+            if zp_nums and len(failed) == len(zp_nums):
+                raise UpdateFailed("Could not fetch data for any metering point")
+            for zp_num, registers in zip(zp_nums, results):
+                # Bei Fehlern die bisherigen Werte behalten (Teilergebnis)
+                if registers is None:
+                    registers = data[zp_num]["registers"]
+                data[zp_num]["registers"] = registers
+                data[zp_num]["latest"] = _build_latest_index(registers)
+                if self.provider.capabilities.stats_from_history:
+                    data[zp_num]["stats"] = _stats_from_history(zp_num, registers, dt_util.now().date())
+            if failed:
+                LOGGER.warning(f"Partial update, kept previous data for {', '.join(failed)}")
+
+            if self._quarter_hour:
+                profiles = await asyncio.gather(*(
+                    self._async_fetch_load_profile(semaphore, zp_num, data[zp_num]["load_profile"]) for zp_num in zp_nums
+                ))
+                for zp_num, profile in zip(zp_nums, profiles):
+                    data[zp_num]["load_profile"] = profile
 
+            if data:
+                self._store.async_schedule_save(data)
+            self._plan_next_poll(previous, data)
+            self._changes = _diff(previous, data)
+            LOGGER.debug(f"Changed fields: {self._changes}")
+            # Langzeitstatistik im Hintergrund nachziehen, blockiert das Update nicht
+            self.config_entry.async_create_background_task(
+                self.hass, self._async_import_statistics(data), f"{DOMAIN}_statistics_{self.config_entry.entry_id}"
+            )
             return data
 
         except SmartmeterLoginError as err:
             raise ConfigEntryAuthFailed from err
+        except UpdateFailed:
+            raise
         except Exception as err:
             LOGGER.exception("Unexpected error during update")
-            raise UpdateFailed(f"Error: {err}") from err
\ No newline at end of file
+            raise UpdateFailed(f"Error: {err}") from err
@@ -0,0 +1,68 @@
+"""Diagnostics support for Austria Smartmeter."""
+from __future__ import annotations
+from typing import Any
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from .api.base import ClientCapabilities
+from .backfill import pending_windows
+from .const import DOMAIN, CONF_USERNAME, CONF_PASSWORD
+
+# Zugangsdaten und persönliche Daten (Adresse, Geschäftspartner) nicht im Download
+TO_REDACT = {
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    "geschaeftspartner",
+    "strasse",
+    "hausnummer",
+    "stiege",
+    "tuer",
+    "laengengrad",
+    "breitengrad",
+}
+
+
+def _meter_diagnostics(zp_data: dict[str, Any], capabilities: ClientCapabilities) -> dict[str, Any]:
+    registers = {}
+    for obis, register in zp_data.get("registers", {}).items():
+        latest = register.latest
+        registers[obis] = {
+            "unit": register.unit,
+            "readings": len(register.readings),
+            "first": register.readings[0].timestamp.isoformat() if register.readings else None,
+            "latest": {
+                "timestamp": latest.timestamp.isoformat(),
+                "value": latest.value,
+                "quality": latest.quality,
+            } if latest else None,
+        }
+    return {
+        "info": async_redact_data(zp_data.get("info", {}), TO_REDACT),
+        "registers": registers,
+        "stats": {key: stat.as_dict() for key, stat in zp_data.get("stats", {}).items()},
+        "load_profile": {obis: len(series) for obis, series in zp_data.get("load_profile", {}).items()},
+        "backfill_pending_windows": len(pending_windows(zp_data.get("backfill"), capabilities)),
+    }
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry (contract info of all meters, register summary, request metrics)."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    meters = {
+        f"meter_{index}": _meter_diagnostics(zp_data, coordinator.provider.capabilities)
+        for index, zp_data in enumerate((coordinator.data or {}).values(), start=1)
+    }
+    cache = getattr(coordinator.client, "cache", None)
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "last_update_success": coordinator.last_update_success,
+        "update_interval": str(coordinator.update_interval),
+        "response_cache": cache.stats() if cache is not None else None,
+        "updates": coordinator.update_metrics.as_dict(),
+        "requests": coordinator.client.metrics.as_dict(),
+        "coalesced_requests": coordinator.client.inflight.coalesced,
+        "meters": meters,
+    }
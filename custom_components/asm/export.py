@@ -0,0 +1,242 @@
+"""History export of a Zählpunkt to CSV or Parquet (service asm.export_history).
+
+The export is a pipeline of month windows: rows_by_window() yields the rows
+of one window at a time, taken from the stored registers / load profile or,
+for windows that aren't (completely) stored, fetched from the portal, and
+the writer appends each batch to the file (one Parquet row group per
+window). So even a multi-year quarter-hour export only holds one month of
+values in memory.
+"""
+from __future__ import annotations
+
+import bisect
+import csv
+import importlib.util
+import os
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, TYPE_CHECKING
+
+from homeassistant.util import dt as dt_util
+
+from .api.models import Register, normalize_registers, wh_factor
+from .api.timeseries import INTERVAL_SECONDS, QuarterHourSeries, Quality, quality_from_status, series_from_registers
+from .backfill import month_windows
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from .coordinator import AustriaSmartMeterCoordinator
+
+RESOLUTION_DAY = "day"
+RESOLUTION_QUARTER_HOUR = "quarter_hour"
+FORMAT_CSV = "csv"
+FORMAT_PARQUET = "parquet"
+
+# Below /config
+EXPORT_DIR = "asm_exports"
+
+COLUMNS = ("zaehlpunkt", "obis_code", "start", "end", "value_wh", "quality")
+
+_INTERVAL = timedelta(seconds=INTERVAL_SECONDS)
+
+
+def _quality(flag: Quality) -> str:
+    """Quality column: valid, estimated or raw for both resolutions (not the portal's own strings)."""
+    return flag.name.lower()
+
+
+def _day_range(start: date, end: date) -> tuple[datetime, datetime]:
+    """[start 00:00, day after end 00:00) in local time."""
+    return dt_util.start_of_local_day(start), dt_util.start_of_local_day(end + timedelta(days=1))
+
+
+def _register_rows(zp_num: str, register: Register, range_start: datetime, range_end: datetime) -> list[tuple]:
+    """Rows of the readings in [range_start, range_end), found by bisection (readings are sorted)."""
+    readings = register.readings
+    first = bisect.bisect_left(readings, range_start, key=lambda r: r.timestamp)
+    last = bisect.bisect_left(readings, range_end, key=lambda r: r.timestamp)
+    factor = wh_factor(register.unit)
+    return [
+        (zp_num, register.obis_code, r.start, r.timestamp, r.value * factor, _quality(quality_from_status(r.quality)))
+        for r in readings[first:last]
+        if r.value is not None
+    ]
+
+
+def _series_rows(zp_num: str, obis: str, series: QuarterHourSeries, range_start: datetime, range_end: datetime) -> list[tuple]:
+    return [
+        (zp_num, obis, ts, ts + _INTERVAL, value, _quality(flag))
+        for ts, value, flag in series.slice(range_start, range_end).items()
+    ]
+
+
+def _covers(times: list[datetime], range_start: datetime, range_end: datetime, step: timedelta) -> bool:
+    """Whether times (one per interval, within [range_start, range_end)) reach from its first to its last interval."""
+    return bool(times) and min(times) < range_start + step and max(times) >= range_end - step
+
+
+def _merge(stored: list[tuple], fetched: list[tuple]) -> list[tuple]:
+    """Stored rows plus the fetched ones filling their gaps, by OBIS code and time."""
+    known = {(row[1], row[3]) for row in stored}
+    rows = stored + [row for row in fetched if (row[1], row[3]) not in known]
+    rows.sort(key=lambda row: (row[1], row[3]))
+    return rows
+
+
+async def rows_by_window(
+    coordinator: AustriaSmartMeterCoordinator,
+    zp_num: str,
+    date_from: date,
+    date_until: date,
+    resolution: str,
+    fetch_missing: bool,
+) -> AsyncIterator[list[tuple]]:
+    """Yield the rows (COLUMNS) per month window, oldest first.
+
+    Windows whose stored values don't cover them up to today (e.g. the month
+    where the quarter-hour retention ends) are fetched from the portal if
+    fetch_missing is set and the gaps filled (not merged into the store),
+    otherwise only the stored values are exported.
+    """
+    step = _INTERVAL if resolution == RESOLUTION_QUARTER_HOUR else timedelta(days=1)
+    today = dt_util.start_of_local_day()
+    for window_start, window_end in reversed(month_windows(date_from, date_until)):
+        range_start, range_end = _day_range(window_start, window_end)
+        # Jedes Fenster neu aus coordinator.data lesen, Updates/Backfill ersetzen die Register zwischendurch
+        zp_data = (coordinator.data or {}).get(zp_num) or {}
+        rows: list[tuple] = []
+        if resolution == RESOLUTION_QUARTER_HOUR:
+            for obis, series in (zp_data.get("load_profile") or {}).items():
+                rows.extend(_series_rows(zp_num, obis, series, range_start, range_end))
+        else:
+            for register in (zp_data.get("registers") or {}).values():
+                rows.extend(_register_rows(zp_num, register, range_start, range_end))
+
+        # Register werden nach dem Zeitstempel ausgewählt, das Lastprofil nach dem Beginn; ab heute gibt es noch keine Werte
+        times = [row[2] if resolution == RESOLUTION_QUARTER_HOUR else row[3] for row in rows]
+        if fetch_missing and not _covers(times, range_start, min(range_end, today), step):
+            LOGGER.debug(f"Export: fetching {resolution} values of {zp_num} {window_start}..{window_end}")
+            await coordinator.async_wait_idle()
+            fetched_rows: list[tuple] = []
+            if resolution == RESOLUTION_QUARTER_HOUR:
+                fetched = await coordinator.client.quarter_hour_data(zp_num, window_start, window_end)
+                for obis, series in series_from_registers(fetched).items():
+                    fetched_rows.extend(_series_rows(zp_num, obis, series, range_start, range_end))
+            else:
+                fetched = await coordinator.client.historical_data(zp_num, window_start, window_end)
+                for register in normalize_registers(fetched).values():
+                    fetched_rows.extend(_register_rows(zp_num, register, range_start, range_end))
+            rows = _merge(rows, fetched_rows)
+        if rows:
+            yield rows
+
+
+class CsvWriter:
+    """Appends row batches to a CSV file; timestamps in local time (ISO 8601)."""
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(COLUMNS)
+
+    def write(self, rows: list[tuple]) -> None:
+        self._writer.writerows(
+            (zp_num, obis, _isoformat(start), _isoformat(end), value, quality)
+            for zp_num, obis, start, end, value, quality in rows
+        )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def parquet_available() -> bool:
+    """Whether pyarrow is installed (it isn't a requirement of the integration)."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+class ParquetWriter:
+    """Appends row batches to a Parquet file, one row group per batch (needs pyarrow, see parquet_available())."""
+
+    def __init__(self, path: str) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("zaehlpunkt", pa.string()),
+                ("obis_code", pa.string()),
+                ("start", pa.timestamp("s", tz="UTC")),
+                ("end", pa.timestamp("s", tz="UTC")),
+                ("value_wh", pa.float64()),
+                ("quality", pa.string()),
+            ]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows: list[tuple]) -> None:
+        columns = [list(column) for column in zip(*rows)]
+        self._writer.write_batch(self._pa.RecordBatch.from_arrays(
+            [self._pa.array(column, type=f.type) for column, f in zip(columns, self._schema)], schema=self._schema
+        ))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+WRITERS = {FORMAT_CSV: CsvWriter, FORMAT_PARQUET: ParquetWriter}
+
+
+def _isoformat(ts: datetime | None) -> str:
+    return dt_util.as_local(ts).isoformat() if ts else ""
+
+
+def export_path(hass, zp_num: str, date_from: date, date_until: date, resolution: str, fmt: str, filename: str | None = None) -> str:
+    """Target file below /config/asm_exports (only the base name of a given filename is used)."""
+    name = os.path.basename(filename or "") or f"{zp_num}_{resolution}_{date_from.isoformat()}_{date_until.isoformat()}"
+    if not name.endswith(f".{fmt}"):
+        name = f"{name}.{fmt}"
+    return hass.config.path(EXPORT_DIR, name)
+
+
+def _open(fmt: str, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return WRITERS[fmt](path)
+
+
+def _finish(writer, tmp_path: str, path: str, success: bool) -> None:
+    writer.close()
+    if success:
+        os.replace(tmp_path, path)
+    else:
+        os.remove(tmp_path)
+
+
+async def async_export(
+    coordinator: AustriaSmartMeterCoordinator,
+    zp_num: str,
+    date_from: date,
+    date_until: date,
+    resolution: str,
+    fmt: str,
+    path: str,
+    fetch_missing: bool = False,
+) -> int:
+    """Write the export to path and return the number of rows.
+
+    Written to a .part file first, so an aborted export never leaves a file
+    that looks complete. File access runs in the executor.
+    """
+    hass = coordinator.hass
+    tmp_path = f"{path}.part"
+    writer = await hass.async_add_executor_job(_open, fmt, tmp_path)
+    count = 0
+    success = False
+    try:
+        async for rows in rows_by_window(coordinator, zp_num, date_from, date_until, resolution, fetch_missing):
+            await hass.async_add_executor_job(writer.write, rows)
+            count += len(rows)
+        success = True
+    finally:
+        await hass.async_add_executor_job(_finish, writer, tmp_path, path, success)
+    LOGGER.info(f"Exported {count} {resolution} values of {zp_num} to {path}")
+    return count
@@ -0,0 +1,79 @@
+"""Clients shared per portal account."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .api.base import AsyncSmartmeterClient
+from .api.client import get_async_client
+from .api.policy import ASYNC_TIMEOUT
+
+
+@dataclass
+class _PooledClient:
+    client: AsyncSmartmeterClient
+    users: int = 0
+    # Handed over by the config flow: the next acquire() takes over the flow's reference
+    handed_over: bool = False
+
+
+class ClientPool:
+    """Async clients per (provider, username, password), reference counted.
+
+    The config flow hands its logged-in client to the entry it creates (no
+    second login), and everything of an entry (updates, backfill, export)
+    uses the same client, so identical requests in flight are coalesced
+    (client.inflight). Kept in hass.data[DOMAIN][DATA_CLIENT_POOL].
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._clients: dict[tuple[str, str, str], _PooledClient] = {}
+
+    @staticmethod
+    def _key(provider: str, username: str, password: str) -> tuple[str, str, str]:
+        # Mit dem Passwort im Schlüssel teilen sich nur Clients mit denselben Zugangsdaten eine Anmeldung
+        return provider, username.strip().lower(), password
+
+    def _new_client(self, provider: str, username: str, password: str) -> AsyncSmartmeterClient:
+        # Eigene Session (eigener Cookie-Jar für den Login), teilt aber den Connection-Pool von HA.
+        # Lebensdauer bestimmt der Pool (async_release), nicht das Entladen des Eintrags
+        session = async_create_clientsession(self._hass, auto_cleanup=False, timeout=ASYNC_TIMEOUT)
+        return get_async_client(provider, session, username, password)
+
+    def acquire(self, provider: str, username: str, password: str) -> AsyncSmartmeterClient:
+        """Client of the account; release it with async_release()."""
+        key = self._key(provider, username, password)
+        pooled = self._clients.get(key)
+        if pooled is None:
+            pooled = self._clients[key] = _PooledClient(self._new_client(provider, username, password))
+        if pooled.handed_over:
+            pooled.handed_over = False
+        else:
+            pooled.users += 1
+        return pooled.client
+
+    def hand_over(self, client: AsyncSmartmeterClient) -> bool:
+        """Keep the reference of a config flow for the entry it creates (no second login).
+
+        False if the client isn't in the pool; the caller still has to release it then.
+        """
+        for pooled in self._clients.values():
+            if pooled.client is client:
+                pooled.handed_over = True
+                return True
+        return False
+
+    async def async_release(self, client: AsyncSmartmeterClient) -> None:
+        """Drop a reference; the client's session is detached when nobody uses it anymore."""
+        for key, pooled in self._clients.items():
+            if pooled.client is client:
+                pooled.users -= 1
+                if pooled.users > 0 or pooled.handed_over:
+                    return
+                del self._clients[key]
+                break
+        # Sessions von HA werden nicht geschlossen (der Connector gehört HA), nur abgekoppelt
+        client.session.detach()
@@ -0,0 +1,148 @@
+"""Data-availability-aware polling for Austria Smartmeter.
+
+The portals publish the values of the previous day once a day at a fairly
+stable time. The scheduler learns that time per provider from the polls that
+actually brought new data, polls densely around it and rarely otherwise.
+Whether today's data has arrived is tracked per config entry, as every
+account is polled on its own.
+"""
+from __future__ import annotations
+import random
+import statistics
+from datetime import date, datetime, time, timedelta
+from typing import Any
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from .const import DOMAIN, LOGGER
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+# Number of observed publication times to learn from
+MAX_OBSERVATIONS = 14
+# The window spans the 10th to 90th percentile of the observations, so a single outlier doesn't widen it
+WINDOW_QUANTILES = 10
+# Added before/after the observed publication times
+WINDOW_MARGIN = timedelta(minutes=30)
+# Poll interval inside the publication window
+DENSE_INTERVAL = timedelta(minutes=15)
+# Poll interval when the data is later than usual
+LATE_INTERVAL = timedelta(hours=1)
+MIN_INTERVAL = timedelta(minutes=5)
+# Random delay added to planned polls, so many installations don't hit the portal at the same moment
+MAX_JITTER = timedelta(minutes=10)
+
+
+def _minutes_of_day(ts: datetime) -> int:
+    return ts.hour * 60 + ts.minute
+
+
+class PollScheduler:
+    """Plans the next poll for the config entries of one provider."""
+
+    def __init__(self, state: dict[str, Any] | None = None) -> None:
+        state = state or {}
+        # Estimated publication times, minutes after local midnight (oldest first)
+        self._observations: list[int] = list(state.get("observations", []))
+        # Per entry_id: day the data last arrived, last poll without new data
+        arrivals = state.get("last_arrival")
+        self._last_arrival: dict[str, date] = (
+            {entry_id: date.fromisoformat(day) for entry_id, day in arrivals.items()} if isinstance(arrivals, dict) else {}
+        )
+        self._last_empty_poll: dict[str, datetime] = {}
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "observations": self._observations,
+            "last_arrival": {entry_id: day.isoformat() for entry_id, day in self._last_arrival.items()},
+        }
+
+    def record_poll(self, entry_id: str, now: datetime, new_data: bool) -> None:
+        """Learn from a successful poll of an entry; new_data = the newest reading moved forward."""
+        now = dt_util.as_local(now)
+        if not new_data:
+            self._last_empty_poll[entry_id] = now
+            return
+
+        if self._last_arrival.get(entry_id) == now.date():
+            # Korrekturen am selben Tag sind keine neue Veröffentlichung
+            return
+        last_empty = self._last_empty_poll.pop(entry_id, None)
+        self._last_arrival[entry_id] = now.date()
+        if last_empty is None or last_empty.date() != now.date():
+            # Kein leerer Abruf davor (z.B. erster Abruf nach einem Neustart): Zeitpunkt unbekannt
+            return
+        # Published somewhere between the last empty poll and now
+        estimate = last_empty + (now - last_empty) / 2
+        self._observations = (self._observations + [_minutes_of_day(estimate)])[-MAX_OBSERVATIONS:]
+        LOGGER.debug(f"Learned publication time {estimate.strftime('%H:%M')}, window now {self.window()}")
+
+    def window(self) -> tuple[int, int] | None:
+        """Expected publication window in minutes after local midnight."""
+        if not self._observations:
+            return None
+        margin = int(WINDOW_MARGIN.total_seconds() // 60)
+        first, last = self._observations[0], self._observations[0]
+        if len(self._observations) > 1:
+            cuts = statistics.quantiles(self._observations, n=WINDOW_QUANTILES, method="inclusive")
+            first, last = int(cuts[0]), int(round(cuts[-1]))
+        return max(0, first - margin), min(24 * 60 - 1, last + margin)
+
+    def next_interval(self, entry_id: str, now: datetime, fallback: timedelta) -> timedelta:
+        """Time until the next poll of an entry; fallback is used as long as nothing has been learned."""
+        now = dt_util.as_local(now)
+        window = self.window()
+        if window is None:
+            return fallback
+
+        today = now.date()
+        midnight = dt_util.start_of_local_day(now)
+        win_start = midnight + timedelta(minutes=window[0])
+        win_end = midnight + timedelta(minutes=window[1])
+
+        if self._last_arrival.get(entry_id) == today:
+            # Heute schon da: erst wieder im Fenster von morgen
+            tomorrow = datetime.combine(today + timedelta(days=1), time(), tzinfo=now.tzinfo)
+            target = dt_util.start_of_local_day(tomorrow) + timedelta(minutes=window[0])
+            interval = target - now + self._jitter()
+        elif now < win_start:
+            interval = win_start - now + self._jitter()
+        elif now <= win_end:
+            interval = DENSE_INTERVAL * random.uniform(0.8, 1.2)
+        else:
+            # Später als üblich, aber nicht zu selten nachsehen
+            interval = min(LATE_INTERVAL, fallback) + self._jitter()
+        return max(interval, MIN_INTERVAL)
+
+    @staticmethod
+    def _jitter() -> timedelta:
+        return MAX_JITTER * random.random()
+
+
+class PollSchedulers:
+    """Shared schedulers of all config entries, one per provider (.storage/asm.scheduler)."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.scheduler")
+        self._schedulers: dict[str, PollScheduler] | None = None
+
+    async def async_get(self, provider: str) -> PollScheduler:
+        if self._schedulers is None:
+            try:
+                stored = await self._store.async_load() or {}
+            except Exception as e:
+                LOGGER.warning(f"Could not load learned poll times: {e}")
+                stored = {}
+            # Another entry may have loaded meanwhile
+            if self._schedulers is None:
+                self._schedulers = {p: PollScheduler(state) for p, state in stored.items()}
+        if provider not in self._schedulers:
+            self._schedulers[provider] = PollScheduler()
+        return self._schedulers[provider]
+
+    def async_schedule_save(self) -> None:
+        self._store.async_delay_save(
+            lambda: {provider: scheduler.as_dict() for provider, scheduler in (self._schedulers or {}).items()},
+            SAVE_DELAY,
+        )
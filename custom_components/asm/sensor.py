@@ -1,5 +1,6 @@
 """Sensor platform for Austria Smartmeter."""
 from __future__ import annotations
+from datetime import datetime
 from typing import Any
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -7,11 +8,13 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EntityCategory, UnitOfEnergy
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfEnergy, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from .const import DOMAIN, OBIS_NAMES, LOGGER, PROVIDER_WIENER_NETZE, PROVIDER_NETZ_NOE
+from .api.models import ConsumptionStat, Reading, Register
+from .const import DOMAIN, OBIS_NAMES, LOGGER
 from .coordinator import AustriaSmartMeterCoordinator
 
 async def async_setup_entry(
@@ -25,16 +28,13 @@ async def async_setup_entry(
 
     # Iterate over all Zählpunkte found in the data
     for zp_num, zp_data in coordinator.data.items():
-        readings = zp_data.get("readings", [])
+        registers = zp_data.get("registers", {})
         stats = zp_data.get("stats", {})
         info = zp_data.get("info", {})
 
         # 1. Main OBIS Sensors (Zählerstände)
-        if isinstance(readings, dict): readings = [readings]
-        if readings:
-            for reading_data in readings:
-                if "obisCode" in reading_data:
-                    entities.append(AustriaSmartMeterSensor(coordinator, zp_num, reading_data, info))
+        for register in registers.values():
+            entities.append(AustriaSmartMeterSensor(coordinator, zp_num, register, info))
 
         # 2. Diagnostic Sensors (Static Info & Address)
         if "zaehlpunktnummer" in info:
@@ -80,56 +80,88 @@ async def async_setup_entry(
         if stats:
             if "consumptionYesterday" in stats:
                 entities.append(AustriaSmartMeterStatistic(
-                    coordinator, zp_num, stats["consumptionYesterday"], "Consumption Yesterday", "consumptionYesterday"
+                    coordinator, zp_num, "Consumption Yesterday", "consumptionYesterday"
                 ))
             if "consumptionDayBeforeYesterday" in stats:
                 entities.append(AustriaSmartMeterStatistic(
-                    coordinator, zp_num, stats["consumptionDayBeforeYesterday"], "Consumption Day Before Yesterday", "consumptionDayBeforeYesterday"
+                    coordinator, zp_num, "Consumption Day Before Yesterday", "consumptionDayBeforeYesterday"
                 ))
 
+    # 4. Update Sensors (per account, disabled by default)
+    entities.append(AustriaSmartMeterUpdateSensor(
+        coordinator, entry.entry_id, "last_duration", "Last Update Duration",
+        UnitOfTime.SECONDS, SensorDeviceClass.DURATION
+    ))
+    entities.append(AustriaSmartMeterUpdateSensor(
+        coordinator, entry.entry_id, "last_requests", "Requests per Update"
+    ))
+
     async_add_entities(entities)
 
 
+# Contract info shown as attributes when compact attributes are off (nested dicts as <key>_<sub_key>)
+CONTRACT_ATTRIBUTES = frozenset({
+    "zaehlpunktnummer", "zaehlpunktName", "zaehlpunktAnlagentyp", "customLabel", "geschaeftspartner",
+    "equipmentNumber", "geraetNumber", "isSmartMeter", "isDefault", "isActive", "isDataDeleted",
+    "isSmartMeterMarketReady", "dataDeletionTimestampUTC",
+    "anlage_anlage", "anlage_sparte", "anlage_typ",
+    "verbrauchsstelle_strasse", "verbrauchsstelle_anlageHausnummer", "verbrauchsstelle_hausnummer",
+    "verbrauchsstelle_stiege", "verbrauchsstelle_tuer", "verbrauchsstelle_postleitzahl", "verbrauchsstelle_ort",
+    "verbrauchsstelle_laengengrad", "verbrauchsstelle_breitengrad",
+    "optOutDetails_isOptOut",
+})
+
+
+def _contract_attributes(info) -> dict[str, Any]:
+    """The CONTRACT_ATTRIBUTES of the contract info, nested dicts flattened."""
+    attributes = {}
+    for key, value in info.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                attributes[f"{key}_{sub_key}"] = sub_value
+        else:
+            attributes[key] = value
+    return {
+        key: value
+        for key, value in attributes.items()
+        if key in CONTRACT_ATTRIBUTES and (isinstance(value, (str, int, float, bool)) or value is None)
+    }
+
+
 def _get_clean_meter_name(info):
     """Returns a clean name without the AT... number."""
     return info.get('zaehlpunktName') or "Smart Meter"
 
 
-def _get_shared_device_info(zaehlpunkt, info, provider_id=None):
+def _get_shared_device_info(zaehlpunkt, info, provider):
     """Generates the device info dict shared by all entities of a meter."""
     meter_name = _get_clean_meter_name(info)
-    
-    manufacturer = "Austria Smartmeter Integration"
-    conf_url = None
-    
-    if provider_id == PROVIDER_WIENER_NETZE:
-        manufacturer = "Wiener Netze"
-        conf_url = "https://smartmeter-web.wienernetze.at/"
-    elif provider_id == PROVIDER_NETZ_NOE:
-        manufacturer = "Netz Niederösterreich (EVN)"
-        conf_url = "https://smartmeter.netz-noe.at/"
-        
+
     return {
         "identifiers": {(DOMAIN, zaehlpunkt)},
         "name": meter_name,
-        "manufacturer": manufacturer,
+        "manufacturer": provider.manufacturer,
         "model": f"Smart Meter {info.get('zaehlpunktAnlagentyp', '')}".strip(),
         "serial_number": info.get("geraetNumber"),
         "hw_version": str(info.get("equipmentNumber") or "Unknown"),
-        "configuration_url": conf_url
+        "configuration_url": provider.configuration_url
     }
 
 
 class AustriaSmartMeterSensor(CoordinatorEntity, SensorEntity):
     """Main Sensor (OBIS readings)."""
 
-    def __init__(self, coordinator, zaehlpunkt, obis_data, info) -> None:
+    # Static per entity (or contract data), no need to store them with every state change
+    _unrecorded_attributes = frozenset({"zaehlpunkt", "obis_code", "raw_unit"}) | CONTRACT_ATTRIBUTES
+
+    def __init__(self, coordinator, zaehlpunkt, register: Register, info) -> None:
         super().__init__(coordinator)
         self._zaehlpunkt = zaehlpunkt
-        self._obis_code = obis_data.get("obisCode")
+        self._obis_code = register.obis_code
         
         # Unit Handling
-        self._unit = obis_data.get("einheit")
+        self._unit = register.unit
+        self._raw_unit = register.unit
         
         # Init defaults
         self._attr_native_unit_of_measurement = None
@@ -144,7 +176,10 @@ class AustriaSmartMeterSensor(CoordinatorEntity, SensorEntity):
         # FORCE Energy Configuration with Wh
         if is_known_energy_obis or self._unit in ["kWh", "Wh"]:
             self._attr_device_class = SensorDeviceClass.ENERGY
-            self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+            # x.8.0 are counters; x.9.0 the energy of one interval, which starts again at every reading
+            self._attr_state_class = (
+                SensorStateClass.TOTAL_INCREASING if self._obis_code.endswith(".8.0") else SensorStateClass.TOTAL
+            )
             
             # CHANGE: Set to Wh (Watt-hours)
             self._attr_native_unit_of_measurement = UnitOfEnergy.WATT_HOUR
@@ -158,77 +193,72 @@ class AustriaSmartMeterSensor(CoordinatorEntity, SensorEntity):
         self._attr_name = f"{meter_name} {readable_obis}"
         self._attr_unique_id = f"{zaehlpunkt}_{self._obis_code}"
         
-        provider = PROVIDER_WIENER_NETZE if "WienerNetzeClient" in coordinator.client.__class__.__name__ else PROVIDER_NETZ_NOE
-        self._attr_device_info = _get_shared_device_info(zaehlpunkt, info, provider)
-
-    def _get_current_obis_data(self) -> dict | None:
-        all_readings = self.coordinator.data.get(self._zaehlpunkt, {}).get("readings", [])
-        if isinstance(all_readings, dict): all_readings = [all_readings]
-        for r in all_readings:
-            if r.get("obisCode") == self._obis_code:
-                return r
-        return None
-
-    def _get_latest_reading(self, values: list) -> dict | None:
-        valid_values = []
-        for v in values:
-            ts = v.get("zeitBis") or v.get("zeitVon") or v.get("zeitpunkt") or v.get("date") or v.get("timestamp") or v.get("readAt")
-            if ts: valid_values.append((ts, v))
-        if not valid_values: return None
-        return sorted(valid_values, key=lambda x: x[0])[-1][1]
+        self._attr_device_info = _get_shared_device_info(zaehlpunkt, info, coordinator.provider)
+
+    def _get_latest_reading(self) -> Reading | None:
+        """Latest reading of this OBIS code from the coordinator's index (O(1))."""
+        return self.coordinator.data.get(self._zaehlpunkt, {}).get("latest", {}).get(self._obis_code)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write the state if the coordinator reports a change for this meter reading."""
+        if self.coordinator.has_changed(self._zaehlpunkt, f"latest:{self._obis_code}") or \
+                self.coordinator.has_changed(self._zaehlpunkt, "info"):
+            self.async_write_ha_state()
 
     @property
     def native_value(self) -> float | None:
-        data = self._get_current_obis_data()
-        if not data or "messwerte" not in data: return None
-        latest = self._get_latest_reading(data["messwerte"])
-        if not latest: return None
-        
-        val = latest.get("messwert") or latest.get("value") or latest.get("amount")
-        if val is None: return None
+        latest = self._get_latest_reading()
+        if not latest or latest.value is None: return None
 
-        # CHANGE: Direct return without conversion for Wh
-        return float(val)
+        # Sensor unit is Wh; kWh registers (e.g. Netz NÖ) are converted
+        if self._raw_unit and self._raw_unit.lower() == "kwh":
+            return latest.value * 1000
+        return latest.value
+
+    @property
+    def last_reset(self) -> datetime | None:
+        """Start of the interval of the latest reading (interval registers only)."""
+        if self._attr_state_class != SensorStateClass.TOTAL:
+            return None
+        latest = self._get_latest_reading()
+        return latest.start if latest else None
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        """Attributes for main sensor."""
-        data = self._get_current_obis_data() or {}
+        """Attributes for main sensor.
+
+        In compact mode (default) only a fixed set; the contract info is in the diagnostics download.
+        Otherwise also the CONTRACT_ATTRIBUTES, which the recorder doesn't store.
+        """
         attributes = {
             "zaehlpunkt": self._zaehlpunkt,
             "obis_code": self._obis_code,
-            "raw_unit": data.get("einheit") or "Wh (assumed)"
+            "raw_unit": self._raw_unit or "Wh (assumed)"
         }
         
         info = self.coordinator.data.get(self._zaehlpunkt, {}).get("info", {})
-        if info:
-            for key, value in info.items():
-                if isinstance(value, list): continue
-                if isinstance(value, dict):
-                    for sub_key, sub_value in value.items():
-                        if isinstance(sub_value, (str, int, float, bool)) or sub_value is None:
-                            attributes[f"{key}_{sub_key}"] = sub_value
-                else:
-                    attributes[key] = value
-
-        values = data.get("messwerte", [])
-        latest = self._get_latest_reading(values)
+        if info and not self.coordinator.compact_attributes:
+            attributes.update(_contract_attributes(info))
+
+        latest = self._get_latest_reading()
         if latest:
-             ts = latest.get("zeitBis") or latest.get("zeitVon") or latest.get("zeitpunkt") or latest.get("date")
-             attributes["last_reading_date"] = ts
-             attributes["validation_status"] = latest.get("qualitaet") or latest.get("status")
-             
-             for k, v in latest.items():
-                 if k not in ["messwert", "value", "amount", "qualitaet", "status", "validated"]:
-                      attributes[f"latest_{k}"] = v
+             attributes["last_reading_date"] = latest.timestamp.isoformat()
+             attributes["validation_status"] = latest.quality
+             if latest.start:
+                  attributes["latest_zeitVon"] = latest.start.isoformat()
         return attributes
 
 
-class AustriaSmartMeterDiagnostic(CoordinatorEntity, SensorEntity):
-    """Diagnostic Sensor for static info."""
+class AustriaSmartMeterDiagnostic(SensorEntity):
+    """Diagnostic Sensor for static info.
+
+    The value is fixed at setup (contract data), so the entity doesn't listen to coordinator updates.
+    """
+
+    _attr_should_poll = False
 
     def __init__(self, coordinator, zaehlpunkt, key, name_suffix, value) -> None:
-        super().__init__(coordinator)
         self._zaehlpunkt = zaehlpunkt
         self._key = key
         self._value = value
@@ -243,13 +273,12 @@ class AustriaSmartMeterDiagnostic(CoordinatorEntity, SensorEntity):
         self._attr_native_value = str(value)
         self._attr_icon = "mdi:information-outline"
         
-        provider = PROVIDER_WIENER_NETZE if "WienerNetzeClient" in coordinator.client.__class__.__name__ else PROVIDER_NETZ_NOE
-        self._attr_device_info = _get_shared_device_info(zaehlpunkt, info, provider)
+        self._attr_device_info = _get_shared_device_info(zaehlpunkt, info, coordinator.provider)
 
 class AustriaSmartMeterStatistic(CoordinatorEntity, SensorEntity):
     """Statistic Sensor for Daily Consumptions."""
 
-    def __init__(self, coordinator, zaehlpunkt, stat_data, name_suffix, key_id) -> None:
+    def __init__(self, coordinator, zaehlpunkt, name_suffix, key_id) -> None:
         super().__init__(coordinator)
         self._zaehlpunkt = zaehlpunkt
         self._key_id = key_id
@@ -267,28 +296,73 @@ class AustriaSmartMeterStatistic(CoordinatorEntity, SensorEntity):
         # CHANGE: Set to Wh (Watt-hours)
         self._attr_native_unit_of_measurement = UnitOfEnergy.WATT_HOUR
         
-        provider = PROVIDER_WIENER_NETZE if "WienerNetzeClient" in coordinator.client.__class__.__name__ else PROVIDER_NETZ_NOE
-        self._attr_device_info = _get_shared_device_info(zaehlpunkt, info, provider)
+        self._attr_device_info = _get_shared_device_info(zaehlpunkt, info, coordinator.provider)
+
+    def _get_stat(self) -> ConsumptionStat | None:
+        return self.coordinator.data.get(self._zaehlpunkt, {}).get("stats", {}).get(self._key_id)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self.coordinator.has_changed(self._zaehlpunkt, f"stats:{self._key_id}"):
+            self.async_write_ha_state()
 
     @property
     def native_value(self) -> float | None:
-        stats = self.coordinator.data.get(self._zaehlpunkt, {}).get("stats", {})
-        if not stats: return None
-        data = stats.get(self._key_id)
-        if not data: return None
-        val = data.get("value")
-        if val is None: return None
+        stat = self._get_stat()
+        if not stat: return None
         
         # CHANGE: Direct return without conversion for Wh
-        return float(val)
+        return stat.value
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        stats = self.coordinator.data.get(self._zaehlpunkt, {}).get("stats", {})
-        if not stats: return {}
-        data = stats.get(self._key_id)
-        if not data: return {}
+        stat = self._get_stat()
+        if not stat: return {}
         return {
-            "date": data.get("date"),
-            "validated": data.get("validated")
-        }
\ No newline at end of file
+            "date": stat.date,
+            "validated": stat.validated
+        }
+
+class AustriaSmartMeterUpdateSensor(CoordinatorEntity, SensorEntity):
+    """Duration / requests of the last update, for tuning the polling.
+
+    Belongs to a service device of the account, not to a meter.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _unrecorded_attributes = frozenset({"updates", "failures"})
+
+    def __init__(self, coordinator, entry_id, key, name_suffix, unit=None, device_class=None) -> None:
+        super().__init__(coordinator)
+        self._key = key
+        provider = coordinator.provider
+
+        self._attr_name = f"{provider.name} {name_suffix}"
+        self._attr_unique_id = f"{entry_id}_update_{key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_icon = "mdi:timer-outline" if device_class else "mdi:swap-vertical"
+
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry_id)},
+            "name": f"{provider.name} Account",
+            "manufacturer": provider.manufacturer,
+            "entry_type": DeviceEntryType.SERVICE,
+            "configuration_url": provider.configuration_url,
+        }
+
+    @property
+    def available(self) -> bool:
+        # Auch fehlgeschlagene Updates haben eine Dauer
+        return self.coordinator.update_metrics.updates > 0
+
+    @property
+    def native_value(self) -> float | int | None:
+        return getattr(self.coordinator.update_metrics, self._key)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        metrics = self.coordinator.update_metrics
+        return {"updates": metrics.updates, "failures": metrics.failures}
@@ -0,0 +1,108 @@
+"""Services of the Austria Smartmeter integration."""
+from __future__ import annotations
+
+import aiohttp
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .api.errors import SmartmeterError
+from .const import ATTR_ZAEHLPUNKT, DOMAIN
+from .coordinator import AustriaSmartMeterCoordinator
+from .export import (
+    FORMAT_CSV,
+    FORMAT_PARQUET,
+    RESOLUTION_DAY,
+    RESOLUTION_QUARTER_HOUR,
+    async_export,
+    export_path,
+    parquet_available,
+)
+
+SERVICE_EXPORT_HISTORY = "export_history"
+
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_RESOLUTION = "resolution"
+ATTR_FORMAT = "format"
+ATTR_FETCH_MISSING = "fetch_missing"
+ATTR_FILENAME = "filename"
+
+EXPORT_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ZAEHLPUNKT): cv.string,
+        vol.Required(ATTR_START): cv.date,
+        vol.Required(ATTR_END): cv.date,
+        vol.Optional(ATTR_RESOLUTION, default=RESOLUTION_DAY): vol.In([RESOLUTION_DAY, RESOLUTION_QUARTER_HOUR]),
+        vol.Optional(ATTR_FORMAT, default=FORMAT_CSV): vol.In([FORMAT_CSV, FORMAT_PARQUET]),
+        vol.Optional(ATTR_FETCH_MISSING, default=False): cv.boolean,
+        vol.Optional(ATTR_FILENAME): cv.string,
+    }
+)
+
+
+def _find_coordinator(hass: HomeAssistant, zp_num: str) -> AustriaSmartMeterCoordinator:
+    """Coordinator of the entry that has the Zählpunkt."""
+    for coordinator in hass.data.get(DOMAIN, {}).values():
+        if isinstance(coordinator, AustriaSmartMeterCoordinator) and zp_num in (coordinator.data or {}):
+            return coordinator
+    raise ServiceValidationError(
+        translation_domain=DOMAIN,
+        translation_key="unknown_zaehlpunkt",
+        translation_placeholders={"zaehlpunkt": zp_num},
+    )
+
+
+async def _async_export_history(call: ServiceCall) -> ServiceResponse:
+    hass = call.hass
+    zp_num = call.data[ATTR_ZAEHLPUNKT].strip()
+    date_from = call.data[ATTR_START]
+    date_until = call.data[ATTR_END]
+    resolution = call.data[ATTR_RESOLUTION]
+    fmt = call.data[ATTR_FORMAT]
+    if date_from > date_until:
+        raise ServiceValidationError(translation_domain=DOMAIN, translation_key="invalid_date_range")
+    if fmt == FORMAT_PARQUET and not parquet_available():
+        raise ServiceValidationError(translation_domain=DOMAIN, translation_key="parquet_unavailable")
+
+    coordinator = _find_coordinator(hass, zp_num)
+    if resolution == RESOLUTION_QUARTER_HOUR and not coordinator.provider.capabilities.quarter_hour:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="quarter_hour_unsupported",
+            translation_placeholders={"provider": coordinator.provider.name},
+        )
+
+    path = export_path(hass, zp_num, date_from, date_until, resolution, fmt, call.data.get(ATTR_FILENAME))
+    try:
+        rows = await async_export(
+            coordinator, zp_num, date_from, date_until, resolution, fmt, path, call.data[ATTR_FETCH_MISSING]
+        )
+    except (SmartmeterError, aiohttp.ClientError) as err:
+        # Portal nicht erreichbar oder Abruf fehlgeschlagen (fetch_missing)
+        raise HomeAssistantError(
+            translation_domain=DOMAIN,
+            translation_key="export_fetch_failed",
+            translation_placeholders={"zaehlpunkt": zp_num, "error": str(err)},
+        ) from err
+    except OSError as err:
+        # Export-Verzeichnis oder .part-Datei nicht anlegbar / schreibbar
+        raise HomeAssistantError(
+            translation_domain=DOMAIN,
+            translation_key="export_write_failed",
+            translation_placeholders={"path": path, "error": str(err)},
+        ) from err
+    return {"path": path, "rows": rows}
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services (once, shared by all entries)."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        _async_export_history,
+        schema=EXPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
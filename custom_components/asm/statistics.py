@@ -0,0 +1,131 @@
+"""Import of the meter history into Home Assistant's long-term statistics."""
+from __future__ import annotations
+import asyncio
+from datetime import datetime, timedelta
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMeanType, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics, get_last_statistics
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+from .const import DOMAIN, LOGGER
+
+# Rows per async_add_external_statistics call (one recorder job each), keeps big backfills out of a single transaction
+IMPORT_BATCH_SIZE = 500
+
+
+def statistic_id(zaehlpunkt: str, obis_code: str) -> str:
+    """External statistic id for a Zählpunkt and OBIS code, e.g. asm:at00100..._1_1_1_8_0."""
+    return f"{DOMAIN}:{slugify(zaehlpunkt)}_{slugify(obis_code)}"
+
+
+def _hour_start(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def hourly_buckets(readings: list[tuple[datetime, float]], cumulative: bool) -> dict[datetime, float]:
+    """Aggregate readings into hours (UTC hour start -> value).
+
+    Cumulative readings (meter reads, x.8.0) are the counter at the given
+    moment, i.e. the state at the end of the hour before it; the last read per
+    hour wins. Interval readings (consumption per period, given by its start)
+    are summed per hour.
+    """
+    buckets: dict[datetime, float] = {}
+    for ts, value in sorted(readings, key=lambda r: r[0]):
+        ts = dt_util.as_utc(ts)
+        if cumulative:
+            buckets[_hour_start(ts - timedelta(microseconds=1))] = value
+        else:
+            start = _hour_start(ts)
+            buckets[start] = buckets.get(start, 0.0) + value
+    return buckets
+
+
+class StatisticsImporter:
+    """Writes hourly sums per Zählpunkt and OBIS code as external statistics (source asm).
+
+    Only hours after the last imported one are written, so repeated imports of
+    overlapping history are cheap and never produce duplicates. History older
+    than the imported hours (backfill) needs a rebuild: all hours are written
+    again and the sums recomputed from the first one.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        # statistic_id -> (start of last imported hour, sum, state)
+        self._last: dict[str, tuple[datetime, float, float]] = {}
+        self._lock = asyncio.Lock()
+
+    async def _async_last_statistic(self, stat_id: str) -> tuple[datetime, float, float] | None:
+        if stat_id in self._last:
+            return self._last[stat_id]
+        result = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, stat_id, True, {"sum", "state"}
+        )
+        rows = result.get(stat_id)
+        if not rows:
+            return None
+        row = rows[0]
+        last = (dt_util.utc_from_timestamp(row["start"]), row.get("sum") or 0.0, row.get("state") or 0.0)
+        self._last[stat_id] = last
+        return last
+
+    async def async_import(
+        self,
+        zaehlpunkt: str,
+        obis_code: str,
+        name: str,
+        readings: list[tuple[datetime, float]],
+        cumulative: bool = True,
+        rebuild: bool = False,
+    ) -> int:
+        """Import the hours not yet in the recorder (all hours with rebuild); returns the number of rows written."""
+        if not readings:
+            return 0
+        stat_id = statistic_id(zaehlpunkt, obis_code)
+
+        async with self._lock:
+            last = None if rebuild else await self._async_last_statistic(stat_id)
+            buckets = hourly_buckets(readings, cumulative)
+
+            if last is None:
+                last_start, total, state = None, 0.0, None
+            else:
+                last_start, total, state = last
+
+            rows: list[StatisticData] = []
+            for start in sorted(buckets):
+                if last_start is not None and start <= last_start:
+                    continue
+                value = buckets[start]
+                if cumulative:
+                    # First import starts the sum at 0 on the first known counter value
+                    total += value - state if state is not None else 0.0
+                    state = value
+                else:
+                    total += value
+                    state = value
+                rows.append(StatisticData(start=start, state=state, sum=total))
+
+            if not rows:
+                return 0
+
+            metadata = StatisticMetaData(
+                mean_type=StatisticMeanType.NONE,
+                has_sum=True,
+                name=name,
+                source=DOMAIN,
+                statistic_id=stat_id,
+                unit_class="energy",
+                unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+            )
+            for i in range(0, len(rows), IMPORT_BATCH_SIZE):
+                async_add_external_statistics(self.hass, metadata, rows[i:i + IMPORT_BATCH_SIZE])
+                # Dem Event Loop / Recorder zwischen den Batches Luft lassen
+                await asyncio.sleep(0)
+
+            self._last[stat_id] = (rows[-1]["start"], total, state)
+            LOGGER.debug(f"Imported {len(rows)} hourly statistics into {stat_id}")
+            return len(rows)
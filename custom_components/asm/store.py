@@ -0,0 +1,109 @@
+"""Persistent reading store for Austria Smartmeter."""
+from __future__ import annotations
+from typing import Any
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from .api.models import ConsumptionStat, Register, normalize_registers, normalize_stats
+from .api.timeseries import QuarterHourSeries
+from .const import DOMAIN, LOGGER
+
+STORAGE_VERSION = 1
+# 2: normalized registers/stats instead of the raw portal payload
+READINGS_STORAGE_VERSION = 2
+# Verzögerung für das Schreiben, damit mehrere Updates zusammengefasst werden
+SAVE_DELAY = 10
+
+
+class _ReadingStorage(Store):
+    """Store with migration of older reading caches."""
+
+    async def _async_migrate_func(self, old_major_version, old_minor_version, old_data):
+        if old_major_version == 1:
+            meters = {}
+            for zp_num, meter in old_data.get("meters", {}).items():
+                registers = normalize_registers(list(meter.get("readings", {}).values()))
+                meters[zp_num] = {
+                    "info": meter.get("info", {}),
+                    "registers": {obis: register.as_dict() for obis, register in registers.items()},
+                    "stats": {key: stat.as_dict() for key, stat in normalize_stats(meter.get("stats")).items()},
+                    "load_profile": meter.get("load_profile", {}),
+                }
+            return {"meters": meters}
+        return old_data
+
+
+class ReadingStore:
+    """Keeps the last known data per Zählpunkt and OBIS code on disk (.storage/asm.<entry_id>.readings)."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store = _ReadingStorage(hass, READINGS_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.readings", private=True)
+
+    async def async_load(self) -> dict[str, Any]:
+        """Return cached coordinator data in the in-memory layout (empty dict if nothing is stored)."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as e:
+            LOGGER.warning(f"Could not load cached readings, starting cold: {e}")
+            return {}
+        if not stored:
+            return {}
+
+        data = {}
+        for zp_num, meter in stored.get("meters", {}).items():
+            data[zp_num] = {
+                "info": meter.get("info", {}),
+                "registers": {
+                    obis: Register.from_dict(register) for obis, register in meter.get("registers", {}).items()
+                },
+                "stats": {key: ConsumptionStat.from_dict(stat) for key, stat in meter.get("stats", {}).items()},
+                "load_profile": {
+                    obis: QuarterHourSeries.from_dict(series) for obis, series in meter.get("load_profile", {}).items()
+                },
+                # Plan of the backfill job with its checkpoints, None when complete
+                "backfill": meter.get("backfill"),
+            }
+        return data
+
+    def async_schedule_save(self, data: dict[str, Any]) -> None:
+        """Write the coordinator data to disk after a short delay."""
+        self._store.async_delay_save(lambda: self._serialize(data), SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    @staticmethod
+    def _serialize(data: dict[str, Any]) -> dict[str, Any]:
+        meters = {}
+        for zp_num, meter in data.items():
+            meters[zp_num] = {
+                "info": meter.get("info", {}),
+                "registers": {obis: register.as_dict() for obis, register in meter.get("registers", {}).items()},
+                "stats": {key: stat.as_dict() for key, stat in meter.get("stats", {}).items()},
+                "load_profile": {obis: series.as_dict() for obis, series in meter.get("load_profile", {}).items()},
+            }
+            if meter.get("backfill"):
+                meters[zp_num]["backfill"] = meter["backfill"]
+        return {"meters": meters}
+
+
+class SessionStore:
+    """Keeps the login state of the entry's client (.storage/asm.<entry_id>.session).
+
+    Only readable by Home Assistant itself (private store), and removed together with the entry.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.session", private=True)
+
+    async def async_load(self) -> dict[str, Any] | None:
+        try:
+            return await self._store.async_load()
+        except Exception as e:
+            LOGGER.warning(f"Could not load stored session, logging in again: {e}")
+            return None
+
+    def async_schedule_save(self, session: dict[str, Any]) -> None:
+        self._store.async_delay_save(lambda: session, SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
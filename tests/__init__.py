@@ -0,0 +1 @@
+"""Tests for the Austria Smartmeter integration."""
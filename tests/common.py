@@ -0,0 +1,11 @@
+"""Helpers shared by the tests."""
+import json
+from pathlib import Path
+from typing import Any
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(name: str) -> Any:
+    """Parsed JSON of tests/fixtures/<name>."""
+    return json.loads((FIXTURES / name).read_text(encoding="utf-8"))
@@ -0,0 +1,63 @@
+"""Windows of the history backfill (backfill.py)."""
+from datetime import date
+
+from custom_components.asm.api.base import ClientCapabilities
+from custom_components.asm.api.registry import get_provider
+from custom_components.asm.backfill import (
+    BACKFILL_WINDOW_DAYS,
+    backfill_windows,
+    new_plan,
+    pending_windows,
+)
+from custom_components.asm.const import PROVIDER_NETZ_NOE, PROVIDER_STROMNETZ_GRAZ, PROVIDER_WIENER_NETZE
+
+
+def _covers(windows, date_from, date_until) -> bool:
+    """Windows are newest first, without gaps or overlaps."""
+    ordered = list(reversed(windows))
+    return (
+        ordered[0][0] == date_from
+        and ordered[-1][1] == date_until
+        and all((b[0] - a[1]).days == 1 for a, b in zip(ordered, ordered[1:]))
+    )
+
+
+def test_month_windows_without_range_queries():
+    windows = backfill_windows(date(2024, 1, 15), date(2024, 3, 31), get_provider(PROVIDER_NETZ_NOE).capabilities)
+
+    assert windows == [
+        (date(2024, 3, 1), date(2024, 3, 31)),
+        (date(2024, 2, 1), date(2024, 2, 29)),
+        (date(2024, 1, 15), date(2024, 1, 31)),
+    ]
+
+
+def test_day_windows_with_range_queries():
+    date_from, date_until = date(2021, 9, 1), date(2024, 8, 31)
+    windows = backfill_windows(date_from, date_until, get_provider(PROVIDER_WIENER_NETZE).capabilities)
+
+    assert _covers(windows, date_from, date_until)
+    assert all((end - start).days + 1 == BACKFILL_WINDOW_DAYS for start, end in windows[:-1])
+    assert len(windows) == 12
+
+
+def test_day_windows_respect_max_days_per_request():
+    capabilities = ClientCapabilities(range_queries=True, max_days_per_request=10)
+    windows = backfill_windows(date(2024, 1, 1), date(2024, 1, 25), capabilities)
+
+    assert windows == [
+        (date(2024, 1, 16), date(2024, 1, 25)),
+        (date(2024, 1, 6), date(2024, 1, 15)),
+        (date(2024, 1, 1), date(2024, 1, 5)),
+    ]
+
+
+def test_pending_windows_skip_done_windows():
+    capabilities = get_provider(PROVIDER_STROMNETZ_GRAZ).capabilities
+    plan = new_plan(date(2024, 8, 31))
+    windows = pending_windows(plan, capabilities)
+
+    plan["done"].append(windows[0][0].isoformat())
+
+    assert pending_windows(plan, capabilities) == windows[1:]
+    assert pending_windows(None, capabilities) == []
@@ -0,0 +1,96 @@
+"""Response cache of the static endpoints (api/cache.py)."""
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.asm.api import cache
+from custom_components.asm.api.cache import ResponseCache
+
+TTL = timedelta(hours=1)
+URL = "https://portal.example/zaehlpunkte"
+
+
+@pytest.fixture
+def clock(monkeypatch) -> SimpleNamespace:
+    """Stands in for the time module of cache.py; advance with clock.now += seconds."""
+    fake = SimpleNamespace(now=1000.0)
+    fake.monotonic = lambda: fake.now
+    monkeypatch.setattr(cache, "time", fake)
+    return fake
+
+
+def test_key_sorts_the_query():
+    assert ResponseCache.key(URL) == URL
+    assert ResponseCache.key(URL, {"b": 2, "a": 1}) == ResponseCache.key(URL, {"a": 1, "b": 2}) == f"{URL}?a=1&b=2"
+
+
+def test_ttl_per_endpoint():
+    response_cache = ResponseCache({"zaehlpunkte": TTL})
+
+    assert response_cache.ttl_for("zaehlpunkte") == TTL
+    assert response_cache.ttl_for("messwerte") is None
+
+
+def test_fresh_entry_until_the_ttl_expires(clock):
+    response_cache = ResponseCache({})
+    assert response_cache.get(URL) is None
+
+    response_cache.put(URL, ["contract"], TTL)
+    assert response_cache.get(URL) == ["contract"]
+    clock.now += TTL.total_seconds() - 1
+    assert response_cache.get(URL) == ["contract"]
+    clock.now += 1
+    assert response_cache.get(URL) is None
+
+    assert response_cache.stats() == {"entries": 1, "hits": 2, "misses": 2, "revalidations": 0, "hit_rate": 0.5}
+
+
+def test_revalidation_with_etag(clock):
+    response_cache = ResponseCache({})
+    response_cache.put(URL, ["contract"], TTL, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Apr 2024 06:00:00 GMT"})
+    clock.now += TTL.total_seconds()
+    assert response_cache.get(URL) is None
+
+    assert response_cache.conditional_headers(URL) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Apr 2024 06:00:00 GMT",
+    }
+    # 304: der Eintrag gilt wieder eine TTL lang
+    assert response_cache.revalidated(URL, TTL) == ["contract"]
+    assert response_cache.get(URL) == ["contract"]
+    assert response_cache.stats()["revalidations"] == 1
+
+
+def test_no_conditional_headers_without_validators():
+    response_cache = ResponseCache({})
+    response_cache.put(URL, ["contract"], TTL)
+
+    assert response_cache.conditional_headers(URL) == {}
+    assert response_cache.conditional_headers(URL + "/other") == {}
+
+
+def test_least_recently_used_entry_is_evicted():
+    response_cache = ResponseCache({}, max_entries=2)
+    response_cache.put("a", 1, TTL)
+    response_cache.put("b", 2, TTL)
+    # "a" wurde zuletzt gelesen, also fliegt "b"
+    assert response_cache.get("a") == 1
+
+    response_cache.put("c", 3, TTL)
+
+    assert response_cache.get("b") is None
+    assert (response_cache.get("a"), response_cache.get("c")) == (1, 3)
+    assert response_cache.stats()["entries"] == 2
+    # Ein 304 für einen verdrängten Eintrag liefert nichts, der Aufrufer fragt neu an
+    assert response_cache.revalidated("b", TTL) is None
+
+
+def test_clear():
+    response_cache = ResponseCache({})
+    response_cache.put(URL, ["contract"], TTL)
+
+    response_cache.clear()
+
+    assert response_cache.get(URL) is None
+    assert response_cache.stats()["entries"] == 0
@@ -0,0 +1,212 @@
+"""Stromnetz Graz: mapping of the portal responses (tests/fixtures/graz)."""
+from datetime import date, datetime, timedelta
+
+import aiohttp
+import pytest
+
+from custom_components.asm.api.client_graz import (
+    INTERVAL_DAILY,
+    INTERVAL_QUARTER_HOUR,
+    build_reading_query,
+    date_windows,
+    installations_to_zaehlpunkte,
+    readings_to_registers,
+)
+from custom_components.asm.api.client_graz_async import AsyncStromnetzGrazClient
+from custom_components.asm.api.constants import PORTAL_TIME_ZONE
+from custom_components.asm.api.errors import SmartmeterConnectionError, SmartmeterLoginError
+from custom_components.asm.api.models import normalize_registers
+
+from .common import load_fixture
+
+
+def test_installations_to_zaehlpunkte():
+    contracts = installations_to_zaehlpunkte(load_fixture("graz/installations.json") + ["garbage"])
+
+    assert [c["geschaeftspartner"] for c in contracts] == [100200300, 100200301]
+    zaehlpunkte = contracts[0]["zaehlpunkte"]
+    assert [zp["zaehlpunktnummer"] for zp in zaehlpunkte] == ["123456", "123457"]
+    # shortName, sonst name, sonst Platzhalter
+    assert zaehlpunkte[0]["zaehlpunktName"] == "Wohnung"
+    assert zaehlpunkte[1]["zaehlpunktName"] == "AT0030000000000000000000000123457"
+    assert contracts[1]["zaehlpunkte"][0]["zaehlpunktName"] == "Smart Meter"
+    assert zaehlpunkte[0]["geschaeftspartner"] == 100200300
+
+
+def test_installations_to_zaehlpunkte_empty():
+    assert installations_to_zaehlpunkte(None) == []
+    assert installations_to_zaehlpunkte([{"customerID": 1}]) == [{"geschaeftspartner": 1, "zaehlpunkte": []}]
+
+
+@pytest.mark.parametrize(
+    ("date_from", "date_until", "max_days", "expected"),
+    [
+        (date(2024, 1, 1), date(2024, 1, 1), 31, [(date(2024, 1, 1), date(2024, 1, 1))]),
+        (date(2024, 1, 1), date(2024, 1, 31), 31, [(date(2024, 1, 1), date(2024, 1, 31))]),
+        (
+            date(2024, 1, 1),
+            date(2024, 2, 1),
+            31,
+            [(date(2024, 1, 1), date(2024, 1, 31)), (date(2024, 2, 1), date(2024, 2, 1))],
+        ),
+        (
+            date(2022, 1, 1),
+            date(2024, 12, 31),
+            366,
+            [
+                (date(2022, 1, 1), date(2023, 1, 1)),
+                (date(2023, 1, 2), date(2024, 1, 2)),
+                (date(2024, 1, 3), date(2024, 12, 31)),
+            ],
+        ),
+        (date(2024, 2, 1), date(2024, 1, 1), 31, []),
+    ],
+)
+def test_date_windows(date_from, date_until, max_days, expected):
+    windows = list(date_windows(date_from, date_until, max_days))
+
+    assert windows == expected
+    assert all((end - start).days < max_days for start, end in windows)
+
+
+def test_build_reading_query():
+    query = build_reading_query(123456, date(2024, 1, 10), date(2024, 1, 12), INTERVAL_DAILY)
+
+    assert query == {
+        "meterPointId": 123456,
+        "fromDate": "2024-01-10T00:00:00+01:00",
+        "toDate": "2024-01-13T00:00:00+01:00",
+        "interval": "Daily",
+        "unit": "KWH",
+    }
+
+
+@pytest.mark.parametrize(
+    ("day", "from_date", "to_date"),
+    [
+        # Sommerzeit: der Tag hat 23 Stunden
+        (date(2024, 3, 31), "2024-03-31T00:00:00+01:00", "2024-04-01T00:00:00+02:00"),
+        # Winterzeit: der Tag hat 25 Stunden
+        (date(2024, 10, 27), "2024-10-27T00:00:00+02:00", "2024-10-28T00:00:00+01:00"),
+    ],
+)
+def test_build_reading_query_dst(day, from_date, to_date):
+    query = build_reading_query(123456, day, day, INTERVAL_QUARTER_HOUR)
+
+    assert (query["fromDate"], query["toDate"]) == (from_date, to_date)
+
+
+def test_readings_to_registers_daily():
+    registers = normalize_registers(readings_to_registers(load_fixture("graz/meter_reading_daily.json"), INTERVAL_DAILY))
+
+    assert set(registers) == {"1-1:1.8.0", "1-1:1.9.0"}
+    counter = registers["1-1:1.8.0"]
+    assert counter.unit == "kWh"
+    assert [r.value for r in counter.readings] == [5010.5, 5019.0, 5028.5, 5039.0]
+    assert all(r.start is None for r in counter.readings)
+
+    consumption = registers["1-1:1.9.0"]
+    # Der Tag der Zeitumstellung (31.3.) hat 23 Stunden, die Intervalle beginnen trotzdem um Mitternacht
+    assert [(r.start.isoformat(), r.timestamp.isoformat()) for r in consumption.readings] == [
+        ("2024-03-29T00:00:00+01:00", "2024-03-30T00:00:00+01:00"),
+        ("2024-03-30T00:00:00+01:00", "2024-03-31T00:00:00+01:00"),
+        ("2024-03-31T00:00:00+01:00", "2024-04-01T00:00:00+02:00"),
+        ("2024-04-01T00:00:00+02:00", "2024-04-02T00:00:00+02:00"),
+    ]
+    assert consumption.readings[2].timestamp - consumption.readings[2].start == timedelta(hours=23)
+    assert [r.quality for r in consumption.readings] == ["Valid"] * 4
+
+
+@pytest.mark.parametrize(("day", "intervals"), [("2024-03-31", 92), ("2024-10-27", 100)])
+def test_readings_to_registers_quarter_hour_dst(day, intervals):
+    data = load_fixture(f"graz/meter_reading_quarter_hour_{day}.json")
+    consumption = normalize_registers(readings_to_registers(data, INTERVAL_QUARTER_HOUR))["1-1:1.9.0"]
+
+    readings = consumption.readings
+    assert len(readings) == intervals
+    # Lückenlos und ohne Überschneidung, auch in der doppelten/fehlenden Stunde
+    assert all(r.timestamp - r.start == timedelta(minutes=15) for r in readings)
+    assert all(a.timestamp == b.start for a, b in zip(readings, readings[1:]))
+    first = date.fromisoformat(day)
+    assert readings[0].start == datetime(first.year, first.month, first.day, tzinfo=PORTAL_TIME_ZONE)
+    last = first + timedelta(days=1)
+    assert readings[-1].timestamp == datetime(last.year, last.month, last.day, tzinfo=PORTAL_TIME_ZONE)
+
+
+class _Response:
+    def __init__(self, status: int, data) -> None:
+        self.status = status
+        self.headers = {}
+        self._data = data
+
+    async def read(self) -> bytes:
+        return b""
+
+    async def json(self, content_type=None):
+        return self._data
+
+    def raise_for_status(self) -> None:
+        assert self.status < 400
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+class _Session:
+    """Rejects the first token, accepts the renewed one."""
+
+    def __init__(self) -> None:
+        self.tokens = []
+
+    def request(self, method, url, **kwargs) -> _Response:
+        self.tokens.append(kwargs["headers"]["Authorization"])
+        if len(self.tokens) == 1:
+            return _Response(401, None)
+        return _Response(200, load_fixture("graz/installations.json"))
+
+
+async def test_relogin_after_401_is_counted():
+    client = AsyncStromnetzGrazClient(_Session(), "user@example.com", "secret")
+    client._token = "expired"
+
+    async def login():
+        client._token = "renewed"
+
+    client.login = login
+
+    contracts = await client.zaehlpunkte()
+
+    assert len(contracts) == 2
+    assert client.session.tokens == ["Bearer expired", "Bearer renewed"]
+    assert (client.metrics.logins, client.metrics.login_failures) == (1, 0)
+
+
+class _LoginSession:
+    """Answers the login with the given response (or raises the given exception)."""
+
+    def __init__(self, answer) -> None:
+        self.answer = answer
+
+    def post(self, url, **kwargs) -> _Response:
+        if isinstance(self.answer, Exception):
+            raise self.answer
+        return self.answer
+
+
+@pytest.mark.parametrize(
+    ("answer", "error"),
+    [
+        (aiohttp.ClientConnectionError("refused"), SmartmeterConnectionError),
+        (_Response(401, None), SmartmeterLoginError),
+        (_Response(200, {"error": "invalid credentials"}), SmartmeterLoginError),
+    ],
+    ids=["unreachable", "rejected", "no_token"],
+)
+async def test_login_errors(answer, error):
+    client = AsyncStromnetzGrazClient(_LoginSession(answer), "user@example.com", "secret")
+
+    with pytest.raises(error):
+        await client.login()
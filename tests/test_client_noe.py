@@ -0,0 +1,61 @@
+"""Netz NÖ: login of the orchestration API (api/client_noe_async.py)."""
+import aiohttp
+import pytest
+
+from custom_components.asm.api.client_noe_async import AsyncNetzNoeClient
+from custom_components.asm.api.errors import SmartmeterConnectionError, SmartmeterLoginError
+
+
+class _Response:
+    def __init__(self, status: int, data) -> None:
+        self.status = status
+        self._data = data
+
+    async def json(self, content_type=None):
+        if isinstance(self._data, Exception):
+            raise self._data
+        return self._data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+class _Session:
+    """Answers the login with the given response (or raises the given exception)."""
+
+    def __init__(self, answer) -> None:
+        self.answer = answer
+
+    def post(self, url, **kwargs) -> _Response:
+        if isinstance(self.answer, Exception):
+            raise self.answer
+        return self.answer
+
+
+async def test_login():
+    client = AsyncNetzNoeClient(_Session(_Response(200, {"success": True})), "user", "secret")
+
+    await client.login()
+
+    assert client.is_logged_in()
+
+
+@pytest.mark.parametrize(
+    ("answer", "error"),
+    [
+        (aiohttp.ClientConnectionError("refused"), SmartmeterConnectionError),
+        (_Response(401, None), SmartmeterLoginError),
+        (_Response(200, {"success": False}), SmartmeterLoginError),
+        (_Response(200, ValueError("no JSON")), SmartmeterLoginError),
+    ],
+    ids=["unreachable", "rejected", "no_success", "invalid_response"],
+)
+async def test_login_errors(answer, error):
+    client = AsyncNetzNoeClient(_Session(answer), "user", "secret")
+
+    with pytest.raises(error):
+        await client.login()
+    assert not client.is_logged_in()
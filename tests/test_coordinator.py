@@ -0,0 +1,97 @@
+"""Helpers of the coordinator (coordinator.py)."""
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.asm.api.constants import PORTAL_TIME_ZONE
+from custom_components.asm.api.errors import SmartmeterCircuitOpenError, SmartmeterConnectionError
+from custom_components.asm.api.models import Reading, Register
+from custom_components.asm.const import CONF_PASSWORD, CONF_PROVIDER, CONF_USERNAME, DOMAIN, PROVIDER_NETZ_NOE
+from custom_components.asm.coordinator import AustriaSmartMeterCoordinator, _stats_from_history
+
+
+def _day(day: date, value: float) -> Reading:
+    start = datetime(day.year, day.month, day.day, tzinfo=PORTAL_TIME_ZONE)
+    return Reading(start + timedelta(days=1), value, start=start)
+
+
+def test_stats_from_history_uses_the_daily_register():
+    today = date(2024, 3, 31)
+    register = Register("1-1:1.9.0", "kWh", [_day(date(2024, 3, d), 1.0 + d / 10) for d in range(25, 31)])
+
+    stats = _stats_from_history("AT001", {"1-1:1.9.0": register}, today)
+
+    assert stats["consumptionYesterday"].value == 4000.0
+    assert stats["consumptionYesterday"].date == "2024-03-30"
+    assert stats["consumptionDayBeforeYesterday"].value == 3900.0
+
+
+def test_stats_from_history_without_register():
+    assert _stats_from_history("AT001", {}, date(2024, 3, 31)) == {}
+
+
+def _previous() -> dict:
+    """Two NÖ meters, one of them with a backfill in progress."""
+    return {
+        zp_num: {
+            "info": {"zaehlpunktnummer": zp_num, "zaehlpunktName": "Smart Meter"},
+            "registers": {},
+            "stats": {},
+            "load_profile": {},
+            "latest": {},
+            "backfill": {"from": "2021-05-31", "until": "2024-05-31", "done": ["2024-05-01"]} if zp_num == "AT001" else None,
+        }
+        for zp_num in ("AT001", "AT002")
+    }
+
+
+def _coordinator(hass: HomeAssistant) -> AustriaSmartMeterCoordinator:
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_PROVIDER: PROVIDER_NETZ_NOE, CONF_USERNAME: "user", CONF_PASSWORD: "secret"}
+    )
+    entry.add_to_hass(hass)
+    return AustriaSmartMeterCoordinator(hass, entry)
+
+
+@pytest.mark.parametrize(
+    "contracts",
+    [
+        {"side_effect": SmartmeterCircuitOpenError("smartmeter.netz-noe.at is failing, requests paused")},
+        {"side_effect": SmartmeterConnectionError("Could not fetch metering points")},
+        {"return_value": [{"zaehlpunkte": []}]},
+    ],
+    ids=["circuit_open", "connection_error", "empty"],
+)
+async def test_failed_contract_fetch_keeps_the_known_meters(hass: HomeAssistant, contracts):
+    coordinator = _coordinator(hass)
+    coordinator.client._logged_in = True
+    coordinator.client.zaehlpunkte = AsyncMock(**contracts)
+    coordinator.client.historical_data = AsyncMock(return_value=[])
+    coordinator._statistics.async_import = AsyncMock(return_value=0)
+    coordinator._store.async_schedule_save = MagicMock()
+    coordinator.data = _previous()
+
+    data = await coordinator._async_update_data()
+    await hass.async_block_till_done()
+
+    assert set(data) == {"AT001", "AT002"}
+    assert data["AT001"]["backfill"] == _previous()["AT001"]["backfill"]
+    saved = coordinator._store.async_schedule_save.call_args.args[0]
+    assert set(saved) == {"AT001", "AT002"}
+
+
+async def test_backfill_starts_after_the_first_network_update(hass: HomeAssistant):
+    coordinator = _coordinator(hass)
+    coordinator._store.async_load = AsyncMock(return_value=_previous())
+    coordinator._backfill.async_start = MagicMock()
+
+    # Aus dem Cache geladen, aber noch nicht angemeldet
+    assert await coordinator.async_load_cache()
+    coordinator._backfill.async_start.assert_not_called()
+
+    coordinator._async_fetch_data = AsyncMock(return_value=_previous())
+    await coordinator.async_refresh()
+    coordinator._backfill.async_start.assert_called_once()
@@ -0,0 +1,113 @@
+"""History export (export.py, service asm.export_history)."""
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.asm.api.models import Reading, Register
+from custom_components.asm.const import CONF_PASSWORD, CONF_PROVIDER, CONF_USERNAME, DOMAIN, PROVIDER_NETZ_NOE
+from custom_components.asm.coordinator import AustriaSmartMeterCoordinator
+from custom_components.asm.export import rows_by_window
+from custom_components.asm.services import SERVICE_EXPORT_HISTORY, async_setup_services
+
+ZP = "AT0010000000000000001000000000001"
+
+
+async def _call(hass: HomeAssistant, **data) -> dict:
+    async_setup_services(hass)
+    return await hass.services.async_call(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        {"zaehlpunkt": ZP, "start": "2024-01-01", "end": "2024-01-31", **data},
+        blocking=True,
+        return_response=True,
+    )
+
+
+def _coordinator(hass: HomeAssistant) -> AustriaSmartMeterCoordinator:
+    """Netz NÖ entry with one Zählpunkt without readings."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_PROVIDER: PROVIDER_NETZ_NOE, CONF_USERNAME: "user", CONF_PASSWORD: "secret"}
+    )
+    entry.add_to_hass(hass)
+    coordinator = AustriaSmartMeterCoordinator(hass, entry)
+    coordinator.data = {ZP: {"info": {"zaehlpunktnummer": ZP}, "registers": {}, "stats": {}, "load_profile": {}}}
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    return coordinator
+
+
+async def test_unknown_zaehlpunkt(hass: HomeAssistant):
+    with pytest.raises(ServiceValidationError) as err:
+        await _call(hass)
+
+    assert err.value.translation_key == "unknown_zaehlpunkt"
+    assert err.value.translation_placeholders == {"zaehlpunkt": ZP}
+
+
+async def test_export_file_not_writable(hass: HomeAssistant):
+    _coordinator(hass)
+
+    with patch("custom_components.asm.export.os.makedirs", side_effect=PermissionError("read-only")), pytest.raises(
+        HomeAssistantError
+    ) as err:
+        await _call(hass)
+
+    assert err.value.translation_key == "export_write_failed"
+    assert err.value.translation_placeholders["path"].endswith(f"{ZP}_day_2024-01-01_2024-01-31.csv")
+
+
+async def test_parquet_without_pyarrow(hass: HomeAssistant):
+    with patch("custom_components.asm.services.parquet_available", return_value=False), pytest.raises(
+        ServiceValidationError
+    ) as err:
+        await _call(hass, format="parquet")
+
+    assert err.value.translation_key == "parquet_unavailable"
+
+
+def _daily(first: date, last: date) -> Register:
+    """Daily consumption register with 1000 Wh per day of [first, last]."""
+    readings = []
+    day = first
+    while day <= last:
+        start = dt_util.start_of_local_day(day)
+        readings.append(Reading(dt_util.start_of_local_day(day + timedelta(days=1)), 1000.0, "VAL", start))
+        day += timedelta(days=1)
+    return Register("1-1:1.9.0", "Wh", readings)
+
+
+async def _export(coordinator, date_from: date, date_until: date, fetch_missing: bool) -> list[tuple]:
+    return [
+        row
+        async for rows in rows_by_window(coordinator, ZP, date_from, date_until, "day", fetch_missing)
+        for row in rows
+    ]
+
+
+async def test_partly_stored_month_is_completed_from_the_portal(hass: HomeAssistant):
+    coordinator = _coordinator(hass)
+    # Gespeichert ab 15. Jänner, der Februar vollständig
+    coordinator.data[ZP]["registers"] = {"1-1:1.9.0": _daily(date(2024, 1, 15), date(2024, 2, 29))}
+    coordinator.client.historical_data = AsyncMock(return_value=[_daily(date(2024, 1, 1), date(2024, 1, 31))])
+
+    rows = await _export(coordinator, date(2024, 1, 1), date(2024, 2, 29), fetch_missing=True)
+
+    coordinator.client.historical_data.assert_awaited_once_with(ZP, date(2024, 1, 1), date(2024, 1, 31))
+    # Tageswerte nach ihrem Ende: 2. Jänner bis 29. Februar lückenlos
+    assert [row[3].date() for row in rows] == [date(2024, 1, 2) + timedelta(days=d) for d in range(59)]
+
+
+async def test_partly_stored_month_without_fetch_missing(hass: HomeAssistant):
+    coordinator = _coordinator(hass)
+    coordinator.data[ZP]["registers"] = {"1-1:1.9.0": _daily(date(2024, 1, 15), date(2024, 1, 31))}
+    coordinator.client.historical_data = AsyncMock()
+
+    rows = await _export(coordinator, date(2024, 1, 1), date(2024, 1, 31), fetch_missing=False)
+
+    coordinator.client.historical_data.assert_not_called()
+    assert len(rows) == 16
+
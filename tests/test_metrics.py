@@ -0,0 +1,33 @@
+"""Request counting per update (api/metrics.py)."""
+import asyncio
+
+from custom_components.asm.api.metrics import RequestMetrics, request_scope
+
+
+async def test_request_scope_counts_only_its_own_requests():
+    metrics = RequestMetrics()
+    started = asyncio.Event()
+    go_on = asyncio.Event()
+
+    async def backfill() -> None:
+        started.set()
+        await go_on.wait()
+        metrics.record_response("/messwerte", 0.1, 1000, 200)
+
+    async def timeout() -> None:
+        metrics.record_error("/messwerte", 5.0)
+
+    other = asyncio.ensure_future(backfill())
+    await started.wait()
+    with request_scope() as counter:
+        metrics.record_response("/zaehlpunkte", 0.1, 100, 200)
+        # Läuft parallel weiter, gehört aber nicht zum Update
+        go_on.set()
+        await other
+        # Vom Update gestartete Tasks zählen mit
+        await asyncio.ensure_future(timeout())
+
+    metrics.record_response("/zaehlpunkte", 0.1, 100, 200)
+
+    assert (counter.requests, counter.bytes) == (2, 100)
+    assert (metrics.total_requests, metrics.total_bytes) == (4, 1200)
@@ -0,0 +1,48 @@
+"""Normalized data model (api/models.py)."""
+from datetime import datetime, timedelta, timezone
+
+from custom_components.asm.api.models import Reading, Register, derive_counter
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _daily(first_day: int, last_day: int) -> Register:
+    """1-1:1.9.0 with 10 + day kWh on every day of [first_day, last_day]."""
+    return Register(
+        "1-1:1.9.0", "kWh", [Reading(START + timedelta(days=day + 1), 10.0 + day) for day in range(first_day, last_day + 1)]
+    )
+
+
+def _values(register: Register) -> dict[datetime, float]:
+    return {r.timestamp: r.value for r in register.readings}
+
+
+def test_derive_counter_starts_at_zero():
+    counter = derive_counter(_daily(0, 2), "1-1:1.8.0")
+
+    assert counter.obis_code == "1-1:1.8.0"
+    assert [r.value for r in counter.readings] == [10.0, 21.0, 33.0]
+
+
+def test_derive_counter_keeps_published_values():
+    """Older windows (backfill) must not shift the values already published."""
+    published = derive_counter(_daily(30, 40), "1-1:1.8.0")
+
+    counter = derive_counter(_daily(0, 40), "1-1:1.8.0", published)
+
+    values = _values(counter)
+    assert {ts: values[ts] for ts in _values(published)} == _values(published)
+    assert len(counter.readings) == 41
+    # Rückwärts verkettet: Differenz zweier Tage = Verbrauch des späteren Tages
+    readings = counter.readings
+    assert all(b.value - a.value == 10.0 + day + 1 for day, (a, b) in enumerate(zip(readings, readings[1:])))
+
+
+def test_derive_counter_continues_from_newest_value():
+    published = derive_counter(_daily(0, 9), "1-1:1.8.0")
+    # Neuere Tage kommen dazu; die bekannten Tage im Abruf ändern nichts mehr
+    counter = derive_counter(_daily(8, 12), "1-1:1.8.0", published)
+
+    assert [r.value for r in counter.readings[:10]] == [r.value for r in published.readings]
+    newest = published.readings[-1].value
+    assert [r.value for r in counter.readings[10:]] == [newest + 20, newest + 41, newest + 63]
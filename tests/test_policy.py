@@ -0,0 +1,209 @@
+"""Rate limit, retries and circuit breaker of the portal requests (api/policy.py)."""
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from custom_components.asm.api import policy
+from custom_components.asm.api.errors import SmartmeterCircuitOpenError, SmartmeterConnectionError
+from custom_components.asm.api.metrics import RequestMetrics
+from custom_components.asm.api.policy import (
+    BREAKER_RESET_SECONDS,
+    BREAKER_THRESHOLD,
+    RequestPolicy,
+    TokenBucket,
+    retry_after_seconds,
+)
+
+URL = "https://portal.example/api/messwerte"
+HOST = "portal.example"
+
+
+class _Clock:
+    """Stands in for the time module of policy.py: sleeping advances the clock."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    fake = _Clock()
+    monkeypatch.setattr(policy, "time", fake)
+    return fake
+
+
+class _Session:
+    """requests.Session answering with the given status codes (or raising the given exceptions)."""
+
+    def __init__(self, *answers) -> None:
+        self.answers = list(answers)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        status, headers = answer if isinstance(answer, tuple) else (answer, {})
+        return SimpleNamespace(status_code=status, headers=headers, content=b"{}")
+
+
+def _policy() -> RequestPolicy:
+    # Kein Warten auf Tokens, damit nur die Wartezeiten der Wiederholungen zählen
+    return RequestPolicy(rate=1000.0, burst=100)
+
+
+def test_token_bucket(clock):
+    bucket = TokenBucket(rate=2.0, burst=2)
+
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    clock.now += 1.0
+    # In einer Sekunde kommen zwei Tokens nach, die Schuld ist beglichen
+    assert bucket.reserve() == 0.5
+
+
+def test_retry_after_seconds(clock):
+    assert retry_after_seconds("7") == 7.0
+    assert retry_after_seconds("-3") == 0.0
+    http_date = format_datetime(datetime.fromtimestamp(clock.now, timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert retry_after_seconds(http_date) == 30.0
+    assert retry_after_seconds("soon") is None
+    assert retry_after_seconds(None) is None
+
+
+def test_request_retries_5xx_and_429_with_retry_after(clock):
+    session = _Session(503, (429, {"Retry-After": "7"}), 200)
+    metrics = RequestMetrics()
+
+    res = policy.get(session, URL, _policy(), metrics)
+
+    assert res.status_code == 200
+    assert session.calls == 3
+    first, second = clock.sleeps
+    assert 0.0 <= first <= policy.BACKOFF_BASE
+    # Retry-After geht vor, wenn die Backoff-Zeit kürzer ist
+    assert second >= 7.0
+    assert metrics.total_requests == 3
+    assert metrics.endpoints["/api/messwerte"].retries == 2
+
+
+def test_request_gives_up_after_max_attempts(clock):
+    session = _Session(502, 502, 502, 200)
+
+    assert policy.get(session, URL, _policy()).status_code == 502
+    assert session.calls == policy.MAX_ATTEMPTS
+
+
+def test_long_retry_after_is_not_waited_for(clock):
+    session = _Session((429, {"Retry-After": str(int(policy.MAX_RETRY_AFTER) + 1)}))
+
+    assert policy.get(session, URL, _policy()).status_code == 429
+    assert clock.sleeps == []
+
+
+def test_no_retry_on_client_errors(clock):
+    session = _Session(404)
+
+    assert policy.get(session, URL, _policy()).status_code == 404
+    assert session.calls == 1
+
+
+def test_breaker_opens_and_half_opens(clock):
+    request_policy = _policy()
+    breaker = request_policy.breaker(HOST)
+    for _ in range(BREAKER_THRESHOLD - 1):
+        breaker.record_failure()
+    assert not breaker.is_open
+
+    breaker.record_failure()
+    assert breaker.is_open
+    with pytest.raises(SmartmeterCircuitOpenError):
+        request_policy.acquire(HOST)
+
+    clock.now += BREAKER_RESET_SECONDS
+    # Halb offen: genau ein Versuch geht durch, die weiteren warten auf sein Ergebnis
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now += BREAKER_RESET_SECONDS
+    assert breaker.allow()
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.allow() and breaker.allow()
+
+
+def test_request_raises_circuit_open_error(clock):
+    session = _Session(*[requests.ConnectionError("refused")] * 10)
+    request_policy = _policy()
+
+    with pytest.raises(SmartmeterConnectionError) as err:
+        policy.get(session, URL, request_policy)
+    assert not isinstance(err.value, SmartmeterCircuitOpenError)
+    # Der Breaker öffnet mitten in den Wiederholungen der zweiten Anfrage
+    with pytest.raises(SmartmeterCircuitOpenError):
+        policy.get(session, URL, request_policy)
+    assert session.calls == BREAKER_THRESHOLD
+    with pytest.raises(SmartmeterCircuitOpenError):
+        policy.get(session, URL, request_policy)
+    assert session.calls == BREAKER_THRESHOLD
+
+
+class _AsyncResponse:
+    def __init__(self, status: int, headers: dict) -> None:
+        self.status = status
+        self.headers = headers
+
+    async def read(self) -> bytes:
+        return b"{}"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+class _AsyncSession:
+    """aiohttp.ClientSession answering with the given status codes."""
+
+    def __init__(self, *answers) -> None:
+        self.answers = list(answers)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs) -> _AsyncResponse:
+        self.calls += 1
+        status, headers = self.answers.pop(0)
+        return _AsyncResponse(status, headers)
+
+
+async def test_async_request_retries_with_retry_after(clock, monkeypatch):
+    sleeps = []
+
+    async def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(policy, "asyncio", SimpleNamespace(sleep=sleep, TimeoutError=asyncio.TimeoutError))
+    session = _AsyncSession((503, {"Retry-After": "3"}), (200, {}))
+
+    res = await policy.async_get(session, URL, _policy())
+
+    assert res.status == 200
+    assert session.calls == 2
+    assert len(sleeps) == 1 and sleeps[0] >= 3.0
@@ -0,0 +1,97 @@
+"""Learning of the publication time (PollScheduler)."""
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.asm.scheduler import WINDOW_MARGIN, PollScheduler
+
+MARGIN = int(WINDOW_MARGIN.total_seconds() // 60)
+ENTRY = "entry_a"
+
+
+def _at(day: int, hour: int, minute: int = 0) -> datetime:
+    return datetime(2024, 5, day, hour, minute, tzinfo=dt_util.get_default_time_zone())
+
+
+def _arrival(
+    scheduler: PollScheduler, day: int, empty: tuple[int, int], new: tuple[int, int], entry_id: str = ENTRY
+) -> None:
+    scheduler.record_poll(entry_id, _at(day, *empty), False)
+    scheduler.record_poll(entry_id, _at(day, *new), True)
+
+
+def test_arrival_between_empty_poll_and_poll():
+    scheduler = PollScheduler()
+    _arrival(scheduler, 1, (6, 0), (7, 0))
+
+    assert scheduler.as_dict()["observations"] == [6 * 60 + 30]
+    assert scheduler.window() == (6 * 60 + 30 - MARGIN, 6 * 60 + 30 + MARGIN)
+
+
+def test_arrival_without_empty_poll_is_not_learned():
+    """E.g. the first poll after a restart: the data may have been there for hours."""
+    scheduler = PollScheduler()
+    scheduler.record_poll(ENTRY, _at(1, 15, 0), True)
+
+    assert scheduler.as_dict()["observations"] == []
+    assert scheduler.window() is None
+    # Trotzdem als angekommen merken: weitere Abrufe am selben Tag lernen nichts
+    scheduler.record_poll(ENTRY, _at(1, 16, 0), False)
+    scheduler.record_poll(ENTRY, _at(1, 17, 0), True)
+    assert scheduler.as_dict()["observations"] == []
+
+
+def test_empty_poll_of_the_day_before_does_not_count():
+    scheduler = PollScheduler()
+    scheduler.record_poll(ENTRY, _at(1, 23, 0), False)
+    scheduler.record_poll(ENTRY, _at(2, 9, 0), True)
+
+    assert scheduler.as_dict()["observations"] == []
+
+
+def test_window_ignores_outlier():
+    scheduler = PollScheduler()
+    for day in range(1, 14):
+        _arrival(scheduler, day, (6, 45), (7, 15))
+    # Ein einzelner Ausreißer am Nachmittag
+    _arrival(scheduler, 14, (15, 0), (15, 30))
+
+    assert len(scheduler.as_dict()["observations"]) == 14
+    assert scheduler.window() == (7 * 60 - MARGIN, 7 * 60 + MARGIN)
+
+
+def test_next_interval_waits_for_tomorrows_window():
+    scheduler = PollScheduler()
+    for day in range(1, 4):
+        _arrival(scheduler, day, (6, 45), (7, 15))
+
+    interval = scheduler.next_interval(ENTRY, _at(3, 7, 15), timedelta(hours=6))
+    # Morgen 06:30 (Fenster) plus höchstens 10 Minuten Streuung
+    assert timedelta(hours=23, minutes=15) <= interval <= timedelta(hours=23, minutes=25)
+
+
+def test_entries_of_the_provider_are_polled_independently():
+    scheduler = PollScheduler()
+    for day in range(1, 4):
+        _arrival(scheduler, day, (6, 45), (7, 15))
+    # Konto B hat um 06:40 noch nichts bekommen, Konto A meldet um 07:00 neue Werte
+    scheduler.record_poll("entry_b", _at(4, 6, 40), False)
+    _arrival(scheduler, 4, (6, 50), (7, 0))
+
+    # A wartet auf morgen, B fragt weiter im Fenster von heute nach
+    assert scheduler.next_interval(ENTRY, _at(4, 7, 0), timedelta(hours=6)) > timedelta(hours=23)
+    assert scheduler.next_interval("entry_b", _at(4, 7, 0), timedelta(hours=6)) <= timedelta(minutes=18)
+    # B lernt aus dem eigenen leeren Abruf (06:40), nicht aus dem von A
+    scheduler.record_poll("entry_b", _at(4, 7, 30), True)
+    assert scheduler.as_dict()["observations"] == [7 * 60] * 3 + [6 * 60 + 55, 7 * 60 + 5]
+
+
+def test_state_round_trip():
+    scheduler = PollScheduler()
+    _arrival(scheduler, 1, (6, 0), (7, 0))
+
+    restored = PollScheduler(scheduler.as_dict())
+
+    assert restored.as_dict() == {"observations": [6 * 60 + 30], "last_arrival": {ENTRY: "2024-05-01"}}
+    # Gespeicherter Stand von vor der Umstellung (ein Tag für alle Einträge)
+    assert PollScheduler({"observations": [390], "last_arrival": "2024-05-01"}).as_dict()["last_arrival"] == {}
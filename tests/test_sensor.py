@@ -0,0 +1,31 @@
+"""Attributes of the meter sensors (sensor.py)."""
+from custom_components.asm.sensor import CONTRACT_ATTRIBUTES, AustriaSmartMeterSensor, _contract_attributes
+
+INFO = {
+    "zaehlpunktnummer": "AT0010000000000000001000000000001",
+    "zaehlpunktName": "Wohnung",
+    "isActive": True,
+    "verbrauchsstelle": {"strasse": "Hauptstraße", "hausnummer": "1", "ort": "Wien", "laengengrad": None},
+    "anlage": {"typ": "TAGSTROM", "details": {"nested": 1}},
+    "vertraege": [{"einzugsdatum": "2020-01-01"}],
+    "unknownField": "x",
+}
+
+
+def test_contract_attributes_are_flattened():
+    assert _contract_attributes(INFO) == {
+        "zaehlpunktnummer": "AT0010000000000000001000000000001",
+        "zaehlpunktName": "Wohnung",
+        "isActive": True,
+        "verbrauchsstelle_strasse": "Hauptstraße",
+        "verbrauchsstelle_hausnummer": "1",
+        "verbrauchsstelle_ort": "Wien",
+        "verbrauchsstelle_laengengrad": None,
+        "anlage_typ": "TAGSTROM",
+    }
+
+
+def test_contract_attributes_are_not_recorded():
+    # Alles, was _contract_attributes liefern kann, bleibt aus dem Recorder
+    assert CONTRACT_ATTRIBUTES <= AustriaSmartMeterSensor._unrecorded_attributes
+    assert {"zaehlpunkt", "obis_code", "raw_unit"} <= AustriaSmartMeterSensor._unrecorded_attributes
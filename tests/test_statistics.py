@@ -0,0 +1,97 @@
+"""Import into the long-term statistics (statistics.py)."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.asm import statistics
+from custom_components.asm.statistics import StatisticsImporter, statistic_id
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+ZP = "AT001"
+
+
+class _Recorder:
+    """Rows per statistic id and hour; importing an hour again replaces it, like the recorder does."""
+
+    def __init__(self) -> None:
+        self.tables: dict[str, dict[datetime, dict]] = {}
+
+    def add(self, hass, metadata, rows) -> None:
+        table = self.tables.setdefault(metadata["statistic_id"], {})
+        for row in rows:
+            table[row["start"]] = row
+
+    def last(self, hass, number, stat_id, convert_units, types) -> dict:
+        table = self.tables.get(stat_id)
+        if not table:
+            return {}
+        row = table[max(table)]
+        return {stat_id: [{"start": row["start"].timestamp(), "sum": row["sum"], "state": row["state"]}]}
+
+    def rows(self, obis: str) -> list[dict]:
+        table = self.tables[statistic_id(ZP, obis)]
+        return [table[start] for start in sorted(table)]
+
+
+class _Instance:
+    async def async_add_executor_job(self, target, *args):
+        return target(*args)
+
+
+@pytest.fixture
+def recorder(monkeypatch) -> _Recorder:
+    fake = _Recorder()
+    monkeypatch.setattr(statistics, "async_add_external_statistics", fake.add)
+    monkeypatch.setattr(statistics, "get_last_statistics", fake.last)
+    monkeypatch.setattr(statistics, "get_instance", lambda hass: _Instance())
+    return fake
+
+
+def _consumption(first_hour: int, last_hour: int) -> list[tuple[datetime, float]]:
+    """1.0 + hour Wh in every hour of [first_hour, last_hour], by the start of the hour."""
+    return [(START + timedelta(hours=hour), 1.0 + hour) for hour in range(first_hour, last_hour + 1)]
+
+
+def _counter(first_hour: int, last_hour: int) -> list[tuple[datetime, float]]:
+    """Counter at the end of every hour of [first_hour, last_hour], 10 Wh per hour."""
+    return [(START + timedelta(hours=hour + 1), 1000.0 + 10 * hour) for hour in range(first_hour, last_hour + 1)]
+
+
+async def test_import_skips_known_hours(recorder):
+    importer = StatisticsImporter(None)
+    assert await importer.async_import(ZP, "1-1:1.9.0", "Verbrauch", _consumption(48, 71), cumulative=False) == 24
+
+    # Ältere und bekannte Stunden werden ohne Rebuild nicht geschrieben
+    assert await importer.async_import(ZP, "1-1:1.9.0", "Verbrauch", _consumption(0, 73), cumulative=False) == 2
+    assert len(recorder.rows("1-1:1.9.0")) == 26
+
+
+async def test_rebuild_adds_backfilled_hours_with_continuous_sums(recorder):
+    importer = StatisticsImporter(None)
+    await importer.async_import(ZP, "1-1:1.9.0", "Verbrauch", _consumption(48, 71), cumulative=False)
+
+    # Backfill: die zwei Tage vor dem ersten Import
+    assert await importer.async_import(
+        ZP, "1-1:1.9.0", "Verbrauch", _consumption(0, 71), cumulative=False, rebuild=True
+    ) == 72
+    # Danach geht es wieder inkrementell weiter
+    await importer.async_import(ZP, "1-1:1.9.0", "Verbrauch", _consumption(0, 73), cumulative=False)
+
+    rows = recorder.rows("1-1:1.9.0")
+    assert [row["start"] for row in rows] == [START + timedelta(hours=hour) for hour in range(74)]
+    assert rows[0]["sum"] == 1.0
+    assert all(b["sum"] - a["sum"] == b["state"] for a, b in zip(rows, rows[1:]))
+    assert rows[-1]["sum"] == sum(value for _, value in _consumption(0, 73))
+
+
+async def test_rebuild_of_a_counter(recorder):
+    importer = StatisticsImporter(None)
+    await importer.async_import(ZP, "1-1:1.8.0", "Zählerstand", _counter(48, 71))
+
+    await importer.async_import(ZP, "1-1:1.8.0", "Zählerstand", _counter(0, 71), rebuild=True)
+
+    rows = recorder.rows("1-1:1.8.0")
+    assert len(rows) == 72
+    assert rows[0]["sum"] == 0.0
+    # Summe folgt lückenlos dem Zählerstand
+    assert all(b["sum"] - a["sum"] == b["state"] - a["state"] == 10.0 for a, b in zip(rows, rows[1:]))
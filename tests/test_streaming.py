@@ -0,0 +1,76 @@
+"""Incremental parsing of messwerte responses (api/streaming.py)."""
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import aiohttp
+
+from custom_components.asm.api.constants import VALID_OBIS_CODES
+from custom_components.asm.api.models import normalize_registers
+from custom_components.asm.api.streaming import stream_registers
+
+CHUNK = 7
+
+
+def _messwert(day: int, value: float) -> dict:
+    return {
+        "messwert": value,
+        "zeitVon": f"2024-03-{day:02d}T23:00:00.000Z",
+        "zeitBis": f"2024-03-{day + 1:02d}T23:00:00.000Z",
+        "qualitaet": "VAL",
+    }
+
+
+PAYLOAD = {
+    "zaehlpunkt": "AT0010000000000000001000000000001",
+    "zaehlwerke": [
+        {
+            "obisCode": "1-1:1.9.0",
+            "einheit": "WH",
+            # Nicht chronologisch, wie sie das Portal manchmal liefert
+            "messwerte": [_messwert(3, 3000.0), _messwert(1, 1000.0), _messwert(2, 2000.5)],
+        },
+        {"obisCode": "1-1:9.9.9", "einheit": "WH", "messwerte": [_messwert(1, 1.0)]},
+        # obisCode erst nach den Messwerten
+        {"messwerte": [_messwert(2, 12.0), {"messwert": 1.0}, _messwert(1, 11.0)], "obisCode": "1-1:2.9.0", "einheit": "WH"},
+        {"messwerte": [_messwert(1, 5.0)], "obisCode": "0-0:96.1.0", "einheit": "WH"},
+    ],
+}
+
+
+def _stream(data: bytes) -> aiohttp.StreamReader:
+    """Response body arriving in CHUNK-byte pieces."""
+    reader = aiohttp.StreamReader(MagicMock(), 2**16, loop=asyncio.get_running_loop())
+    for i in range(0, len(data), CHUNK):
+        reader.feed_data(data[i:i + CHUNK])
+    reader.feed_eof()
+    return reader
+
+
+async def _parse(payload) -> list:
+    return [register async for register in stream_registers(_stream(json.dumps(payload).encode()), chunk_size=CHUNK)]
+
+
+async def test_stream_registers():
+    registers = await _parse(PAYLOAD)
+
+    assert [(r.obis_code, r.unit) for r in registers] == [("1-1:1.9.0", "WH"), ("1-1:2.9.0", "WH")]
+    consumption, feed_in = registers
+    assert [r.value for r in consumption.readings] == [1000.0, 2000.5, 3000.0]
+    assert all(a.timestamp < b.timestamp for a, b in zip(consumption.readings, consumption.readings[1:]))
+    assert consumption.readings[0].quality == "VAL"
+    assert consumption.readings[0].start.isoformat() == "2024-03-01T23:00:00+00:00"
+    # Messwert ohne Zeitstempel fällt weg
+    assert [r.value for r in feed_in.readings] == [11.0, 12.0]
+
+
+async def test_stream_registers_matches_the_full_parse():
+    streamed = {register.obis_code: register for register in await _parse(PAYLOAD)}
+    parsed = normalize_registers(PAYLOAD["zaehlwerke"])
+
+    assert streamed == {obis: register for obis, register in parsed.items() if obis in VALID_OBIS_CODES}
+
+
+async def test_stream_registers_without_zaehlwerke():
+    assert await _parse({"zaehlpunkt": "AT001", "zaehlwerke": []}) == []
+    assert await _parse({"zaehlpunkt": "AT001"}) == []